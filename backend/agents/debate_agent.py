@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import AsyncIterator, Dict, List
+
+from backend.agents.prompts import agent_messages
+from backend.agents.registry import Persona
+from backend.services.llm_service import LLMService
+
+
+class DebateAgent:
+    """One seat on a debate panel; everything persona-specific comes from the agent registry."""
+
+    def __init__(self, llm: LLMService, persona: Persona) -> None:
+        self.llm = llm
+        self.persona = persona
+        self.name = persona.name
+        self.label = persona.label
+        self.tendencies = list(persona.tendencies)
+        self.temperature = persona.temperature
+
+    async def respond(
+        self, prompt: str, memory_text: str, round_number: int, *, use_cache: bool = True
+    ) -> str:
+        return await self.llm.complete(
+            self._messages(prompt, memory_text, round_number),
+            temperature=self.temperature,
+            cache=use_cache,
+            role=self.name,
+            round_number=round_number,
+        )
+
+    def respond_stream(
+        self, prompt: str, memory_text: str, round_number: int, *, use_cache: bool = True
+    ) -> AsyncIterator[str]:
+        return self.llm.stream(
+            self._messages(prompt, memory_text, round_number),
+            temperature=self.temperature,
+            cache=use_cache,
+            role=self.name,
+            round_number=round_number,
+        )
+
+    def _messages(self, prompt: str, memory_text: str, round_number: int) -> List[Dict[str, str]]:
+        return agent_messages(prompt, memory_text, round_number, label=self.label, tendencies=self.tendencies)
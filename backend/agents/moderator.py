@@ -2,85 +2,110 @@ from __future__ import annotations
 
 import json
 import os
-import re
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence
 
-from backend.models.schemas import ModeratorOutput, RoundRecord
+from backend.agents.registry import AGENT_REGISTRY
+from backend.convergence import mean_agreement
+from backend.models.schemas import ConvergenceStats, ModeratorOutput, RoundRecord
+from backend.services.json_repair import JSONRepairError, repair_json
 from backend.services.llm_service import LLMService
+from backend.services.metrics import MODERATOR_STAGES
+from backend.services.tracing import TRACER
+
+MODERATOR_SYSTEM_PROMPT = (
+    "You are the Moderator Agent in a structured debate.\n"
+    "Task:\n"
+    "- Identify agreements, disagreements, strongest arguments.\n"
+    "- Produce a consensus statement.\n"
+    "- Produce confidence score (0-100), reflecting logical convergence, evidence quality, and viewpoint stability.\n"
+    "- Be strict: confidence should increase only when disagreements materially narrow.\n"
+    "Return valid JSON only with keys:\n"
+    "agreements, disagreements, strongest_arguments, consensus_statement, confidence, summary.\n"
+    "For agreements, disagreements, and strongest_arguments return arrays of plain strings only."
+)
+# A locally repaired object without these lost them to truncation; their defaults would pass as a synthesis.
+REPAIR_REQUIRED_KEYS = ("consensus_statement", "confidence")
 
 
 class ModeratorAgent:
     def __init__(self, llm: LLMService) -> None:
         self.llm = llm
+        self.repair_stats: Dict[str, int] = {
+            "local_repair_attempts": 0,
+            "local_repair_successes": 0,
+            "remote_repair_calls": 0,
+            "remote_repairs_avoided": 0,
+            "escalations": 0,
+        }
 
     async def moderate(
         self,
         prompt: str,
         round_number: int,
-        centre_left_response: str,
-        centre_response: str,
-        centre_right_response: str,
+        responses: Dict[str, str],
         memory: List[RoundRecord],
+        memory_text: str,
+        use_cache: bool = True,
+        convergence: Optional[ConvergenceStats] = None,
     ) -> ModeratorOutput:
-        memory_text = self._memory_to_text(memory)
-        system_prompt = (
-            "You are the Moderator Agent in a structured debate.\n"
-            "Task:\n"
-            "- Identify agreements, disagreements, strongest arguments.\n"
-            "- Produce a consensus statement.\n"
-            "- Produce confidence score (0-100), reflecting logical convergence, evidence quality, and viewpoint stability.\n"
-            "- Be strict: confidence should increase only when disagreements materially narrow.\n"
-            "Return valid JSON only with keys:\n"
-            "agreements, disagreements, strongest_arguments, consensus_statement, confidence, summary.\n"
-            "For agreements, disagreements, and strongest_arguments return arrays of plain strings only."
-        )
-        user_prompt = (
-            f"Debate prompt: {prompt}\n"
-            f"Round: {round_number}\n\n"
-            f"Prior memory:\n{memory_text}\n\n"
-            "Current round inputs:\n"
-            f"Centre-Left:\n{centre_left_response}\n\n"
-            f"Centre:\n{centre_response}\n\n"
-            f"Centre-Right:\n{centre_right_response}\n"
-        )
-
+        """Synthesize one round; ``responses`` maps agent name to response in the panel's seating order."""
+        messages = self._messages(prompt, round_number, responses, memory_text)
         raw = await self.llm.complete(
-            [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
+            messages,
             temperature=0.25,
             response_format={"type": "json_object"},
             max_tokens=800,
+            cache=use_cache,
+            role="moderator",
+            round_number=round_number,
         )
 
         parsed = self._safe_parse(raw)
         stage = "primary"
         if self._is_parse_failure(parsed):
-            repaired = await self._repair_json(raw)
+            # Most syntax failures are fixable locally, which avoids a second round-trip.
+            parsed = self._local_repair(raw)
+            stage = "repaired_local"
+            if not self._is_parse_failure(parsed):
+                self.repair_stats["remote_repairs_avoided"] += 1
+        if self._is_parse_failure(parsed) and self.llm.router.can_escalate("moderator", round_number):
+            # Unrepairable output from the standard tier: ask the stronger tier for the whole synthesis
+            # rather than patching syntax, since the content is likely unusable too.
+            self.repair_stats["escalations"] += 1
+            raw = await self.llm.complete(
+                messages,
+                temperature=0.25,
+                response_format={"type": "json_object"},
+                max_tokens=800,
+                cache=use_cache,
+                role="moderator",
+                round_number=round_number,
+                escalated=True,
+            )
+            parsed = self._safe_parse(raw)
+            if self._is_parse_failure(parsed):
+                parsed = self._local_repair(raw)
+            stage = "escalated"
+        if self._is_parse_failure(parsed):
+            self.repair_stats["remote_repair_calls"] += 1
+            repaired = await self._repair_json(raw, round_number=round_number, use_cache=use_cache)
             parsed = self._safe_parse(repaired)
+            if self._is_parse_failure(parsed):
+                parsed = self._local_repair(repaired)
             stage = "repaired"
 
         if not self._is_parse_failure(parsed) and self._is_low_information(parsed):
             regenerated = await self._regenerate_structured_output(
-                prompt=prompt,
-                round_number=round_number,
-                centre_left_response=centre_left_response,
-                centre_response=centre_response,
-                centre_right_response=centre_right_response,
-                memory_text=memory_text,
+                messages, agents=len(responses), round_number=round_number, use_cache=use_cache
             )
             regen_parsed = self._safe_parse(regenerated)
+            if self._is_parse_failure(regen_parsed):
+                regen_parsed = self._local_repair(regenerated)
             if not self._is_parse_failure(regen_parsed) and not self._is_low_information(regen_parsed):
                 parsed = regen_parsed
                 stage = "regenerated"
 
-        fallback = self._deterministic_fallback(
-            centre_left_response=centre_left_response,
-            centre_response=centre_response,
-            centre_right_response=centre_right_response,
-            memory=memory,
-        )
+        fallback = self._deterministic_fallback(responses=responses, memory=memory, convergence=convergence)
 
         if self._is_parse_failure(parsed):
             parsed = fallback
@@ -89,6 +114,10 @@ class ModeratorAgent:
             parsed = self._merge_with_fallback(parsed, fallback)
             stage = "fallback_merge"
 
+        MODERATOR_STAGES.inc(stage=stage)
+        span = TRACER.current()
+        span.set("stage", stage)
+        span.set("confidence", float(parsed.get("confidence", 0)))
         self._debug_stage(
             round_number=round_number,
             stage=stage,
@@ -102,10 +131,13 @@ class ModeratorAgent:
         return ModeratorOutput(**parsed)
 
     @staticmethod
-    def _safe_parse(raw: str) -> Dict:
+    def _safe_parse(raw: str, required: Sequence[str] = ()) -> Dict:
         try:
             parsed = ModeratorAgent._extract_json_object(raw)
             data = json.loads(parsed)
+            missing = [key for key in required if key not in data]
+            if missing:
+                raise ValueError(f"Missing keys: {', '.join(missing)}")
             return ModeratorAgent._normalize_payload(data)
         except Exception:
             return {
@@ -117,6 +149,17 @@ class ModeratorAgent:
                 "summary": raw[:600],
             }
 
+    def _local_repair(self, raw: str) -> Dict:
+        self.repair_stats["local_repair_attempts"] += 1
+        try:
+            repaired = repair_json(raw)
+        except JSONRepairError:
+            return self._safe_parse(raw)
+        parsed = self._safe_parse(repaired, REPAIR_REQUIRED_KEYS)
+        if not self._is_parse_failure(parsed):
+            self.repair_stats["local_repair_successes"] += 1
+        return parsed
+
     @staticmethod
     def _normalize_items(value: object) -> List[str]:
         if not isinstance(value, list):
@@ -224,7 +267,7 @@ class ModeratorAgent:
 
         raise ValueError("No balanced JSON object found")
 
-    async def _repair_json(self, raw: str) -> str:
+    async def _repair_json(self, raw: str, *, round_number: int, use_cache: bool = True) -> str:
         repair_system = (
             "You are a strict JSON repair assistant. "
             "Return valid JSON only with keys: agreements, disagreements, strongest_arguments, "
@@ -241,49 +284,60 @@ class ModeratorAgent:
                 temperature=0.0,
                 response_format={"type": "json_object"},
                 max_tokens=500,
+                cache=use_cache,
+                role="repair",
+                round_number=round_number,
             )
         except Exception:
             return raw
 
     async def _regenerate_structured_output(
-        self,
-        *,
-        prompt: str,
-        round_number: int,
-        centre_left_response: str,
-        centre_response: str,
-        centre_right_response: str,
-        memory_text: str,
+        self, messages: List[Dict[str, str]], *, agents: int, round_number: int, use_cache: bool = True
     ) -> str:
-        regen_system = (
-            "You are the moderator for a debate. Return JSON only.\n"
+        # Same messages as the first attempt plus stricter rules at the end, so the provider can serve
+        # the whole round's inputs from its prompt cache.
+        regen_rules = (
+            "Your previous answer was incomplete. Return JSON only.\n"
             "Required keys: agreements, disagreements, strongest_arguments, consensus_statement, confidence, summary.\n"
             "Rules:\n"
             "- agreements: exactly 2 non-empty strings.\n"
             "- disagreements: exactly 2 non-empty strings.\n"
-            "- strongest_arguments: exactly 3 non-empty strings (one per agent).\n"
+            f"- strongest_arguments: exactly {agents} non-empty strings (one per agent).\n"
             "- consensus_statement: one concise paragraph.\n"
             "- summary: one concise paragraph.\n"
             "- confidence: number between 0 and 100.\n"
             "No markdown, no code fences."
         )
-        regen_user = (
-            f"Prompt: {prompt}\n"
-            f"Round: {round_number}\n"
-            f"Memory:\n{memory_text}\n\n"
-            f"Centre-Left:\n{centre_left_response}\n\n"
-            f"Centre:\n{centre_response}\n\n"
-            f"Centre-Right:\n{centre_right_response}\n"
-        )
         return await self.llm.complete(
-            [
-                {"role": "system", "content": regen_system},
-                {"role": "user", "content": regen_user},
-            ],
+            [*messages, {"role": "user", "content": regen_rules}],
             temperature=0.15,
             response_format={"type": "json_object"},
             max_tokens=700,
+            cache=use_cache,
+            role="regenerate",
+            round_number=round_number,
+        )
+
+    @staticmethod
+    def _messages(
+        prompt: str,
+        round_number: int,
+        responses: Dict[str, str],
+        memory_text: str,
+    ) -> List[Dict[str, str]]:
+        # Stable parts first (instructions, debate prompt, prior memory) so they form a cacheable prefix;
+        # this round's inputs come last.
+        round_inputs = (
+            f"Round: {round_number}\n\n"
+            "Current round inputs:\n"
+            + "\n".join(f"{AGENT_REGISTRY.label(name)}:\n{response}\n" for name, response in responses.items())
         )
+        return [
+            {"role": "system", "content": MODERATOR_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Debate prompt: {prompt}"},
+            {"role": "user", "content": f"Prior memory:\n{memory_text}"},
+            {"role": "user", "content": round_inputs},
+        ]
 
     @staticmethod
     def _merge_with_fallback(data: Dict, fallback: Dict) -> Dict:
@@ -309,17 +363,13 @@ class ModeratorAgent:
     @staticmethod
     def _deterministic_fallback(
         *,
-        centre_left_response: str,
-        centre_response: str,
-        centre_right_response: str,
+        responses: Dict[str, str],
         memory: List[RoundRecord],
+        convergence: Optional[ConvergenceStats] = None,
     ) -> Dict:
         previous_confidence = memory[-1].confidence if memory else 45.0
         fallback_confidence = ModeratorAgent._heuristic_confidence(
-            centre_left_response=centre_left_response,
-            centre_response=centre_response,
-            centre_right_response=centre_right_response,
-            memory=memory,
+            responses=responses, memory=memory, convergence=convergence
         )
         # Keep fallback confidence close to the previous round so one bad generation
         # does not reset trajectory.
@@ -337,9 +387,8 @@ class ModeratorAgent:
                 "Evidence weighting still differs across ideology-specific priorities.",
             ],
             "strongest_arguments": [
-                f"Centre-Left focus: {centre_left_response[:180].strip()}...",
-                f"Centre focus: {centre_response[:180].strip()}...",
-                f"Centre-Right focus: {centre_right_response[:180].strip()}...",
+                f"{AGENT_REGISTRY.label(name)} focus: {response[:180].strip()}..."
+                for name, response in responses.items()
             ],
             "consensus_statement": (
                 "A provisional consensus favors targeted, evidence-led policy with explicit guardrails, "
@@ -356,19 +405,14 @@ class ModeratorAgent:
     @staticmethod
     def _heuristic_confidence(
         *,
-        centre_left_response: str,
-        centre_response: str,
-        centre_right_response: str,
+        responses: Dict[str, str],
         memory: List[RoundRecord],
+        convergence: Optional[ConvergenceStats] = None,
     ) -> float:
-        left_tokens = ModeratorAgent._token_set(centre_left_response)
-        centre_tokens = ModeratorAgent._token_set(centre_response)
-        right_tokens = ModeratorAgent._token_set(centre_right_response)
-
-        overlap_lc = ModeratorAgent._jaccard(left_tokens, centre_tokens)
-        overlap_cr = ModeratorAgent._jaccard(centre_tokens, right_tokens)
-        overlap_lr = ModeratorAgent._jaccard(left_tokens, right_tokens)
-        avg_overlap = (overlap_lc + overlap_cr + overlap_lr) / 3.0
+        if convergence is not None:
+            avg_overlap = convergence.agreement
+        else:
+            avg_overlap = mean_agreement(list(responses.values()))
 
         # Base confidence from topical overlap between ideological positions.
         confidence = 30.0 + avg_overlap * 55.0
@@ -382,42 +426,11 @@ class ModeratorAgent:
             elif drift < -15:
                 confidence += 5.0  # avoid harsh collapse from one malformed round
 
-        return max(25.0, min(88.0, round(confidence, 1)))
-
-    @staticmethod
-    def _token_set(text: str) -> set[str]:
-        words = re.findall(r"[a-zA-Z]{4,}", text.lower())
-        stop = {
-            "that",
-            "this",
-            "with",
-            "from",
-            "have",
-            "will",
-            "they",
-            "their",
-            "which",
-            "about",
-            "there",
-            "should",
-            "would",
-            "could",
-            "while",
-            "where",
-            "into",
-            "because",
-            "against",
-        }
-        return {w for w in words if w not in stop}
+        # Positions moving together across rounds is evidence of convergence on its own.
+        if convergence is not None and convergence.velocity is not None:
+            confidence += max(-4.0, min(4.0, convergence.velocity * 40.0))
 
-    @staticmethod
-    def _jaccard(a: set[str], b: set[str]) -> float:
-        if not a or not b:
-            return 0.0
-        union = a | b
-        if not union:
-            return 0.0
-        return len(a & b) / len(union)
+        return max(25.0, min(88.0, round(confidence, 1)))
 
     @staticmethod
     def _debug_stage(
@@ -437,17 +450,3 @@ class ModeratorAgent:
             f"round={round_number} stage={stage} conf={confidence:.1f} "
             f"agreements={agreements} disagreements={disagreements} strongest={strongest} raw_len={raw_len}"
         )
-
-    @staticmethod
-    def _memory_to_text(memory: List[RoundRecord]) -> str:
-        if not memory:
-            return "No prior rounds."
-        chunks = []
-        for r in memory[-5:]:
-            chunks.append(
-                f"Round {r.round_number}:\n"
-                f"- Moderator summary: {r.moderator_summary}\n"
-                f"- Consensus: {r.consensus_statement}\n"
-                f"- Confidence: {r.confidence}"
-            )
-        return "\n\n".join(chunks)
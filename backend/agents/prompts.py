@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+# Shared by every debate agent. Providers cache identical message prefixes, so everything common to the
+# agents comes first (rules, debate prompt, memory) and the persona and round come last: every agent
+# after the first in a round reuses the first one's cached prefix.
+AGENT_SYSTEM_PROMPT = (
+    "You are an agent in a structured multi-agent debate. Your persona and ideological tendencies are "
+    "given at the end of the conversation.\n"
+    "Requirements:\n"
+    "- Respond in exactly 3 or 4 concise paragraphs.\n"
+    "- Keep total length under 220 words.\n"
+    "- Use prior debate memory to maintain coherence.\n"
+    "- Counter at least one argument from another agent explicitly.\n"
+    "- Keep ideological consistency.\n"
+    "- Cite support using policy precedent, economic theory, historical example, or research insight.\n"
+    "- End with a short line 'Citations:' followed by semicolon-separated references."
+)
+
+
+def agent_messages(
+    prompt: str, memory_text: str, round_number: int, *, label: str, tendencies: List[str]
+) -> List[Dict[str, str]]:
+    persona = (
+        f"You are the {label} Agent.\n"
+        "Ideological tendencies:\n" + "".join(f"- {tendency}\n" for tendency in tendencies) + "\n"
+        f"Round: {round_number}\n"
+        f"Now produce the {label} response."
+    )
+    return [
+        {"role": "system", "content": AGENT_SYSTEM_PROMPT},
+        {"role": "user", "content": f"Debate prompt: {prompt}"},
+        {"role": "user", "content": f"Debate memory:\n{memory_text}"},
+        {"role": "user", "content": persona},
+    ]
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.config import env_str
+
+DEFAULT_PERSONAS_PATH = Path(__file__).with_name("personas.json")
+# Roles the LLM layer already uses for other calls; an agent may not take one of these names.
+RESERVED_NAMES = frozenset({"agent", "default", "moderator", "regenerate", "repair"})
+_NAME_PATTERN = re.compile(r"^[a-z][a-z0-9_]*$")
+
+
+@dataclass(frozen=True)
+class Persona:
+    name: str
+    label: str
+    tendencies: Tuple[str, ...]
+    temperature: float = 0.5
+
+
+class AgentRegistry:
+    """Debate personas and the named panels that seat them, loaded from a JSON config."""
+
+    def __init__(self, personas: List[Persona], panels: Dict[str, List[str]], default_panel: str) -> None:
+        self.personas: Dict[str, Persona] = {}
+        for persona in personas:
+            if not _NAME_PATTERN.match(persona.name) or persona.name in RESERVED_NAMES:
+                raise ValueError(f"Invalid agent name {persona.name!r}: use lowercase snake_case, not a reserved role")
+            if persona.name in self.personas:
+                raise ValueError(f"Agent {persona.name!r} is defined twice")
+            self.personas[persona.name] = persona
+        for panel, names in panels.items():
+            unknown = [name for name in names if name not in self.personas]
+            if unknown:
+                raise ValueError(f"Panel {panel!r} seats unknown agents: {', '.join(unknown)}")
+            if len(names) < 2 or len(set(names)) != len(names):
+                raise ValueError(f"Panel {panel!r} needs at least two distinct agents")
+        if default_panel not in panels:
+            raise ValueError(f"Default panel {default_panel!r} is not defined")
+        self.panels = {panel: tuple(names) for panel, names in panels.items()}
+        self.default_panel = default_panel
+
+    @classmethod
+    def from_file(cls, path: Path, *, default_panel: Optional[str] = None) -> "AgentRegistry":
+        config = json.loads(Path(path).read_text(encoding="utf-8"))
+        personas = [
+            Persona(
+                name=entry["name"],
+                label=entry["label"],
+                tendencies=tuple(entry["tendencies"]),
+                temperature=float(entry.get("temperature", 0.5)),
+            )
+            for entry in config["personas"]
+        ]
+        return cls(personas, config["panels"], default_panel or config.get("default_panel", "three"))
+
+    @classmethod
+    def from_env(cls) -> "AgentRegistry":
+        path = env_str("DEBATE_PERSONAS_PATH")
+        return cls.from_file(Path(path) if path else DEFAULT_PERSONAS_PATH, default_panel=env_str("DEBATE_PANEL"))
+
+    def panel(self, name: Optional[str] = None) -> List[Persona]:
+        names = self.panels.get(name or self.default_panel)
+        if names is None:
+            raise ValueError(f"Unknown panel {name!r}; choose one of {', '.join(sorted(self.panels))}")
+        return [self.personas[agent] for agent in names]
+
+    def label(self, name: str) -> str:
+        persona = self.personas.get(name)
+        return persona.label if persona is not None else name.replace("_", " ").title()
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "default_panel": self.default_panel,
+            "panels": {panel: list(names) for panel, names in self.panels.items()},
+            "personas": {
+                name: {
+                    "label": persona.label,
+                    "tendencies": list(persona.tendencies),
+                    "temperature": persona.temperature,
+                }
+                for name, persona in self.personas.items()
+            },
+        }
+
+
+AGENT_REGISTRY = AgentRegistry.from_env()
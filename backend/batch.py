@@ -0,0 +1,231 @@
+"""Run debates offline over a JSONL file of prompts and write one JSONL result per debate.
+
+Each input line is a JSON object with a ``prompt`` plus any other ``DebateStartRequest`` field and an
+optional ``id``; plain-string lines are treated as prompts, and fields a line omits come from the CLI.
+Results are appended as debates finish, so an interrupted run can be restarted with the same output file
+and only unfinished prompts run again. Without an ``id``, a line's id is a hash of its full request
+including the CLI options, so changing those runs it again::
+
+    python -m backend.batch prompts.jsonl --output results.jsonl --concurrency 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, TextIO
+
+from pydantic import ValidationError
+
+from backend.debate_engine import DebateEngine
+from backend.models.schemas import DebateStartRequest
+from backend.services.usage import track_usage
+
+
+@dataclass
+class BatchItem:
+    id: str
+    request: DebateStartRequest
+
+
+@dataclass
+class BatchSummary:
+    total: int = 0
+    skipped: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    duration_s: float = 0.0
+    failures: List[str] = field(default_factory=list)
+
+
+def load_items(
+    lines: Iterable[str], *, defaults: Optional[Dict[str, Any]] = None, source: str = "<input>"
+) -> List[BatchItem]:
+    """Parse JSONL ``lines``; errors name ``source`` and the line so a bad line in a large file can be found."""
+    items: List[BatchItem] = []
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"{source}:{line_number}: invalid JSON: {exc}") from exc
+        if isinstance(payload, str):
+            payload = {"prompt": payload}
+        if not isinstance(payload, dict):
+            raise ValueError(f"{source}:{line_number}: expected a JSON object or string, got {type(payload).__name__}")
+        explicit_id = payload.pop("id", "")
+        try:
+            request = DebateStartRequest(**{**(defaults or {}), **payload})
+        except ValidationError as exc:
+            raise ValueError(f"{source}:{line_number}: {exc}") from exc
+        items.append(BatchItem(id=str(explicit_id or _default_id(request)), request=request))
+    return items
+
+
+def completed_ids(output: Path) -> Set[str]:
+    """Ids that already have a successful result in ``output``; failed ones are retried."""
+    done: Set[str] = set()
+    if not output.exists():
+        return done
+    with output.open() as handle:
+        for line in handle:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by an interrupted write.
+                continue
+            if result.get("status") == "ok":
+                done.add(result["id"])
+    return done
+
+
+async def run_item(engine: DebateEngine, item: BatchItem) -> Dict[str, Any]:
+    started = time.perf_counter()
+    round_started: Dict[int, float] = {}
+    rounds: List[Dict[str, Any]] = []
+    result: Dict[str, Any] = {"id": item.id, "prompt": item.request.prompt}
+    with track_usage() as usage:
+        try:
+            async for event in engine.run_debate(item.request):
+                event_type = event["event_type"]
+                if event_type == "round_start":
+                    round_started[event["round_number"]] = time.perf_counter()
+                elif event_type == "round":
+                    number = event["round_number"]
+                    rounds.append(
+                        {
+                            "round_number": number,
+                            "confidence": event["round_data"]["confidence"],
+                            "duration_s": round(time.perf_counter() - round_started.get(number, started), 3),
+                        }
+                    )
+                elif event_type == "final":
+                    result.update(
+                        status="ok",
+                        final_consensus=event["final_consensus"],
+                        final_confidence=event["final_confidence"],
+                        rounds_completed=event["rounds_completed"],
+                        stop_reason=event.get("stop_reason"),
+                        calls_saved=event.get("calls_saved", 0),
+                        reached_target=event["final_confidence"] >= item.request.confidence_target,
+                    )
+        except Exception as exc:
+            result.update(status="error", error=str(exc))
+    result.update(
+        confidence_trajectory=[r["confidence"] for r in rounds],
+        rounds=rounds,
+        duration_s=round(time.perf_counter() - started, 3),
+        usage=usage.to_dict(),
+    )
+    return result
+
+
+async def run_batch(
+    items: List[BatchItem],
+    output: Path,
+    *,
+    concurrency: int = 4,
+    resume: bool = True,
+    engine: Optional[DebateEngine] = None,
+    progress: Optional[TextIO] = None,
+) -> BatchSummary:
+    """Run ``items`` with at most ``concurrency`` debates in flight, appending each result to ``output``.
+
+    LLM calls from all debates share the process-wide admission controller, so provider rate limits
+    are respected however high ``concurrency`` is set.
+    """
+    engine = engine or DebateEngine()
+    summary = BatchSummary(total=len(items))
+    done = completed_ids(output) if resume else set()
+    pending = [item for item in items if item.id not in done]
+    summary.skipped = len(items) - len(pending)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    started = time.perf_counter()
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("a" if resume else "w") as handle:
+
+        async def run_one(item: BatchItem) -> None:
+            async with semaphore:
+                result = await run_item(engine, item)
+            handle.write(json.dumps(result, ensure_ascii=False) + "\n")
+            handle.flush()
+            if result["status"] == "ok":
+                summary.succeeded += 1
+            else:
+                summary.failed += 1
+                summary.failures.append(item.id)
+            if progress is not None:
+                finished = summary.succeeded + summary.failed
+                progress.write(
+                    f"[{finished}/{len(pending)}] {item.id} {result['status']} "
+                    f"rounds={result.get('rounds_completed', 0)} confidence={result.get('final_confidence', 0.0)} "
+                    f"{result['duration_s']}s\n"
+                )
+
+        await asyncio.gather(*(run_one(item) for item in pending))
+
+    summary.duration_s = round(time.perf_counter() - started, 3)
+    return summary
+
+
+def _default_id(request: DebateStartRequest) -> str:
+    # Stable across runs so resume can match prompts without explicit ids. Hashes the request with the CLI
+    # defaults merged in, so rerunning with e.g. another --max-rounds or --panel runs the prompts again;
+    # fields left at the schema default are omitted, so adding a new field does not change every id.
+    settings = request.model_dump(mode="json", exclude_defaults=True)
+    digest = hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()
+    return digest[:16]
+
+
+def main(argv: Optional[List[str]] = None) -> BatchSummary:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", type=Path, help="JSONL file of prompts.")
+    parser.add_argument("--output", "-o", type=Path, required=True, help="JSONL file results are appended to.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Debates in flight at once.")
+    parser.add_argument("--no-resume", action="store_true", help="Overwrite the output instead of skipping done ids.")
+    parser.add_argument("--confidence-target", type=float, default=80.0)
+    parser.add_argument("--max-rounds", type=int, default=None)
+    parser.add_argument("--panel", default=None, help="Agent panel from the registry (e.g. three, five, seven).")
+    parser.add_argument("--time-budget", type=float, default=None, help="Wall-clock budget per debate in seconds.")
+    parser.add_argument("--token-budget", type=int, default=None, help="LLM token budget per debate.")
+    parser.add_argument("--stream-tokens", action="store_true", help="Request token streaming from the provider.")
+    parser.add_argument(
+        "--stop-policies",
+        default="",
+        help="Comma-separated early-stopping policies (plateau, projection, stagnation).",
+    )
+    args = parser.parse_args(argv)
+
+    # Token events are only useful to live viewers, so batches skip them unless asked.
+    defaults: Dict[str, Any] = {"confidence_target": args.confidence_target, "stream_tokens": args.stream_tokens}
+    if args.max_rounds is not None:
+        defaults["max_rounds"] = args.max_rounds
+    if args.panel is not None:
+        defaults["panel"] = args.panel
+    if args.time_budget is not None or args.token_budget is not None:
+        defaults["budget"] = {"seconds": args.time_budget, "tokens": args.token_budget}
+    if args.stop_policies:
+        defaults["stopping"] = {"policies": [name.strip() for name in args.stop_policies.split(",") if name.strip()]}
+    with args.input.open() as handle:
+        try:
+            items = load_items(handle, defaults=defaults, source=str(args.input))
+        except ValueError as exc:
+            parser.error(str(exc))
+    summary = asyncio.run(
+        run_batch(items, args.output, concurrency=args.concurrency, resume=not args.no_resume, progress=sys.stderr)
+    )
+    print(json.dumps(asdict(summary), indent=2))
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Awaitable, Optional, TypeVar
+
+from backend.models.schemas import BudgetConfig
+from backend.services.usage import UsageTotals
+from backend.stopping import StopDecision
+
+TIME_BUDGET = "time_budget"
+TOKEN_BUDGET = "token_budget"
+CANCELLED = "cancelled"
+
+T = TypeVar("T")
+
+
+class BudgetExhausted(Exception):
+    """Raised inside a round when the debate ran out of time or tokens, or was cancelled."""
+
+    def __init__(self, decision: StopDecision) -> None:
+        super().__init__(decision.message)
+        self.decision = decision
+
+
+class DebateBudget:
+    """Wall-clock and token allowance of one debate, plus its cancellation signal, tracked across rounds.
+
+    Awaits that can take a whole LLM call go through ``run``, so running out of time or a cancellation
+    request interrupts the call itself (and any repair or regeneration chained behind it) instead of
+    waiting for it to finish and bill tokens nobody will read.
+    """
+
+    def __init__(
+        self, config: BudgetConfig, usage: UsageTotals, *, cancel: Optional[asyncio.Event] = None
+    ) -> None:
+        self.config = config
+        self.usage = usage
+        self.cancel = cancel
+        self.started = time.monotonic()
+        self.deadline = self.started + config.seconds if config.seconds is not None else None
+        # Totals at the end of the last completed round; what is spent after it belongs to a round in progress.
+        self.completed_rounds = 0
+        self.completed_tokens = 0
+        self._cancel_waiter: Optional[asyncio.Task] = None
+
+    @property
+    def tokens_used(self) -> int:
+        return self.usage.total_tokens
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining_seconds(self) -> Optional[float]:
+        return None if self.deadline is None else self.deadline - time.monotonic()
+
+    def check(self) -> None:
+        """Raise ``BudgetExhausted`` if the debate was cancelled or has spent an allowance."""
+        decision = self._exhausted()
+        if decision is not None:
+            raise BudgetExhausted(decision)
+
+    async def run(self, awaitable: Awaitable[T]) -> T:
+        """Await ``awaitable``, cancelling it and raising ``BudgetExhausted`` if time or the debate runs out first."""
+        if self.deadline is None and self.cancel is None:
+            return await awaitable
+        self.check()
+        task = asyncio.ensure_future(awaitable)
+        waiters = {task}
+        if self.cancel is not None:
+            if self._cancel_waiter is None:
+                self._cancel_waiter = asyncio.create_task(self.cancel.wait())
+            waiters.add(self._cancel_waiter)
+        try:
+            await asyncio.wait(waiters, timeout=self.remaining_seconds(), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            interrupted = not task.done()
+            if interrupted:
+                task.cancel()
+                # Let the cancellation unwind (releasing admission slots and connections) before moving on.
+                await asyncio.gather(task, return_exceptions=True)
+        if interrupted:
+            # Not cancelled, so the wait timed out, possibly a clock tick before the deadline.
+            raise BudgetExhausted(self._exhausted(out_of_time=True))
+        return task.result()
+
+    def round_completed(self, round_number: int) -> None:
+        self.completed_rounds = round_number
+        self.completed_tokens = self.tokens_used
+
+    def after_round(self, round_number: int) -> Optional[StopDecision]:
+        """Stop before the next round if an allowance is spent or smaller than an average round costs so far.
+
+        Expects ``round_completed`` to have been called for ``round_number``.
+        """
+        decision = self._exhausted(between_rounds=True)
+        if decision is not None:
+            return decision
+        remaining = self.remaining_seconds()
+        per_round = self.elapsed / round_number
+        if remaining is not None and remaining < per_round:
+            return StopDecision(
+                TIME_BUDGET,
+                f"{remaining:.1f}s of the {self.config.seconds:g}s budget left, "
+                f"less than a round takes (~{per_round:.1f}s).",
+            )
+        if self.config.tokens is not None:
+            left = self.config.tokens - self.tokens_used
+            tokens_per_round = self.tokens_used / round_number
+            if left < tokens_per_round:
+                return StopDecision(
+                    TOKEN_BUDGET,
+                    f"{left} of the {self.config.tokens} token budget left, "
+                    f"less than a round uses (~{tokens_per_round:.0f}).",
+                )
+        return None
+
+    def tokens_per_round(self) -> float:
+        return self.completed_tokens / self.completed_rounds if self.completed_rounds else 0.0
+
+    def discarded_tokens(self) -> int:
+        """Tokens spent on a round that was interrupted and thrown away."""
+        return max(0, self.tokens_used - self.completed_tokens)
+
+    def close(self) -> None:
+        if self._cancel_waiter is not None:
+            self._cancel_waiter.cancel()
+            self._cancel_waiter = None
+
+    def _exhausted(self, *, out_of_time: bool = False, between_rounds: bool = False) -> Optional[StopDecision]:
+        when = (
+            f"after round {self.completed_rounds}" if between_rounds else f"during round {self.completed_rounds + 1}"
+        )
+        if self.cancel is not None and self.cancel.is_set():
+            return StopDecision(CANCELLED, f"Debate cancelled {when}.")
+        remaining = self.remaining_seconds()
+        if out_of_time or (remaining is not None and remaining <= 0):
+            return StopDecision(TIME_BUDGET, f"The {self.config.seconds:g}s budget ran out {when}.")
+        if self.config.tokens is not None and self.tokens_used >= self.config.tokens:
+            return StopDecision(
+                TOKEN_BUDGET, f"{self.tokens_used} tokens used of the {self.config.tokens} token budget {when}."
+            )
+        return None
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import re
+import zlib
+from functools import lru_cache
+from itertools import combinations
+from typing import FrozenSet, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from backend.models.schemas import ConvergenceStats
+
+# Power of two so a token's bucket is a mask of its CRC; collisions are rare at a few hundred terms.
+FEATURE_DIM = 4096
+_WORD_PATTERN = re.compile(r"[a-zA-Z]{4,}")
+STOP_WORDS = frozenset(
+    {
+        "that",
+        "this",
+        "with",
+        "from",
+        "have",
+        "will",
+        "they",
+        "their",
+        "which",
+        "about",
+        "there",
+        "should",
+        "would",
+        "could",
+        "while",
+        "where",
+        "into",
+        "because",
+        "against",
+    }
+)
+
+
+def token_set(text: str) -> FrozenSet[str]:
+    return frozenset(w for w in _WORD_PATTERN.findall(text.lower()) if w not in STOP_WORDS)
+
+
+@lru_cache(maxsize=256)
+def features(text: str) -> np.ndarray:
+    """Binary hashed bag of words for ``text``; cached so each response is tokenized once."""
+    vector = np.zeros(FEATURE_DIM, dtype=np.float32)
+    terms = token_set(text)
+    if terms:
+        buckets = np.fromiter((zlib.crc32(t.encode("utf-8")) for t in terms), dtype=np.uint32, count=len(terms))
+        vector[buckets & (FEATURE_DIM - 1)] = 1.0
+    vector.setflags(write=False)
+    return vector
+
+
+def jaccard_matrix(rows: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """Pairwise Jaccard similarity between binary feature rows, via one matrix product."""
+    intersection = rows @ others.T
+    union = rows.sum(axis=1)[:, None] + others.sum(axis=1)[None, :] - intersection
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+def mean_agreement(texts: Sequence[str]) -> float:
+    """Mean pairwise Jaccard similarity between ``texts``."""
+    if len(texts) < 2:
+        return 0.0
+    rows = np.stack([features(text) for text in texts])
+    similarity = jaccard_matrix(rows, rows)
+    upper = np.triu_indices(len(texts), k=1)
+    return float(similarity[upper].mean())
+
+
+class ConvergenceTracker:
+    """Similarity of every agent response to every other across a debate, extended one round at a time.
+
+    Each round adds one feature row per agent and only the new rows are compared against the rest, so a
+    round costs O(responses so far) vector products rather than re-tokenizing the whole debate.
+    """
+
+    def __init__(self, agents: Sequence[str]) -> None:
+        self.agents = list(agents)
+        self.rounds: List[ConvergenceStats] = []
+        self._count = 0
+        self._vectors = np.zeros((0, FEATURE_DIM), dtype=np.float32)
+        self._similarity = np.zeros((0, 0), dtype=np.float32)
+
+    @property
+    def similarity(self) -> np.ndarray:
+        """Jaccard similarity between all responses so far, ordered round by round, then by agent."""
+        return self._similarity[: self._count, : self._count]
+
+    def add_round(self, round_number: int, responses: Mapping[str, str]) -> ConvergenceStats:
+        width = len(self.agents)
+        start, end = self._count, self._count + width
+        self._reserve(end)
+        self._vectors[start:end] = np.stack([features(responses[agent]) for agent in self.agents])
+        block = jaccard_matrix(self._vectors[start:end], self._vectors[:end])
+        self._similarity[start:end, :end] = block
+        self._similarity[:end, start:end] = block.T
+        self._count = end
+
+        current = self._similarity[start:end, start:end]
+        pairwise = {
+            f"{self.agents[i]}|{self.agents[j]}": round(float(current[i, j]), 4)
+            for i, j in combinations(range(width), 2)
+        }
+        agreement = float(current[np.triu_indices(width, k=1)].mean()) if width > 1 else 0.0
+        previous = self.rounds[-1] if self.rounds else None
+        stability: Optional[float] = None
+        if previous is not None:
+            # How much each agent kept of its own previous answer.
+            stability = round(float(np.diagonal(self._similarity[start:end, start - width : start]).mean()), 4)
+        stats = ConvergenceStats(
+            round_number=round_number,
+            agreement=round(agreement, 4),
+            velocity=round(agreement - previous.agreement, 4) if previous is not None else None,
+            stability=stability,
+            pairwise=pairwise,
+        )
+        self.rounds.append(stats)
+        return stats
+
+    def velocity(self) -> List[float]:
+        return [stats.velocity for stats in self.rounds if stats.velocity is not None]
+
+    def _reserve(self, rows: int) -> None:
+        capacity = self._vectors.shape[0]
+        if rows <= capacity:
+            return
+        # Doubling keeps growth amortized O(1) per round.
+        capacity = max(rows, capacity * 2, 8)
+        vectors = np.zeros((capacity, FEATURE_DIM), dtype=np.float32)
+        vectors[: self._count] = self._vectors[: self._count]
+        similarity = np.zeros((capacity, capacity), dtype=np.float32)
+        similarity[: self._count, : self._count] = self.similarity
+        self._vectors, self._similarity = vectors, similarity
+
@@ -1,104 +1,383 @@
 from __future__ import annotations
 
-from typing import AsyncGenerator, Dict
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Dict, Iterator, List, Optional, Tuple
 from uuid import uuid4
 
-from backend.agents.centre import CentreAgent
-from backend.agents.centre_left import CentreLeftAgent
-from backend.agents.centre_right import CentreRightAgent
+from backend.agents.debate_agent import DebateAgent
 from backend.agents.moderator import ModeratorAgent
-from backend.memory.memory_store import InMemoryDebateStore
-from backend.models.schemas import DebateEvent, DebateStartRequest, RoundRecord
+from backend.agents.registry import AGENT_REGISTRY, AgentRegistry
+from backend.budget import CANCELLED, BudgetExhausted, DebateBudget
+from backend.config import env_int
+from backend.convergence import ConvergenceTracker
+from backend.memory.memory_store import DebateStore, create_debate_store
+from backend.memory.memory_view import HISTORY_WINDOW, MemoryView
+from backend.models.schemas import (
+    DebateEvent,
+    DebateStartRequest,
+    ModeratorOutput,
+    RoundRecord,
+    SemanticCacheMatch,
+)
 from backend.services.llm_service import LLMService
+from backend.services.tracing import NOOP_SPAN, TRACER, timeline
+from backend.services.usage import track_usage
+from backend.services.metrics import (
+    DEBATE_CALLS_SAVED,
+    DEBATE_DISCARDED_TOKENS,
+    DEBATE_EARLY_STOPS,
+    DEBATE_ROUNDS,
+    DEBATE_TOKENS_SAVED,
+    DEBATES_IN_FLIGHT,
+    MEMORY_PROMPT_TOKENS,
+    MEMORY_TOKENS_SAVED,
+    SEMANTIC_CACHE_LOOKUPS,
+)
+from backend.semantic_cache import CachedDebate, SemanticDebateCache
+from backend.speculation import DIVERGENCE, SpeculationPolicy
+from backend.stopping import MAX_ROUNDS, TARGET_REACHED, StopDecision, StoppingController
+
+@dataclass
+class _AgentRound:
+    round_number: int
+    memory_text: str
+    agents: List[DebateAgent]
+    queue: asyncio.Queue[Tuple[DebateAgent, Dict]]
+    tasks: List[asyncio.Task]
+
+    def cancel(self) -> int:
+        """Cancel unfinished agent calls; returns how many calls were started for nothing."""
+        for task in self.tasks:
+            if not task.done():
+                task.cancel()
+        return len(self.tasks)
 
 
 class DebateEngine:
-    def __init__(self) -> None:
-        self.store = InMemoryDebateStore()
+    def __init__(self, store: Optional[DebateStore] = None, registry: Optional[AgentRegistry] = None) -> None:
+        self.store = store or create_debate_store()
         self.llm = LLMService()
 
-        self.centre_left = CentreLeftAgent(self.llm)
-        self.centre = CentreAgent(self.llm)
-        self.centre_right = CentreRightAgent(self.llm)
+        self.registry = registry or AGENT_REGISTRY
         self.moderator = ModeratorAgent(self.llm)
+        self._panels: Dict[str, List[DebateAgent]] = {}
+        # Default panel, for callers that do not pick one.
+        self.agents = self.panel()
+        # Agent calls of one round allowed in flight at once; 0 lets the whole panel run together.
+        self.agent_concurrency = max(0, env_int("DEBATE_AGENT_CONCURRENCY", 8))
+        self.speculation = SpeculationPolicy()
+        self.semantic_cache = SemanticDebateCache()
+
+    async def run_debate(
+        self,
+        request: DebateStartRequest,
+        *,
+        debate_id: Optional[str] = None,
+        cancel: Optional[asyncio.Event] = None,
+        queued_seconds: float = 0.0,
+    ) -> AsyncGenerator[Dict, None]:
+        """Run one debate; setting ``cancel`` ends it like a spent budget, interrupting the calls in flight.
+
+        ``queued_seconds`` is how long the request waited for a worker; the trace starts when it was queued.
+        """
+        DEBATES_IN_FLIGHT.inc()
+        session_id = debate_id or uuid4().hex
+        trace = TRACER.start_trace(
+            "debate",
+            record=request.include_timeline,
+            start_ns=time.time_ns() - int(queued_seconds * 1e9),
+            debate_id=session_id,
+            panel=request.panel or self.registry.default_panel,
+            max_rounds=request.max_rounds,
+        )
+        if queued_seconds > 0 and trace.recording:
+            TRACER.start_span("queue", parent=trace, start_ns=trace.start_ns).end()
+        budget: Optional[DebateBudget] = None
+        try:
+            with track_usage() as usage:
+                budget = DebateBudget(request.budget, usage, cancel=cancel)
+                async for event in self._run_debate(request, session_id, budget, trace):
+                    yield event
+                trace.set("prompt_tokens", usage.prompt_tokens)
+                trace.set("completion_tokens", usage.completion_tokens)
+        except (asyncio.CancelledError, GeneratorExit):
+            trace.end("cancelled")
+            raise
+        except Exception as exc:
+            trace.set("error", str(exc)[:200])
+            trace.end("error")
+            raise
+        finally:
+            if budget is not None:
+                budget.close()
+            trace.end()
+            DEBATES_IN_FLIGHT.dec()
+
+    def panel(self, name: Optional[str] = None) -> List[DebateAgent]:
+        """Agents seated on the named registry panel, built once and reused across debates."""
+        key = name or self.registry.default_panel
+        agents = self._panels.get(key)
+        if agents is None:
+            agents = [DebateAgent(self.llm, persona) for persona in self.registry.panel(key)]
+            self._panels[key] = agents
+        return agents
+
+    async def _run_debate(
+        self, request: DebateStartRequest, session_id: str, budget: DebateBudget, trace: Any
+    ) -> AsyncGenerator[Dict, None]:
+        agents = self.panel(request.panel)
+        cached = self._semantic_lookup(request)
+        seed: Optional[SemanticCacheMatch] = None
+        # A related completed debate stands in for the empty memory of round 1.
+        seed_text: Optional[str] = None
+        if cached is not None:
+            debate, similarity = cached
+            plan = (
+                debate.replay_plan(request, [agent.name for agent in agents])
+                if request.semantic_cache_mode == "replay"
+                else None
+            )
+            if plan is not None:
+                rounds, stop_reason = plan
+                match = SemanticCacheMatch(
+                    debate_id=debate.debate_id, prompt=debate.prompt, similarity=round(similarity, 4), mode="replay"
+                )
+                calls_saved = rounds * (len(agents) + 1)
+                self.semantic_cache.record_outcome("replay", calls_saved)
+                SEMANTIC_CACHE_LOOKUPS.inc(outcome="replay")
+                for event in self._replay(request, session_id, agents, debate, match, rounds, stop_reason, calls_saved):
+                    yield event
+                return
+            seed = SemanticCacheMatch(
+                debate_id=debate.debate_id, prompt=debate.prompt, similarity=round(similarity, 4), mode="seed"
+            )
+            seed_text = debate.seed_text()
+            self.semantic_cache.record_outcome("seed")
+            SEMANTIC_CACHE_LOOKUPS.inc(outcome="seed")
+        elif request.similarity_threshold is not None:
+            self.semantic_cache.record_outcome("miss")
+            SEMANTIC_CACHE_LOOKUPS.inc(outcome="miss")
 
-    async def run_debate(self, request: DebateStartRequest) -> AsyncGenerator[Dict, None]:
-        session_id = str(uuid4())
         yield DebateEvent(
             event_type="started",
+            debate_id=session_id,
             target_confidence=request.confidence_target,
+            semantic_cache=seed,
             message="Debate started",
         ).model_dump()
 
+        records: List[RoundRecord] = []
+        moderator_outputs: List[ModeratorOutput] = []
         final_consensus = ""
         final_confidence = 0.0
         rounds_completed = 0
+        speculative: Optional[_AgentRound] = None
+        # The stand-in for the moderator's record that the speculative turns were started against.
+        provisional: Optional[RoundRecord] = None
+        convergence = ConvergenceTracker([agent.name for agent in agents])
+        stopping = StoppingController(request)
+        stop: Optional[StopDecision] = None
+        # Spans are started and ended explicitly here; only code without a yield in between runs "inside"
+        # one, since this generator's context belongs to whoever iterates it.
+        round_span: Any = NOOP_SPAN
 
-        for round_number in range(1, request.max_rounds + 1):
-            history = self.store.get_history(session_id)
+        try:
+            for round_number in range(1, request.max_rounds + 1):
+                budget.check()
+                round_span = TRACER.start_span("round", parent=trace, round_number=round_number)
+                history = await self.store.get_history(session_id, limit=HISTORY_WINDOW)
+                memory = await self.store.get_memory_view(session_id)
+                if round_number > 1:
+                    self._observe_memory(memory, len(agents))
 
-            yield DebateEvent(
-                event_type="round_start",
-                round_number=round_number,
-                message=f"Debate Round {round_number} started",
-            ).model_dump()
+                yield DebateEvent(
+                    event_type="round_start",
+                    round_number=round_number,
+                    message=f"Debate Round {round_number} started",
+                ).model_dump()
 
-            yield DebateEvent(
-                event_type="agent_thinking",
-                round_number=round_number,
-                agent="centre_left",
-                message="Centre-Left agent is thinking...",
-            ).model_dump()
-            centre_left_response = await self.centre_left.respond(request.prompt, history, round_number)
-            yield DebateEvent(
-                event_type="agent_response",
-                round_number=round_number,
-                agent="centre_left",
-                content=centre_left_response,
-            ).model_dump()
+                agent_memory = memory.agent_text()
+                moderator_memory = memory.moderator_text()
+                if round_number == 1 and seed_text is not None:
+                    agent_memory = moderator_memory = seed_text
 
-            yield DebateEvent(
-                event_type="agent_thinking",
-                round_number=round_number,
-                agent="centre",
-                message="Centre agent is thinking...",
-            ).model_dump()
-            centre_response = await self.centre.respond(request.prompt, history, round_number)
-            yield DebateEvent(
-                event_type="agent_response",
-                round_number=round_number,
-                agent="centre",
-                content=centre_response,
-            ).model_dump()
+                with TRACER.activate(round_span):
+                    agent_round = speculative or self._start_agents(request, agents, agent_memory, round_number)
+                speculative = None
+                responses: Dict[str, str] = {}
+                async for event in self._agent_events(request, agent_round, responses, budget):
+                    yield event
+                round_convergence = convergence.add_round(round_number, responses)
 
-            yield DebateEvent(
-                event_type="agent_thinking",
-                round_number=round_number,
-                agent="centre_right",
-                message="Centre-Right agent is thinking...",
-            ).model_dump()
-            centre_right_response = await self.centre_right.respond(request.prompt, history, round_number)
-            yield DebateEvent(
-                event_type="agent_response",
-                round_number=round_number,
-                agent="centre_right",
-                content=centre_right_response,
-            ).model_dump()
+                yield DebateEvent(
+                    event_type="moderator_thinking",
+                    round_number=round_number,
+                    agent="moderator",
+                    message="Moderator is synthesizing the round...",
+                ).model_dump()
+
+                if request.pipeline_rounds and round_number < request.max_rounds:
+                    # Start the next round against provisional memory while the moderator works; the
+                    # result is only used if the real memory turns out close enough.
+                    provisional = self._provisional_record(round_number, responses, history)
+                    with TRACER.activate(round_span):
+                        speculative = self._start_agents(
+                            request, agents, memory.preview_agent_text(provisional), round_number + 1
+                        )
+                    self.speculation.started += 1
 
+                with TRACER.activate(round_span), TRACER.span("moderator", round_number=round_number):
+                    moderator_output = await budget.run(
+                        self.moderator.moderate(
+                            prompt=request.prompt,
+                            round_number=round_number,
+                            responses=responses,
+                            memory=history,
+                            memory_text=moderator_memory,
+                            use_cache=request.use_cache,
+                            convergence=round_convergence,
+                        )
+                    )
+                yield DebateEvent(
+                    event_type="moderator_response",
+                    round_number=round_number,
+                    agent="moderator",
+                    moderator=moderator_output,
+                    message=f"Moderator confidence: {moderator_output.confidence:.1f}%",
+                ).model_dump()
+
+                record = RoundRecord(
+                    round_number=round_number,
+                    responses=responses,
+                    moderator_summary=moderator_output.summary,
+                    consensus_statement=moderator_output.consensus_statement,
+                    confidence=moderator_output.confidence,
+                )
+                await self.store.append_round(session_id, record)
+                records.append(record)
+                moderator_outputs.append(moderator_output)
+
+                rounds_completed = round_number
+                budget.round_completed(round_number)
+                round_span.set("confidence", moderator_output.confidence)
+                round_span.end()
+                final_consensus = moderator_output.consensus_statement
+                final_confidence = moderator_output.confidence
+
+                yield DebateEvent(
+                    event_type="round",
+                    round_number=round_number,
+                    round_data=record,
+                    moderator=moderator_output,
+                    convergence=round_convergence,
+                ).model_dump()
+
+                stop = stopping.after_round(round_number, moderator_output.confidence, convergence.rounds)
+                if stop is None and round_number < request.max_rounds:
+                    stop = budget.after_round(round_number)
+                if stop is not None:
+                    if speculative is not None:
+                        self.speculation.record_discard(stop.reason, speculative.cancel())
+                        speculative = None
+                    break
+
+                if speculative is not None and provisional is not None:
+                    if self.speculation.should_commit(provisional, record):
+                        self.speculation.record_commit()
+                    else:
+                        self.speculation.record_discard(DIVERGENCE, speculative.cancel())
+                        speculative = None
+        except BudgetExhausted as exhausted:
+            # The interrupted round is dropped; the debate ends on the last completed one.
+            stop = exhausted.decision
+            round_span.end("cancelled")
+        finally:
+            round_span.end("error")
+            if speculative is not None:
+                self.speculation.record_discard(stop.reason if stop is not None else CANCELLED, speculative.cancel())
+
+        stop_reason = stop.reason if stop is not None else MAX_ROUNDS
+        calls_saved = 0
+        if stop_reason not in (TARGET_REACHED, MAX_ROUNDS):
+            # Each skipped round would have cost one call per agent plus the moderator.
+            calls_saved = (request.max_rounds - rounds_completed) * (len(agents) + 1)
+            DEBATE_EARLY_STOPS.inc(reason=stop_reason)
+            DEBATE_CALLS_SAVED.inc(calls_saved)
+            # What the skipped rounds would have cost at this debate's average, less what the cut round already spent.
+            discarded = budget.discarded_tokens()
+            saved = budget.tokens_per_round() * (request.max_rounds - rounds_completed) - discarded
+            if discarded > 0:
+                DEBATE_DISCARDED_TOKENS.inc(discarded, reason=stop_reason)
+            if saved > 0:
+                DEBATE_TOKENS_SAVED.inc(round(saved), reason=stop_reason)
+        DEBATE_ROUNDS.observe(
+            rounds_completed,
+            outcome={TARGET_REACHED: "converged", MAX_ROUNDS: "max_rounds"}.get(stop_reason, "stopped_early"),
+        )
+        self.semantic_cache.add(
+            CachedDebate(
+                debate_id=session_id,
+                prompt=request.prompt,
+                agents=[agent.name for agent in agents],
+                rounds=records,
+                moderator=moderator_outputs,
+                convergence=list(convergence.rounds),
+                stop_reason=stop_reason,
+            )
+        )
+        trace.set("rounds_completed", rounds_completed)
+        trace.set("stop_reason", stop_reason)
+        yield DebateEvent(
+            event_type="final",
+            final_consensus=final_consensus,
+            final_confidence=final_confidence,
+            rounds_completed=rounds_completed,
+            stop_reason=stop_reason,
+            calls_saved=calls_saved,
+            timeline=self._timeline(trace) if request.include_timeline else None,
+            message=stop.message if stop is not None and stop_reason != TARGET_REACHED else "Debate completed",
+        ).model_dump()
+
+        await self.store.clear(session_id)
+
+    def _semantic_lookup(self, request: DebateStartRequest) -> Optional[Tuple[CachedDebate, float]]:
+        # Like the response cache, a request asking for fresh sampling never reuses earlier debates.
+        if request.similarity_threshold is None or not request.use_cache:
+            return None
+        return self.semantic_cache.lookup(request.prompt, request.similarity_threshold)
+
+    def _replay(
+        self,
+        request: DebateStartRequest,
+        session_id: str,
+        agents: List[DebateAgent],
+        debate: CachedDebate,
+        match: SemanticCacheMatch,
+        rounds: int,
+        stop_reason: str,
+        calls_saved: int,
+    ) -> Iterator[Dict]:
+        """Events of a cached debate's first ``rounds`` rounds, without token deltas or thinking events."""
+        yield DebateEvent(
+            event_type="started",
+            debate_id=session_id,
+            target_confidence=request.confidence_target,
+            semantic_cache=match,
+            message="Debate replayed from a completed debate with a similar prompt",
+        ).model_dump()
+        for record, moderator_output, round_convergence in zip(
+            debate.rounds[:rounds], debate.moderator, debate.convergence
+        ):
+            round_number = record.round_number
             yield DebateEvent(
-                event_type="moderator_thinking",
+                event_type="round_start",
                 round_number=round_number,
-                agent="moderator",
-                message="Moderator is synthesizing the round...",
+                message=f"Debate Round {round_number} started",
             ).model_dump()
-            moderator_output = await self.moderator.moderate(
-                prompt=request.prompt,
-                round_number=round_number,
-                centre_left_response=centre_left_response,
-                centre_response=centre_response,
-                centre_right_response=centre_right_response,
-                memory=history,
-            )
+            for agent in agents:
+                yield self._response_event(agent, round_number, record.responses[agent.name], None)
             yield DebateEvent(
                 event_type="moderator_response",
                 round_number=round_number,
@@ -106,38 +385,211 @@ class DebateEngine:
                 moderator=moderator_output,
                 message=f"Moderator confidence: {moderator_output.confidence:.1f}%",
             ).model_dump()
-
-            record = RoundRecord(
-                round_number=round_number,
-                centre_left_response=centre_left_response,
-                centre_response=centre_response,
-                centre_right_response=centre_right_response,
-                moderator_summary=moderator_output.summary,
-                consensus_statement=moderator_output.consensus_statement,
-                confidence=moderator_output.confidence,
-            )
-            self.store.append_round(session_id, record)
-
-            rounds_completed = round_number
-            final_consensus = moderator_output.consensus_statement
-            final_confidence = moderator_output.confidence
-
             yield DebateEvent(
                 event_type="round",
                 round_number=round_number,
                 round_data=record,
                 moderator=moderator_output,
+                convergence=round_convergence,
             ).model_dump()
-
-            if moderator_output.confidence >= request.confidence_target:
-                break
-
+        last = debate.rounds[rounds - 1]
         yield DebateEvent(
             event_type="final",
-            final_consensus=final_consensus,
-            final_confidence=final_confidence,
-            rounds_completed=rounds_completed,
-            message="Debate completed",
+            final_consensus=last.consensus_statement,
+            final_confidence=last.confidence,
+            rounds_completed=rounds,
+            stop_reason=stop_reason,
+            calls_saved=calls_saved,
+            semantic_cache=match,
+            message="Debate completed (replayed from the semantic debate cache)",
+        ).model_dump()
+
+    @staticmethod
+    def _timeline(trace: Any) -> Optional[List[Dict]]:
+        if not trace.recording:
+            return None
+        # Agents and moderator per round, plus each moderator LLM call so repairs and regenerations show up.
+        return timeline(trace, ("queue", "round", "agent", "moderator"), expand=("moderator",))
+
+    def _observe_memory(self, memory: MemoryView, panel_size: int) -> None:
+        usage = memory.token_usage()
+        MEMORY_PROMPT_TOKENS.observe(usage["agent_tokens"], audience="agent")
+        MEMORY_PROMPT_TOKENS.observe(usage["moderator_tokens"], audience="moderator")
+        # Every agent prompt carries the agent memory, so savings scale with the panel size.
+        agent_saved = (usage["agent_tokens_unbounded"] - usage["agent_tokens"]) * panel_size
+        moderator_saved = usage["moderator_tokens_unbounded"] - usage["moderator_tokens"]
+        if agent_saved > 0:
+            MEMORY_TOKENS_SAVED.inc(agent_saved, audience="agent")
+        if moderator_saved > 0:
+            MEMORY_TOKENS_SAVED.inc(moderator_saved, audience="moderator")
+
+    def _start_agents(
+        self, request: DebateStartRequest, agents: List[DebateAgent], memory_text: str, round_number: int
+    ) -> _AgentRound:
+        # Every agent reads the same memory snapshot, so all of them start at once and the round costs
+        # as much as the slowest agent rather than the sum of the panel. The cap only matters for panels
+        # larger than it, which then take ceil(panel / cap) agent latencies.
+        queue: asyncio.Queue[Tuple[DebateAgent, Dict]] = asyncio.Queue()
+        limit = asyncio.Semaphore(self.agent_concurrency) if 0 < self.agent_concurrency < len(agents) else None
+        tasks = [
+            asyncio.create_task(self._respond_isolated(agent, request, memory_text, round_number, queue, limit))
+            for agent in agents
+        ]
+        return _AgentRound(
+            round_number=round_number, memory_text=memory_text, agents=agents, queue=queue, tasks=tasks
+        )
+
+    async def _agent_events(
+        self,
+        request: DebateStartRequest,
+        agent_round: _AgentRound,
+        responses: Dict[str, str],
+        budget: DebateBudget,
+    ) -> AsyncGenerator[Dict, None]:
+        round_number = agent_round.round_number
+        agents = agent_round.agents
+        queue = agent_round.queue
+        tasks = agent_round.tasks
+        try:
+            if request.ordered_agent_events:
+                async for event in self._ordered_agent_events(queue, round_number, agents, budget):
+                    yield event
+            else:
+                for agent in agents:
+                    yield self._thinking_event(agent, round_number)
+                remaining = len(tasks)
+                while remaining:
+                    _, event = await self._next_agent_event(queue, budget)
+                    if event["event_type"] == "agent_response":
+                        remaining -= 1
+                    yield event
+        finally:
+            agent_round.cancel()
+
+        errors: List[str] = []
+        for agent, task in zip(agents, tasks):
+            response, error = task.result()
+            responses[agent.name] = response
+            if error is not None:
+                errors.append(error)
+        if len(errors) == len(tasks):
+            raise RuntimeError(f"All agents failed in round {round_number}: {errors[0]}")
+
+    def _provisional_record(
+        self,
+        round_number: int,
+        responses: Dict[str, str],
+        history: List[RoundRecord],
+    ) -> RoundRecord:
+        # Until the moderator finishes, the previous round's synthesis is the best guess for this one.
+        previous = history[-1] if history else None
+        return RoundRecord(
+            round_number=round_number,
+            responses=dict(responses),
+            moderator_summary=previous.moderator_summary if previous else "Moderator synthesis pending.",
+            consensus_statement=previous.consensus_statement if previous else "Consensus pending.",
+            confidence=previous.confidence if previous else 0.0,
+        )
+
+    async def _ordered_agent_events(
+        self,
+        queue: asyncio.Queue[Tuple[DebateAgent, Dict]],
+        round_number: int,
+        agents: List[DebateAgent],
+        budget: DebateBudget,
+    ) -> AsyncGenerator[Dict, None]:
+        # Agents still run concurrently; events from agents later in the order are held back
+        # until every earlier agent has responded.
+        buffered: Dict[str, List[Dict]] = {agent.name: [] for agent in agents}
+        current = 0
+        yield self._thinking_event(agents[current], round_number)
+        while current < len(agents):
+            agent, event = await self._next_agent_event(queue, budget)
+            buffered[agent.name].append(event)
+            while current < len(agents) and buffered[agents[current].name]:
+                events = buffered[agents[current].name]
+                buffered[agents[current].name] = []
+                for pending in events:
+                    yield pending
+                if events[-1]["event_type"] != "agent_response":
+                    break
+                current += 1
+                if current < len(agents):
+                    yield self._thinking_event(agents[current], round_number)
+
+    @staticmethod
+    async def _next_agent_event(
+        queue: asyncio.Queue[Tuple[DebateAgent, Dict]], budget: DebateBudget
+    ) -> Tuple[DebateAgent, Dict]:
+        # Token deltas usually queue up faster than they are read; only a wait goes through the budget.
+        item = queue.get_nowait() if not queue.empty() else await budget.run(queue.get())
+        if item[1]["event_type"] == "agent_response":
+            # A finished call has reported its tokens; the rest of the panel is cancelled if they ran out.
+            budget.check()
+        return item
+
+    async def _respond_isolated(
+        self,
+        agent: DebateAgent,
+        request: DebateStartRequest,
+        memory_text: str,
+        round_number: int,
+        queue: asyncio.Queue[Tuple[DebateAgent, Dict]],
+        limit: Optional[asyncio.Semaphore] = None,
+    ) -> Tuple[str, Optional[str]]:
+        error: Optional[str] = None
+        if limit is not None:
+            await limit.acquire()
+        try:
+            with TRACER.span("agent", agent=agent.name, round_number=round_number) as span:
+                try:
+                    if request.stream_tokens:
+                        chunks: List[str] = []
+                        async for delta in agent.respond_stream(
+                            request.prompt, memory_text, round_number, use_cache=request.use_cache
+                        ):
+                            chunks.append(delta)
+                            queue.put_nowait((agent, self._token_event(agent, round_number, delta)))
+                        response = "".join(chunks)
+                    else:
+                        response = await agent.respond(
+                            request.prompt, memory_text, round_number, use_cache=request.use_cache
+                        )
+                except Exception as exc:
+                    response = f"The {agent.label} agent could not respond this round."
+                    error = str(exc)
+                    span.set("error", error[:200])
+                    span.end("error")
+        finally:
+            if limit is not None:
+                limit.release()
+        queue.put_nowait((agent, self._response_event(agent, round_number, response, error)))
+        return response, error
+
+    @staticmethod
+    def _token_event(agent: DebateAgent, round_number: int, delta: str) -> Dict:
+        return DebateEvent(
+            event_type="agent_token",
+            round_number=round_number,
+            agent=agent.name,
+            content=delta,
         ).model_dump()
 
-        self.store.clear(session_id)
+    @staticmethod
+    def _thinking_event(agent: DebateAgent, round_number: int) -> Dict:
+        return DebateEvent(
+            event_type="agent_thinking",
+            round_number=round_number,
+            agent=agent.name,
+            message=f"{agent.label} agent is thinking...",
+        ).model_dump()
+
+    @staticmethod
+    def _response_event(agent: DebateAgent, round_number: int, response: str, error: Optional[str]) -> Dict:
+        return DebateEvent(
+            event_type="agent_response",
+            round_number=round_number,
+            agent=agent.name,
+            content=response,
+            message=f"{agent.label} agent failed: {error}" if error else None,
+        ).model_dump()
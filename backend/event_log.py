@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+from uuid import uuid4
+
+from backend.config import env_bool, env_float, env_int
+from backend.debate_engine import DebateEngine
+from backend.models.schemas import DebateEvent, DebateStartRequest
+from backend.services.event_encoder import sse_frame
+from backend.services.metrics import REGISTRY
+
+# Events are kept as ready-to-send SSE frames: encoded once however many subscribers replay them.
+LoggedEvent = Tuple[int, bytes]
+
+DEBATE_QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "debate_queue_wait_seconds", "Time debates waited for a free worker before starting."
+)
+DEBATE_SUBSCRIBERS = REGISTRY.gauge("debate_subscribers", "SSE streams currently attached to debates.")
+DEBATE_SKIPPED_EVENTS = REGISTRY.counter(
+    "debate_subscriber_skipped_events_total",
+    "Events a lagging subscriber missed because they had already left the bounded log.",
+)
+
+DEBATE_SINGLE_FLIGHT_JOINS = REGISTRY.counter(
+    "debate_single_flight_joins_total",
+    "Debate requests attached to an identical debate already in flight instead of starting their own.",
+)
+
+DEBATES_CANCELLED = REGISTRY.counter(
+    "debates_cancelled_total",
+    "Debates cancelled before finishing: abandoned (no subscriber within the grace period) or requested.",
+    ["reason"],
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def request_key(request: DebateStartRequest) -> str:
+    """Hash of every setting that shapes a debate's events, with the prompt's whitespace normalized."""
+    settings = request.model_dump()
+    settings["prompt"] = _WHITESPACE.sub(" ", request.prompt).strip()
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class DebateQueueFull(RuntimeError):
+    pass
+
+
+class DebateEventLog:
+    """Bounded, numbered record of one debate's events that any number of readers can replay and tail.
+
+    Appending never waits on readers: each subscriber pulls at its own pace, so a slow viewer costs
+    only its own missed events and never stalls the engine or the other viewers.
+    """
+
+    def __init__(
+        self, debate_id: str, *, max_events: int = 4096, abandon_grace_seconds: Optional[float] = None
+    ) -> None:
+        self.debate_id = debate_id
+        self.status = "queued"
+        self.created_at = time.time()
+        self.subscribers = 0
+        # Identical requests that were attached to this debate rather than starting their own.
+        self.joined = 0
+        self.request_key: Optional[str] = None
+        self.closed = False
+        # Set to stop the debate; the engine interrupts its LLM calls and ends on the last completed round.
+        self.cancel_requested = asyncio.Event()
+        self.cancel_reason: Optional[str] = None
+        # How long the debate keeps running once its last subscriber has left; None keeps it running.
+        self.abandon_grace_seconds = abandon_grace_seconds
+        self._abandon_timer: Optional[asyncio.TimerHandle] = None
+        self._events: Deque[LoggedEvent] = deque(maxlen=max(1, max_events))
+        self._last_id = 0
+        self._changed = asyncio.Event()
+
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+
+    def append(self, event: Dict) -> int:
+        self._last_id += 1
+        self._events.append((self._last_id, sse_frame(self._last_id, event)))
+        self._notify()
+        return self._last_id
+
+    def close(self) -> None:
+        self.closed = True
+        if self._abandon_timer is not None:
+            self._abandon_timer.cancel()
+            self._abandon_timer = None
+        self._notify()
+
+    def cancel(self, reason: str) -> bool:
+        """Ask the running debate to stop; False if it already finished or was cancelled."""
+        if self.closed or self.cancel_requested.is_set():
+            return False
+        self.cancel_reason = reason
+        self.cancel_requested.set()
+        DEBATES_CANCELLED.inc(reason=reason)
+        return True
+
+    async def tail(self, after: int = 0) -> AsyncIterator[LoggedEvent]:
+        """Yield frames with ids above ``after`` (replaying what is still buffered), then live ones until closed.
+
+        If the reader fell further behind than the buffer holds, the oldest missed events are skipped;
+        the ``agent_response`` and ``round`` events that follow still carry the full text.
+        """
+        self.subscribers += 1
+        DEBATE_SUBSCRIBERS.inc()
+        if self._abandon_timer is not None:
+            # A client came back (e.g. resumed with Last-Event-ID) within the grace period.
+            self._abandon_timer.cancel()
+            self._abandon_timer = None
+        try:
+            while True:
+                changed = self._changed
+                if after < self._last_id:
+                    size = len(self._events)
+                    missing = self._last_id - after
+                    if missing > size:
+                        DEBATE_SKIPPED_EVENTS.inc(missing - size)
+                        missing = size
+                    # Index from the right: new events sit at the end of the deque.
+                    batch = [self._events[i] for i in range(size - missing, size)]
+                    for event_id, frame in batch:
+                        yield event_id, frame
+                        after = event_id
+                    continue
+                if self.closed:
+                    return
+                await changed.wait()
+        finally:
+            self.subscribers -= 1
+            DEBATE_SUBSCRIBERS.dec()
+            if not self.subscribers and not self.closed and self.abandon_grace_seconds is not None:
+                self._abandon_timer = asyncio.get_running_loop().call_later(
+                    self.abandon_grace_seconds, self._abandon
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "debate_id": self.debate_id,
+            "status": self.status,
+            "last_event_id": self._last_id,
+            "subscribers": self.subscribers,
+            "joined": self.joined,
+            "cancel_reason": self.cancel_reason,
+            "created_at": self.created_at,
+        }
+
+    def _abandon(self) -> None:
+        self._abandon_timer = None
+        if not self.subscribers:
+            self.cancel("abandoned")
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+
+class DebateRunner:
+    """Runs debates in the background, detached from any HTTP connection.
+
+    Pooled debates wait for one of a bounded pool of workers; unpooled ones start right away on their own task.
+    """
+
+    def __init__(self, engine: DebateEngine) -> None:
+        self.engine = engine
+        self.workers = max(1, env_int("DEBATE_WORKERS", 8))
+        self.queue_size = max(1, env_int("DEBATE_QUEUE_SIZE", 64))
+        self.max_events = env_int("DEBATE_EVENT_LOG_SIZE", 4096)
+        self.retention_seconds = env_float("DEBATE_EVENT_LOG_RETENTION_SECONDS", 600.0)
+        # A debate whose last subscriber left is cancelled after this long unless one reconnects;
+        # negative keeps debates running with nobody watching. Debates never subscribed to are not affected.
+        grace = env_float("DEBATE_ABANDON_GRACE_SECONDS", 15.0)
+        self.abandon_grace_seconds: Optional[float] = grace if grace >= 0 else None
+        # Opt-in: identical requests share one in-flight debate and replay its events from the start.
+        self.single_flight = env_bool("DEBATE_SINGLE_FLIGHT", False)
+        self.single_flight_joins = 0
+        self._logs: Dict[str, DebateEventLog] = {}
+        self._in_flight: Dict[str, DebateEventLog] = {}
+        self._queue: Optional[asyncio.Queue[Tuple[DebateEventLog, DebateStartRequest, float]]] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._detached: Set[asyncio.Task] = set()
+
+    def start(self, request: DebateStartRequest, *, pooled: bool = True) -> DebateEventLog:
+        # Requests opting out of the response cache want fresh sampling, so they never share a debate.
+        key = request_key(request) if self.single_flight and request.use_cache else None
+        shared = self._in_flight.get(key) if key is not None else None
+        if shared is not None and not shared.cancel_requested.is_set():
+            shared.joined += 1
+            self.single_flight_joins += 1
+            DEBATE_SINGLE_FLIGHT_JOINS.inc()
+            return shared
+        queue = self._ensure_workers() if pooled else None
+        if queue is not None and queue.full():
+            raise DebateQueueFull(f"{queue.qsize()} debates are already waiting for a worker")
+        log = DebateEventLog(
+            uuid4().hex, max_events=self.max_events, abandon_grace_seconds=self.abandon_grace_seconds
+        )
+        self._logs[log.debate_id] = log
+        if key is not None:
+            log.request_key = key
+            self._in_flight[key] = log
+        if queue is not None:
+            queue.put_nowait((log, request, time.perf_counter()))
+        else:
+            task = asyncio.create_task(self._run(log, request))
+            self._detached.add(task)
+            task.add_done_callback(self._detached.discard)
+        return log
+
+    def get(self, debate_id: str) -> Optional[DebateEventLog]:
+        return self._logs.get(debate_id)
+
+    def stats(self) -> Dict[str, Any]:
+        statuses = [log.status for log in self._logs.values()]
+        return {
+            "workers": self.workers,
+            "unpooled": len(self._detached),
+            "queued": statuses.count("queued"),
+            "running": statuses.count("running"),
+            "cancelled": statuses.count("cancelled"),
+            "abandon_grace_seconds": self.abandon_grace_seconds,
+            "retained": len(statuses),
+            "subscribers": sum(log.subscribers for log in self._logs.values()),
+            "single_flight": self.single_flight,
+            "single_flight_joins": self.single_flight_joins,
+        }
+
+    async def aclose(self) -> None:
+        tasks = [*self._worker_tasks, *self._detached]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._queue = None
+
+    def _ensure_workers(self) -> asyncio.Queue[Tuple[DebateEventLog, DebateStartRequest, float]]:
+        # Created lazily so the queue and workers belong to the serving event loop.
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._worker_tasks = [asyncio.create_task(self._work(self._queue)) for _ in range(self.workers)]
+        return self._queue
+
+    async def _work(self, queue: asyncio.Queue[Tuple[DebateEventLog, DebateStartRequest, float]]) -> None:
+        while True:
+            log, request, enqueued_at = await queue.get()
+            waited = time.perf_counter() - enqueued_at
+            DEBATE_QUEUE_WAIT_SECONDS.observe(waited)
+            try:
+                await self._run(log, request, waited)
+            finally:
+                queue.task_done()
+
+    async def _run(self, log: DebateEventLog, request: DebateStartRequest, queued_seconds: float = 0.0) -> None:
+        if log.cancel_requested.is_set():
+            # Cancelled while queued: nothing was started, so there is nothing to wind down.
+            log.status = "cancelled"
+            self._finish(log)
+            return
+        log.status = "running"
+        try:
+            async for event in self.engine.run_debate(
+                request, debate_id=log.debate_id, cancel=log.cancel_requested, queued_seconds=queued_seconds
+            ):
+                log.append(event)
+            log.status = "cancelled" if log.cancel_requested.is_set() else "completed"
+        except Exception as exc:
+            log.status = "failed"
+            log.append(DebateEvent(event_type="error", message=f"Debate failed: {str(exc)}").model_dump())
+        finally:
+            if log.status == "running":
+                log.status = "cancelled"
+            self._finish(log)
+
+    def _finish(self, log: DebateEventLog) -> None:
+        # Finished debates stop accepting joiners; a later identical request starts afresh.
+        if log.request_key is not None and self._in_flight.get(log.request_key) is log:
+            del self._in_flight[log.request_key]
+        log.close()
+        # Keep finished logs around long enough for dropped clients to reconnect and catch up.
+        asyncio.get_running_loop().call_later(self.retention_seconds, self._logs.pop, log.debate_id, None)
@@ -1,17 +1,91 @@
 from __future__ import annotations
 
-import json
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, List, Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
+from backend.agents.registry import AGENT_REGISTRY
+from backend.config import env_int
 from backend.debate_engine import DebateEngine
+from backend.event_log import DebateEventLog, DebateQueueFull, DebateRunner
 from backend.models.schemas import DebateStartRequest
+from backend.services.metrics import REGISTRY, CollectorSample
+from backend.services.tracing import TRACER
 
-app = FastAPI(title="Multi-Agent Debate API", version="1.0.0")
 engine = DebateEngine()
+runner = DebateRunner(engine)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # Pre-open pooled provider connections so the first debates skip connection setup.
+    await engine.llm.warm_up(env_int("LLM_WARMUP_CONNECTIONS", 4))
+    yield
+    await runner.aclose()
+    # Flush traces of the debates that just ended.
+    await TRACER.aclose()
+    await engine.llm.aclose()
+    await engine.store.aclose()
+
+
+app = FastAPI(title="Multi-Agent Debate API", version="1.0.0", lifespan=lifespan)
+
+
+def _engine_samples() -> List[CollectorSample]:
+    cache = engine.llm.cache_stats()
+    speculation = engine.speculation.stats()
+    repairs = engine.moderator.repair_stats
+    pool = engine.llm.pool_stats()
+    debates = runner.stats()
+    return [
+        ("llm_cache_hits_total", "counter", "LLM response cache hits.", cache.get("hits", 0)),
+        ("llm_cache_misses_total", "counter", "LLM response cache misses.", cache.get("misses", 0)),
+        ("llm_cache_entries", "gauge", "Entries in the in-memory LLM response cache.", cache.get("entries", 0)),
+        ("speculation_started_total", "counter", "Speculative rounds started.", speculation["started"]),
+        ("speculation_committed_total", "counter", "Speculative rounds committed.", speculation["committed"]),
+        ("speculation_discarded_total", "counter", "Speculative rounds discarded.", speculation["discarded"]),
+        (
+            "speculation_wasted_agent_calls_total",
+            "counter",
+            "Agent calls started for discarded speculative rounds.",
+            speculation["wasted_agent_calls"],
+        ),
+        (
+            "moderator_local_repair_successes_total",
+            "counter",
+            "Moderator outputs repaired locally without a remote call.",
+            repairs["local_repair_successes"],
+        ),
+        (
+            "moderator_remote_repair_calls_total",
+            "counter",
+            "Remote LLM repair calls made by the moderator.",
+            repairs["remote_repair_calls"],
+        ),
+        (
+            "moderator_escalations_total",
+            "counter",
+            "Moderator syntheses re-run on the escalation model tier after an unrepairable parse.",
+            repairs["escalations"],
+        ),
+        ("llm_http_connections_active", "gauge", "Pooled provider connections serving a request.", pool.get("active", 0)),
+        ("llm_http_connections_idle", "gauge", "Idle keep-alive provider connections.", pool.get("idle", 0)),
+        (
+            "llm_http_requests_queued",
+            "gauge",
+            "Requests waiting for a free provider connection (pool saturation).",
+            pool.get("queued", 0),
+        ),
+        ("llm_http_max_connections", "gauge", "Provider connection pool size limit.", pool.get("max_connections", 0)),
+        ("debates_queued", "gauge", "Debates waiting for a worker.", debates["queued"]),
+        ("debate_workers", "gauge", "Size of the debate worker pool.", debates["workers"]),
+    ]
+
+
+REGISTRY.register_collector(_engine_samples)
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,6 +93,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Debate-Id"],
 )
 
 
@@ -27,20 +102,130 @@ async def health() -> dict:
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/llm/cache")
+async def llm_cache_stats() -> dict:
+    # Local response cache plus the provider's prompt cache hit rate per role.
+    return {**engine.llm.cache_stats(), "prompt_cache": engine.llm.prompt_cache_stats()}
+
+
+@app.get("/llm/models")
+async def llm_models() -> dict:
+    # Tier -> model, role -> tier routes and per-tier prices used for cost metrics.
+    return engine.llm.router.describe()
+
+
+@app.get("/llm/admission")
+async def llm_admission_stats() -> dict:
+    return engine.llm.admission.stats()
+
+
+@app.get("/llm/pool")
+async def llm_pool_stats() -> dict:
+    return engine.llm.pool_stats()
+
+
+@app.get("/speculation")
+async def speculation_stats() -> dict:
+    return engine.speculation.stats()
+
+
+@app.get("/agents")
+async def agent_panels() -> dict:
+    # Personas and the panels a debate can request with `panel`.
+    return AGENT_REGISTRY.describe()
+
+
+@app.get("/semantic-cache")
+async def semantic_cache_stats() -> dict:
+    return engine.semantic_cache.stats()
+
+
+@app.get("/moderator/repairs")
+async def moderator_repair_stats() -> dict:
+    return engine.moderator.repair_stats
+
+
 @app.post("/start-debate")
 async def start_debate(request: DebateStartRequest) -> StreamingResponse:
-    async def event_stream() -> AsyncGenerator[str, None]:
-        try:
-            async for event in engine.run_debate(request):
-                yield f"data: {json.dumps(event)}\n\n"
-        except Exception as exc:
-            error_event = {
-                "event_type": "error",
-                "message": f"Debate failed: {str(exc)}",
-            }
-            yield f"data: {json.dumps(error_event)}\n\n"
+    if not request.prompt.strip():
+        raise HTTPException(status_code=400, detail="Prompt cannot be empty")
+
+    # The debate runs in the background; a dropped client can pick up where it left off from
+    # /debates/{id}/events. Once nobody has been subscribed for DEBATE_ABANDON_GRACE_SECONDS it is cancelled.
+    # Streaming clients start right away as they always have; only POST /debates jobs wait for a worker.
+    return _event_stream(_start(request, pooled=False), after=0)
+
 
+@app.post("/debates", status_code=202)
+async def create_debate(request: DebateStartRequest) -> dict:
     if not request.prompt.strip():
         raise HTTPException(status_code=400, detail="Prompt cannot be empty")
+    log = _start(request)
+    return {**log.stats(), "events_url": f"/debates/{log.debate_id}/events"}
+
+
+@app.get("/debates")
+async def debate_runner_stats() -> dict:
+    return runner.stats()
+
+
+@app.get("/debates/{debate_id}")
+async def debate_status(debate_id: str) -> dict:
+    log = runner.get(debate_id)
+    if log is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired debate")
+    return log.stats()
+
+
+@app.delete("/debates/{debate_id}")
+async def cancel_debate(debate_id: str) -> dict:
+    # Interrupts the LLM calls in flight; the debate ends with a `final` event on its last completed round.
+    log = runner.get(debate_id)
+    if log is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired debate")
+    if not log.cancel("requested") and log.closed:
+        raise HTTPException(status_code=409, detail=f"Debate already {log.status}")
+    return log.stats()
+
+
+@app.get("/debates/{debate_id}/events")
+async def debate_events(
+    debate_id: str,
+    last_event_id: Optional[str] = Header(default=None),
+) -> StreamingResponse:
+    log = runner.get(debate_id)
+    if log is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired debate")
+    try:
+        after = int(last_event_id) if last_event_id else 0
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Last-Event-ID must be an event id from this debate")
+    return _event_stream(log, after=after)
+
+
+def _start(request: DebateStartRequest, *, pooled: bool = True) -> DebateEventLog:
+    if request.panel is not None and request.panel not in AGENT_REGISTRY.panels:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown panel {request.panel!r}; see GET /agents for the configured panels"
+        )
+    try:
+        return runner.start(request, pooled=pooled)
+    except DebateQueueFull as exc:
+        raise HTTPException(status_code=503, detail=f"Debate queue is full: {exc}", headers={"Retry-After": "5"})
+
+
+def _event_stream(log: DebateEventLog, *, after: int) -> StreamingResponse:
+    async def event_stream() -> AsyncGenerator[bytes, None]:
+        async for _, frame in log.tail(after):
+            yield frame
 
-    return StreamingResponse(event_stream(), media_type="text/event-stream")
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"X-Debate-Id": log.debate_id, "Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,23 +1,69 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from typing import Dict, List
+from typing import Dict, List, Optional, Protocol
 
+from backend.config import env_float, env_str
+from backend.memory.memory_view import MemoryView
 from backend.models.schemas import RoundRecord
 
 
+class DebateStore(Protocol):
+    """Per-session round storage shared by the debate engine and the HTTP layer."""
+
+    async def append_round(self, session_id: str, record: RoundRecord) -> None: ...
+
+    async def get_history(self, session_id: str, *, limit: Optional[int] = None) -> List[RoundRecord]:
+        """Return the session's rounds in order, or only the last ``limit`` of them."""
+        ...
+
+    async def get_memory_view(self, session_id: str) -> MemoryView: ...
+
+    async def clear(self, session_id: str) -> None: ...
+
+    async def aclose(self) -> None: ...
+
+
 class InMemoryDebateStore:
-    """Simple in-memory store; replace with Redis for distributed deployments."""
+    """Process-local store; state is lost on restart and not shared between workers."""
 
     def __init__(self) -> None:
         self._store: Dict[str, List[RoundRecord]] = defaultdict(list)
+        self._views: Dict[str, MemoryView] = defaultdict(MemoryView)
 
-    def append_round(self, session_id: str, record: RoundRecord) -> None:
+    async def append_round(self, session_id: str, record: RoundRecord) -> None:
         self._store[session_id].append(record)
+        # Render the record once here so agents and the moderator share the same memory text.
+        self._views[session_id].append(record)
 
-    def get_history(self, session_id: str) -> List[RoundRecord]:
-        return self._store.get(session_id, [])
+    async def get_history(self, session_id: str, *, limit: Optional[int] = None) -> List[RoundRecord]:
+        history = self._store.get(session_id, [])
+        return history[-limit:] if limit else list(history)
 
-    def clear(self, session_id: str) -> None:
+    async def get_memory_view(self, session_id: str) -> MemoryView:
+        return self._views.get(session_id) or MemoryView()
+
+    async def clear(self, session_id: str) -> None:
         if session_id in self._store:
             del self._store[session_id]
+        self._views.pop(session_id, None)
+
+    async def aclose(self) -> None:
+        return None
+
+
+def create_debate_store() -> DebateStore:
+    """Build the store selected by ``DEBATE_STORE`` (``memory``, ``sqlite`` or ``redis``)."""
+    backend = (env_str("DEBATE_STORE", "memory") or "memory").lower()
+    ttl_seconds = env_float("DEBATE_STORE_TTL_SECONDS", 86400.0)
+    if backend == "memory":
+        return InMemoryDebateStore()
+    if backend == "sqlite":
+        from backend.memory.sqlite_store import SQLiteDebateStore
+
+        return SQLiteDebateStore(env_str("DEBATE_STORE_PATH", "debates.sqlite3") or "", ttl_seconds=ttl_seconds)
+    if backend == "redis":
+        from backend.memory.redis_store import RedisDebateStore
+
+        return RedisDebateStore(env_str("REDIS_URL", "redis://localhost:6379/0") or "", ttl_seconds=ttl_seconds)
+    raise ValueError(f"Unknown DEBATE_STORE backend: {backend!r}")
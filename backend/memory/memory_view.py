@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from backend.agents.registry import AGENT_REGISTRY
+from backend.config import env_int
+from backend.memory.tokens import count_tokens
+from backend.models.schemas import RoundRecord
+
+# Single place to tune how much debate memory reaches the prompts.
+AGENT_MEMORY_WINDOW = 3
+MODERATOR_MEMORY_WINDOW = 5
+AGENT_RESPONSE_CLIP = 320
+AGENT_SUMMARY_CLIP = 220
+SUMMARY_CONSENSUS_CLIP = 200
+# Rounds kept verbatim; older ones are folded into the condensed summary, so stores only need to
+# read this many back.
+HISTORY_WINDOW = max(AGENT_MEMORY_WINDOW, MODERATOR_MEMORY_WINDOW)
+AGENT_MEMORY_TOKEN_BUDGET = env_int("MEMORY_AGENT_TOKEN_BUDGET", 900)
+MODERATOR_MEMORY_TOKEN_BUDGET = env_int("MEMORY_MODERATOR_TOKEN_BUDGET", 1200)
+SUMMARY_TOKEN_BUDGET = env_int("MEMORY_SUMMARY_TOKEN_BUDGET", 300)
+
+EMPTY_MEMORY_TEXT = "No prior rounds."
+SUMMARY_HEADER = "Earlier rounds (condensed):"
+
+
+def clip(text: str, *, limit: int = AGENT_RESPONSE_CLIP) -> str:
+    clean = " ".join(text.split())
+    if len(clean) <= limit:
+        return clean
+    return clean[: limit - 3].rstrip() + "..."
+
+
+@dataclass(frozen=True)
+class RoundDigest:
+    round_number: int
+    confidence: float
+    consensus: str
+    agent_text: str
+    moderator_text: str
+    agent_tokens: int
+    moderator_tokens: int
+
+
+@dataclass(frozen=True)
+class SummaryEntry:
+    """One condensed line covering a single round or a merged run of rounds."""
+
+    first_round: int
+    last_round: int
+    first_confidence: float
+    last_confidence: float
+    consensus: str
+
+    def render(self) -> str:
+        if self.first_round == self.last_round:
+            return f"- Round {self.first_round} (confidence {self.last_confidence:.0f}): {self.consensus}"
+        return (
+            f"- Rounds {self.first_round}-{self.last_round} "
+            f"(confidence {self.first_confidence:.0f} -> {self.last_confidence:.0f}): {self.consensus}"
+        )
+
+    def merge(self, newer: "SummaryEntry") -> "SummaryEntry":
+        # The later consensus supersedes the earlier one; the confidence range keeps the trajectory.
+        return SummaryEntry(
+            first_round=self.first_round,
+            last_round=newer.last_round,
+            first_confidence=self.first_confidence,
+            last_confidence=newer.last_confidence,
+            consensus=newer.consensus,
+        )
+
+
+def render_round(record: RoundRecord) -> RoundDigest:
+    agent_text = (
+        f"Round {record.round_number}:\n"
+        + "".join(
+            f"- {AGENT_REGISTRY.label(name)}: {clip(response)}\n" for name, response in record.responses.items()
+        )
+        + f"- Moderator: {clip(record.moderator_summary, limit=AGENT_SUMMARY_CLIP)}\n"
+        f"- Consensus: {clip(record.consensus_statement, limit=AGENT_SUMMARY_CLIP)} (confidence: {record.confidence})"
+    )
+    moderator_text = (
+        f"Round {record.round_number}:\n"
+        f"- Moderator summary: {record.moderator_summary}\n"
+        f"- Consensus: {record.consensus_statement}\n"
+        f"- Confidence: {record.confidence}"
+    )
+    return RoundDigest(
+        round_number=record.round_number,
+        confidence=record.confidence,
+        consensus=clip(record.consensus_statement, limit=SUMMARY_CONSENSUS_CLIP),
+        agent_text=agent_text,
+        moderator_text=moderator_text,
+        agent_tokens=count_tokens(agent_text),
+        moderator_tokens=count_tokens(moderator_text),
+    )
+
+
+def summarize_round(digest: RoundDigest) -> SummaryEntry:
+    return SummaryEntry(
+        first_round=digest.round_number,
+        last_round=digest.round_number,
+        first_confidence=digest.confidence,
+        last_confidence=digest.confidence,
+        consensus=digest.consensus,
+    )
+
+
+def compact(entries: List[SummaryEntry], budget: int) -> List[SummaryEntry]:
+    """Merge the oldest entries until the rendered lines fit ``budget`` tokens or one entry is left."""
+    entries = list(entries)
+    tokens = [count_tokens(entry.render()) for entry in entries]
+    # Oldest first, so the most recently folded rounds keep their own lines.
+    while len(entries) > 1 and sum(tokens) > budget:
+        entries[0:2] = [entries[0].merge(entries[1])]
+        tokens[0:2] = [count_tokens(entries[0].render())]
+    return entries
+
+
+class MemoryView:
+    """Pre-rendered debate memory shared by every agent and the moderator in a session.
+
+    Recent rounds are shown verbatim while they fit the audience's token budget. Everything older
+    is folded, one line per round, into a condensed summary that is compacted as rounds arrive, so
+    prompt size stays flat however long the debate runs.
+    """
+
+    def __init__(
+        self,
+        *,
+        agent_window: int = AGENT_MEMORY_WINDOW,
+        moderator_window: int = MODERATOR_MEMORY_WINDOW,
+        agent_budget: int = AGENT_MEMORY_TOKEN_BUDGET,
+        moderator_budget: int = MODERATOR_MEMORY_TOKEN_BUDGET,
+        summary_budget: int = SUMMARY_TOKEN_BUDGET,
+    ) -> None:
+        self.agent_window = agent_window
+        self.moderator_window = moderator_window
+        self.agent_budget = agent_budget
+        self.moderator_budget = moderator_budget
+        self.summary_budget = summary_budget
+        self._recent: List[RoundDigest] = []
+        self._summary: List[SummaryEntry] = []
+        # What the memory would cost if every round were still rendered in full.
+        self.unbounded_agent_tokens = 0
+        self.unbounded_moderator_tokens = 0
+        self._agent_text: Optional[str] = None
+        self._moderator_text: Optional[str] = None
+
+    @classmethod
+    def from_records(cls, records: Iterable[RoundRecord]) -> "MemoryView":
+        view = cls()
+        for record in records:
+            view.append(record)
+        return view
+
+    @classmethod
+    def from_state(cls, state: Optional[Dict[str, Any]], records: Iterable[RoundRecord]) -> "MemoryView":
+        """Rebuild a view from ``to_state()`` plus the rounds that were not folded yet."""
+        if not state:
+            return cls.from_records(records)
+        view = cls()
+        view._summary = [SummaryEntry(**entry) for entry in state["summary"]]
+        view.unbounded_agent_tokens = state["unbounded_agent_tokens"]
+        view.unbounded_moderator_tokens = state["unbounded_moderator_tokens"]
+        folded_through = view._summary[-1].last_round if view._summary else 0
+        view._recent = [render_round(record) for record in records if record.round_number > folded_through]
+        return view
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "summary": [asdict(entry) for entry in self._summary],
+            "unbounded_agent_tokens": self.unbounded_agent_tokens,
+            "unbounded_moderator_tokens": self.unbounded_moderator_tokens,
+        }
+
+    def append(self, record: RoundRecord) -> RoundDigest:
+        digest = render_round(record)
+        self._recent.append(digest)
+        self.unbounded_agent_tokens += digest.agent_tokens
+        self.unbounded_moderator_tokens += digest.moderator_tokens
+        while len(self._recent) > HISTORY_WINDOW:
+            self._summary.append(summarize_round(self._recent.pop(0)))
+        self._compact_summary()
+        self._agent_text = None
+        self._moderator_text = None
+        return digest
+
+    def agent_text(self) -> str:
+        if self._agent_text is None:
+            self._agent_text = self._render(self.agent_window, self.agent_budget, moderator=False)
+        return self._agent_text
+
+    def preview_agent_text(self, record: RoundRecord) -> str:
+        """Agent memory as it would read after appending ``record``, without appending it."""
+        preview = MemoryView(
+            agent_window=self.agent_window,
+            moderator_window=self.moderator_window,
+            agent_budget=self.agent_budget,
+            moderator_budget=self.moderator_budget,
+            summary_budget=self.summary_budget,
+        )
+        preview._recent = list(self._recent)
+        preview._summary = list(self._summary)
+        preview.append(record)
+        return preview.agent_text()
+
+    def moderator_text(self) -> str:
+        if self._moderator_text is None:
+            self._moderator_text = self._render(self.moderator_window, self.moderator_budget, moderator=True)
+        return self._moderator_text
+
+    def token_usage(self) -> Dict[str, int]:
+        return {
+            "agent_tokens": count_tokens(self.agent_text()),
+            "agent_tokens_unbounded": self.unbounded_agent_tokens,
+            "moderator_tokens": count_tokens(self.moderator_text()),
+            "moderator_tokens_unbounded": self.unbounded_moderator_tokens,
+        }
+
+    def _compact_summary(self) -> None:
+        self._summary = compact(self._summary, self.summary_budget)
+
+    def _render(self, window: int, budget: int, *, moderator: bool) -> str:
+        candidates = self._recent[-window:] if window > 0 else []
+        # The newest rounds stay verbatim while they fit; the latest one always does.
+        kept: List[RoundDigest] = []
+        used = 0
+        for digest in reversed(candidates):
+            cost = digest.moderator_tokens if moderator else digest.agent_tokens
+            if kept and used + cost > budget:
+                break
+            kept.insert(0, digest)
+            used += cost
+
+        # The condensed trajectory outranks older verbatim rounds: give those up until it fits.
+        while True:
+            folded = self._recent[: len(self._recent) - len(kept)]
+            condensed = compact(self._summary + [summarize_round(d) for d in folded], budget - used)
+            lines = [entry.render() for entry in condensed]
+            if sum(count_tokens(line) for line in lines) <= budget - used:
+                break
+            if len(kept) <= 1:
+                lines = []
+                break
+            dropped = kept.pop(0)
+            used -= dropped.moderator_tokens if moderator else dropped.agent_tokens
+
+        chunks: List[str] = []
+        if lines:
+            chunks.append(SUMMARY_HEADER + "\n" + "\n".join(lines))
+        chunks.extend(d.moderator_text if moderator else d.agent_text for d in kept)
+        return self._join(chunks)
+
+    @staticmethod
+    def _join(chunks: Iterable[str]) -> str:
+        text = "\n\n".join(chunks)
+        return text or EMPTY_MEMORY_TEXT
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+from typing import Any, List, Optional
+
+from backend.memory.memory_view import HISTORY_WINDOW, MemoryView
+from backend.models.schemas import RoundRecord
+
+
+class RedisDebateStore:
+    """Store for multi-worker and multi-replica deployments; speaks the Redis protocol.
+
+    Each session is a list of JSON round records plus the condensed memory of rounds that left the
+    verbatim window; both expire ``ttl_seconds`` after the last write.
+    Pass ``client`` to use an existing ``redis.asyncio``-compatible client (e.g. fakeredis).
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        *,
+        client: Any = None,
+        ttl_seconds: float = 86400.0,
+        prefix: str = "debate",
+    ) -> None:
+        if client is None:
+            try:
+                import redis.asyncio as redis_asyncio
+            except ImportError as exc:
+                raise RuntimeError("DEBATE_STORE=redis requires the 'redis' package (pip install redis)") from exc
+            client = redis_asyncio.from_url(url)
+        self._client = client
+        self.ttl_seconds = int(ttl_seconds)
+        self.prefix = prefix
+
+    async def append_round(self, session_id: str, record: RoundRecord) -> None:
+        key, memory_key = self._key(session_id), self._memory_key(session_id)
+        view = await self.get_memory_view(session_id)
+        view.append(record)
+        # One round trip for the round, the folded memory and the TTL refresh.
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.rpush(key, record.model_dump_json())
+            pipe.set(memory_key, json.dumps(view.to_state()))
+            if self.ttl_seconds > 0:
+                pipe.expire(key, self.ttl_seconds)
+                pipe.expire(memory_key, self.ttl_seconds)
+            await pipe.execute()
+
+    async def get_history(self, session_id: str, *, limit: Optional[int] = None) -> List[RoundRecord]:
+        values = await self._client.lrange(self._key(session_id), -limit if limit else 0, -1)
+        return [RoundRecord.model_validate_json(value) for value in values]
+
+    async def get_memory_view(self, session_id: str) -> MemoryView:
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.get(self._memory_key(session_id))
+            pipe.lrange(self._key(session_id), -HISTORY_WINDOW, -1)
+            state, values = await pipe.execute()
+        records = [RoundRecord.model_validate_json(value) for value in values]
+        return MemoryView.from_state(json.loads(state) if state else None, records)
+
+    async def clear(self, session_id: str) -> None:
+        await self._client.delete(self._key(session_id), self._memory_key(session_id))
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}:{session_id}:rounds"
+
+    def _memory_key(self, session_id: str) -> str:
+        return f"{self.prefix}:{session_id}:memory"
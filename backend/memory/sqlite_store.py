@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from backend.memory.memory_view import HISTORY_WINDOW, MemoryView
+from backend.models.schemas import RoundRecord
+
+
+class SQLiteDebateStore:
+    """Durable single-host store: WAL mode lets several uvicorn workers share one database file.
+
+    Appends from concurrent debates are group-committed: whichever writes queue up while a commit is
+    in flight go out together in the next transaction.
+    """
+
+    def __init__(self, path: str, *, ttl_seconds: float = 86400.0) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA busy_timeout=5000")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS debate_rounds ("
+            "session_id TEXT NOT NULL, round_number INTEGER NOT NULL, created_at REAL NOT NULL, "
+            "record TEXT NOT NULL, PRIMARY KEY (session_id, round_number)) WITHOUT ROWID"
+        )
+        # Condensed memory of rounds that left the verbatim window, one row per session.
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS debate_memory ("
+            "session_id TEXT PRIMARY KEY, updated_at REAL NOT NULL, state TEXT NOT NULL) WITHOUT ROWID"
+        )
+        if ttl_seconds > 0:
+            cutoff = time.time() - ttl_seconds
+            self._db.execute("DELETE FROM debate_rounds WHERE created_at < ?", (cutoff,))
+            self._db.execute("DELETE FROM debate_memory WHERE updated_at < ?", (cutoff,))
+        # Reads and writes run in worker threads but share one connection.
+        self._lock = threading.RLock()
+        self._pending: List[Tuple[str, int, str, str, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def append_round(self, session_id: str, record: RoundRecord) -> None:
+        view = await self.get_memory_view(session_id)
+        view.append(record)
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(
+            (session_id, record.round_number, record.model_dump_json(), json.dumps(view.to_state()), future)
+        )
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush())
+        await future
+
+    async def get_history(self, session_id: str, *, limit: Optional[int] = None) -> List[RoundRecord]:
+        rows = await asyncio.to_thread(self._read, session_id, limit)
+        return [RoundRecord.model_validate_json(row) for row in rows]
+
+    async def get_memory_view(self, session_id: str) -> MemoryView:
+        state, rows = await asyncio.to_thread(self._read_view, session_id)
+        records = [RoundRecord.model_validate_json(row) for row in rows]
+        return MemoryView.from_state(json.loads(state) if state else None, records)
+
+    async def clear(self, session_id: str) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM debate_rounds WHERE session_id = ?", (session_id,))
+        await asyncio.to_thread(self._execute, "DELETE FROM debate_memory WHERE session_id = ?", (session_id,))
+
+    async def aclose(self) -> None:
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        self._db.close()
+
+    async def _flush(self) -> None:
+        while self._pending:
+            batch, self._pending = self._pending, []
+            try:
+                await asyncio.to_thread(self._write, [row[:-1] for row in batch])
+            except Exception as exc:
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+            else:
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_result(None)
+
+    def _write(self, rows: List[Tuple[str, int, str, str]]) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO debate_rounds (session_id, round_number, created_at, record) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(session_id, number, now, record) for session_id, number, record, _ in rows],
+                )
+                # Rows are in append order, so the last state written per session wins.
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO debate_memory (session_id, updated_at, state) VALUES (?, ?, ?)",
+                    [(session_id, now, state) for session_id, _, _, state in rows],
+                )
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def _read(self, session_id: str, limit: Optional[int]) -> List[str]:
+        # Walks the primary key backwards, so reading a window costs O(limit), not O(rounds).
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT record FROM debate_rounds WHERE session_id = ? ORDER BY round_number DESC LIMIT ?",
+                (session_id, limit if limit else -1),
+            ).fetchall()
+        return [row[0] for row in reversed(rows)]
+
+    def _read_view(self, session_id: str) -> Tuple[Optional[str], List[str]]:
+        # One lock hold, so the summary and the verbatim rounds come from the same commit.
+        with self._lock:
+            row = self._db.execute("SELECT state FROM debate_memory WHERE session_id = ?", (session_id,)).fetchone()
+            return (row[0] if row else None), self._read(session_id, HISTORY_WINDOW)
+
+    def _execute(self, sql: str, params: Tuple) -> None:
+        with self._lock:
+            self._db.execute(sql, params)
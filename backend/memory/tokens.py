@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+from typing import Any, Optional
+
+try:
+    import tiktoken
+except ImportError:  # optional: fall back to a character heuristic
+    tiktoken = None
+
+
+@lru_cache(maxsize=1)
+def _encoding() -> Optional[Any]:
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(os.getenv("OPENAI_MODEL", "gpt-4.1-mini"))
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # Encodings are downloaded on first use; offline hosts keep the heuristic.
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Token count with the model's tokenizer when ``tiktoken`` is installed, else about 4 chars per token."""
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
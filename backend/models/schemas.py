@@ -1,18 +1,61 @@
 from __future__ import annotations
 
-from typing import List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_serializer, model_validator
+
+# Agents of the fixed three-seat panel, whose rounds were stored with one field per agent.
+LEGACY_AGENTS = ("centre_left", "centre", "centre_right")
+
+
+class StoppingConfig(BaseModel):
+    # Policies that may end a debate before max_rounds; reaching the confidence target always does.
+    policies: List[Literal["plateau", "projection", "stagnation"]] = Field(default_factory=list)
+    # Most recent rounds each policy looks at; none of them act before this many rounds.
+    window: int = Field(default=3, ge=2, le=10)
+    # plateau: confidence moved by at most this many points across the window.
+    plateau_tolerance: float = Field(default=2.0, ge=0, le=100)
+    # stagnation: agent agreement (0-1) moved by at most this much across the window.
+    stagnation_tolerance: float = Field(default=0.02, ge=0, le=1)
+
+
+class BudgetConfig(BaseModel):
+    # Wall-clock allowance for the whole debate; a round still running when it runs out is discarded.
+    seconds: Optional[float] = Field(default=None, gt=0, le=3600)
+    # Provider-reported prompt plus completion tokens across every LLM call of the debate.
+    tokens: Optional[int] = Field(default=None, ge=1)
 
 
 class DebateStartRequest(BaseModel):
     prompt: str = Field(..., min_length=5, max_length=3000)
     confidence_target: float = Field(..., ge=0, le=100)
     max_rounds: int = Field(default=8, ge=1, le=20)
+    # Named agent panel from the agent registry (e.g. "three", "five", "seven"); None uses the default.
+    panel: Optional[str] = Field(default=None, max_length=64)
+    # Agents always run concurrently; this only restores the panel's fixed
+    # seating order (e.g. centre_left -> centre -> centre_right) for older clients.
+    ordered_agent_events: bool = False
+    # Forward agent output as `agent_token` deltas while it is generated.
+    stream_tokens: bool = True
+    # Opt out of the LLM response cache when fresh sampling is wanted.
+    use_cache: bool = True
+    # Start the next round's agents while the moderator is still synthesizing (speculative).
+    pipeline_rounds: bool = False
+    # Stop early once more rounds are unlikely to reach the confidence target.
+    stopping: StoppingConfig = Field(default_factory=StoppingConfig)
+    # End the debate with the rounds completed so far once either allowance is spent or too low for another round.
+    budget: BudgetConfig = Field(default_factory=BudgetConfig)
+    # Reuse a completed debate whose prompt is at least this similar (0-1); None skips the lookup.
+    similarity_threshold: Optional[float] = Field(default=None, ge=0, le=1)
+    # replay: serve the match when its trajectory satisfies this request, else seed round 1 memory with it.
+    # seed: always run a fresh debate, only seeding round 1 memory.
+    semantic_cache_mode: Literal["replay", "seed"] = "replay"
+    # Attach a compact span timeline (rounds, agents, moderator stages and its LLM calls) to the `final` event.
+    include_timeline: bool = False
 
 
 class AgentOutput(BaseModel):
-    agent: Literal["centre_left", "centre", "centre_right"]
+    agent: str
     response: str
     citations: List[str] = Field(default_factory=list)
 
@@ -28,19 +71,69 @@ class ModeratorOutput(BaseModel):
 
 class RoundRecord(BaseModel):
     round_number: int
-    centre_left_response: str
-    centre_response: str
-    centre_right_response: str
+    # Agent name -> response, in the panel's seating order.
+    responses: Dict[str, str]
     moderator_summary: str
     consensus_statement: str
     confidence: float
 
+    @model_validator(mode="before")
+    @classmethod
+    def _fold_legacy_responses(cls, data: Any) -> Any:
+        # Rounds persisted before panels were configurable carry `<agent>_response` fields instead.
+        if isinstance(data, dict) and "responses" not in data:
+            data = dict(data)
+            data["responses"] = {
+                name: data.pop(f"{name}_response") for name in LEGACY_AGENTS if f"{name}_response" in data
+            }
+        return data
+
+
+class ConvergenceStats(BaseModel):
+    round_number: int
+    # Mean pairwise similarity of this round's agent responses (0-1).
+    agreement: float
+    # Change in agreement since the previous round; positive means positions are converging.
+    velocity: Optional[float] = None
+    # Mean similarity of each agent's response to its own previous one.
+    stability: Optional[float] = None
+    pairwise: Dict[str, float] = Field(default_factory=dict)
+
+
+class SemanticCacheMatch(BaseModel):
+    debate_id: str
+    prompt: str
+    similarity: float
+    mode: Literal["replay", "seed"]
+
+
+class TimelineEntry(BaseModel):
+    # queue, round, agent, moderator, or llm for each of the moderator's LLM calls.
+    span: str
+    # Milliseconds since the debate was queued.
+    start_ms: float
+    duration_ms: float
+    status: str = "ok"
+    round_number: Optional[int] = None
+    agent: Optional[str] = None
+    # moderator: the stage that produced its output (primary, repaired_local, escalated, repaired, ...).
+    stage: Optional[str] = None
+    # llm: the call's role, model tier and model.
+    role: Optional[str] = None
+    tier: Optional[str] = None
+    model: Optional[str] = None
+    # Totals over the LLM calls within the span: provider tokens, admission queueing and retries.
+    tokens: Optional[int] = None
+    queue_ms: Optional[float] = None
+    retries: Optional[int] = None
+
 
 class DebateEvent(BaseModel):
     event_type: Literal[
         "started",
         "round_start",
         "agent_thinking",
+        "agent_token",
         "agent_response",
         "moderator_thinking",
         "moderator_response",
@@ -48,13 +141,25 @@ class DebateEvent(BaseModel):
         "final",
         "error",
     ]
+    debate_id: Optional[str] = None
     round_number: Optional[int] = None
-    agent: Optional[Literal["centre_left", "centre", "centre_right", "moderator"]] = None
+    # An agent name from the debate's panel, or "moderator".
+    agent: Optional[str] = None
     content: Optional[str] = None
     target_confidence: Optional[float] = None
     round_data: Optional[RoundRecord] = None
     moderator: Optional[ModeratorOutput] = None
+    convergence: Optional[ConvergenceStats] = None
+    semantic_cache: Optional[SemanticCacheMatch] = None
     final_consensus: Optional[str] = None
     final_confidence: Optional[float] = None
     rounds_completed: Optional[int] = None
+    stop_reason: Optional[str] = None
+    calls_saved: Optional[int] = None
+    timeline: Optional[List[TimelineEntry]] = None
     message: Optional[str] = None
+
+    @field_serializer("timeline")
+    def _compact_timeline(self, timeline: Optional[List[TimelineEntry]]) -> Optional[List[Dict[str, Any]]]:
+        # Each entry only fills the fields of its span kind; the rest would be nulls repeated in every entry.
+        return None if timeline is None else [entry.model_dump(exclude_none=True) for entry in timeline]
@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import re
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from backend.config import env_float, env_int
+from backend.convergence import STOP_WORDS
+from backend.memory.memory_view import SUMMARY_CONSENSUS_CLIP, SUMMARY_TOKEN_BUDGET, SummaryEntry, clip, compact
+from backend.models.schemas import ConvergenceStats, DebateStartRequest, ModeratorOutput, RoundRecord
+from backend.stopping import MAX_ROUNDS, StoppingController
+
+# Power of two so a gram's bucket is a mask of its CRC.
+EMBEDDING_DIM = 1024
+# A stored prompt this similar to a new one is the same prompt; the newer debate replaces it.
+DUPLICATE_SIMILARITY = 0.999
+# Share of a word's weight on the whole word; the rest is spread over its character trigrams.
+WORD_WEIGHT = 0.3
+SEED_HEADER = "Related earlier debate"
+_PROMPT_WORD = re.compile(r"[a-z0-9]{2,}")
+_CONTRACTED_NOT = re.compile(r"n['\u2019]t\b")
+# Negation and comparison words: two prompts that differ only in these ask opposite questions, so they
+# count as content words.
+POLARITY_WORDS = frozenset({"no", "nor", "not", "never", "without", "against", "more", "less", "fewer", "than"})
+# Short function words the debate-wide STOP_WORDS (4+ letters) does not cover.
+_SHORT_STOP_WORDS = frozenset(
+    {"an", "as", "be", "by", "do", "in", "is", "it", "of", "on", "or", "to", "we", "and", "are", "but", "can"}
+    | {"for", "how", "its", "our", "the", "was", "why", "does", "what"}
+)
+_EMBED_STOP_WORDS = (STOP_WORDS | _SHORT_STOP_WORDS) - POLARITY_WORDS
+
+
+def prompt_words(text: str) -> Set[str]:
+    """Distinct lowercase words of a prompt, with "n't" spelled out as "not"."""
+    return set(_PROMPT_WORD.findall(_CONTRACTED_NOT.sub(" not", text.lower())))
+
+
+def content_words(text: str) -> Set[str]:
+    """Words of a prompt that carry its meaning: everything but function words, keeping negation and comparison."""
+    return prompt_words(text) - _EMBED_STOP_WORDS
+
+
+def _spelling_variant(a: str, b: str) -> bool:
+    """Same word up to one edit after a shared three-letter stem ("subsidize"/"subsidise", "color"/"colour").
+
+    The shared stem keeps prefixed antonyms ("moral"/"amoral") apart; two edits ("legal"/"illegal") never match.
+    """
+    if a == b:
+        return True
+    if min(len(a), len(b)) < 4 or a[:3] != b[:3] or abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    # Skip the one differing character of b, and of a too when it is a substitution.
+    return a[i + (len(a) == len(b)) :] == b[i + 1 :]
+
+
+def same_question(a: str, b: str) -> bool:
+    """Whether two prompts have the same content words up to spelling variants, i.e. only their phrasing differs.
+
+    Embedding similarity alone cannot tell "subsidize AI compute" from "ban AI compute" (one antonym verb out of
+    three content words still scores ~0.7), so a debate is only reused as the answer to a prompt passing this.
+    """
+    words_a, words_b = content_words(a), content_words(b)
+    if not words_a or not words_b:
+        return False
+    return all(any(_spelling_variant(x, y) for y in words_b) for x in words_a) and all(
+        any(_spelling_variant(y, x) for x in words_a) for y in words_b
+    )
+
+
+def embed(text: str) -> np.ndarray:
+    """Unit-length signed hashed embedding of a prompt's words and their character trigrams; no network needed.
+
+    Every distinct word carries the same total weight, so long words do not dominate through their many
+    trigrams; the trigrams still pull spelling variants ("subsidize"/"subsidise") together. The hash
+    sign bit keeps unrelated prompts near orthogonal instead of all sharing the positive orthant.
+    """
+    grams: List[str] = []
+    weights: List[float] = []
+    for word in content_words(text):
+        padded = f" {word} "
+        trigrams = [padded[i : i + 3] for i in range(len(padded) - 2)]
+        grams.append(word)
+        weights.append(WORD_WEIGHT)
+        grams.extend(trigrams)
+        weights.extend([(1.0 - WORD_WEIGHT) / len(trigrams)] * len(trigrams))
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    if not grams:
+        return vector
+    hashes = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint32, count=len(grams))
+    signed = np.where(hashes & 0x80000000, -1.0, 1.0) * np.asarray(weights)
+    np.add.at(vector, hashes & (EMBEDDING_DIM - 1), signed.astype(np.float32))
+    norm = float(np.linalg.norm(vector))
+    if norm > 0:
+        vector /= norm
+    return vector
+
+
+class LSHIndex:
+    """Random-hyperplane LSH over unit vectors.
+
+    Each table hashes a vector to the sign pattern of ``bits`` projections; two vectors at cosine
+    similarity ``s`` agree on a bit with probability ``1 - acos(s) / pi``. With 16 tables of 6 bits a
+    pair at 0.8 shares at least one bucket ~99% of the time (~88% at 0.6), an unrelated pair ~22%.
+    """
+
+    def __init__(self, dim: int, *, tables: int = 16, bits: int = 6, seed: int = 0) -> None:
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((tables, bits, dim)).astype(np.float32)
+        self._weights = 1 << np.arange(bits, dtype=np.int64)
+        self._buckets: List[Dict[int, Set[int]]] = [{} for _ in range(tables)]
+
+    @property
+    def tables(self) -> int:
+        return len(self._buckets)
+
+    def codes(self, vector: np.ndarray) -> np.ndarray:
+        return ((self._planes @ vector) > 0).astype(np.int64) @ self._weights
+
+    def add(self, slot: int, codes: np.ndarray) -> None:
+        for buckets, code in zip(self._buckets, codes.tolist()):
+            buckets.setdefault(code, set()).add(slot)
+
+    def remove(self, slot: int, codes: np.ndarray) -> None:
+        for buckets, code in zip(self._buckets, codes.tolist()):
+            bucket = buckets.get(code)
+            if bucket is None:
+                continue
+            bucket.discard(slot)
+            if not bucket:
+                del buckets[code]
+
+    def candidates(self, codes: np.ndarray) -> Set[int]:
+        found: Set[int] = set()
+        for buckets, code in zip(self._buckets, codes.tolist()):
+            found.update(buckets.get(code, ()))
+        return found
+
+
+@dataclass
+class CachedDebate:
+    debate_id: str
+    prompt: str
+    # Agent names of the panel that held the debate, in seating order.
+    agents: List[str]
+    rounds: List[RoundRecord]
+    moderator: List[ModeratorOutput]
+    convergence: List[ConvergenceStats]
+    stop_reason: str
+    created_at: float = field(default_factory=time.time)
+
+    def replay_plan(self, request: DebateStartRequest, agents: Sequence[str]) -> Optional[Tuple[int, str]]:
+        """How many of the cached rounds a fresh run of ``request`` by ``agents`` would have ended after, and why.
+
+        The cached trajectory is fed through this request's own target and stopping policies. None when
+        another panel held the debate, when the prompts ask a different question (see ``same_question``;
+        a merely similar prompt can only seed), or when it stopped before it could tell, e.g. it ended early
+        below this request's target with rounds still left under this request's ``max_rounds``.
+        """
+        if list(agents) != self.agents or not same_question(request.prompt, self.prompt):
+            return None
+        stopping = StoppingController(request)
+        for index, record in enumerate(self.rounds[: request.max_rounds]):
+            decision = stopping.after_round(record.round_number, record.confidence, self.convergence[: index + 1])
+            if decision is not None:
+                return record.round_number, decision.reason
+        if len(self.rounds) >= request.max_rounds:
+            return request.max_rounds, MAX_ROUNDS
+        return None
+
+    def seed_text(self) -> str:
+        """Condensed trajectory of this debate, used as round 1 memory for a related one."""
+        entries = [
+            SummaryEntry(
+                first_round=record.round_number,
+                last_round=record.round_number,
+                first_confidence=record.confidence,
+                last_confidence=record.confidence,
+                consensus=clip(record.consensus_statement, limit=SUMMARY_CONSENSUS_CLIP),
+            )
+            for record in self.rounds
+        ]
+        lines = [entry.render() for entry in compact(entries, SUMMARY_TOKEN_BUDGET)]
+        header = f'{SEED_HEADER} on "{clip(self.prompt, limit=SUMMARY_CONSENSUS_CLIP)}" (condensed):'
+        return "\n".join([header, *lines])
+
+
+class SemanticDebateCache:
+    """Completed debates indexed by prompt embedding, for near-duplicate prompts.
+
+    Bounded by ``max_entries`` (LRU eviction, vectors in one preallocated array) and ``ttl_seconds``.
+    Lookups only score the LSH candidates, so cost does not grow with the number of cached debates.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        tables: int = 16,
+        bits: int = 6,
+    ) -> None:
+        self.max_entries = max(
+            0, max_entries if max_entries is not None else env_int("SEMANTIC_CACHE_MAX_ENTRIES", 256)
+        )
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else env_float("SEMANTIC_CACHE_TTL_SECONDS", 86400.0)
+        capacity = max(1, self.max_entries)
+        self.index = LSHIndex(EMBEDDING_DIM, tables=tables, bits=bits)
+        self._vectors = np.zeros((capacity, EMBEDDING_DIM), dtype=np.float32)
+        self._codes = np.zeros((capacity, tables), dtype=np.int64)
+        # Slot -> debate, least recently used first.
+        self._entries: OrderedDict[int, CachedDebate] = OrderedDict()
+        self._free = list(range(capacity - 1, -1, -1))
+
+        self.replays = 0
+        self.seeds = 0
+        self.misses = 0
+        self.stored = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.calls_saved = 0
+
+    def lookup(self, prompt: str, threshold: float) -> Optional[Tuple[CachedDebate, float]]:
+        """Most similar cached debate with cosine similarity of at least ``threshold``."""
+        vector = embed(prompt)
+        found = self._nearest(vector, self.index.codes(vector))
+        if found is None or found[1] < threshold:
+            return None
+        slot, similarity = found
+        self._entries.move_to_end(slot)
+        return self._entries[slot], similarity
+
+    def add(self, debate: CachedDebate) -> None:
+        if self.max_entries == 0 or not debate.rounds:
+            return
+        vector = embed(debate.prompt)
+        if not vector.any():
+            return
+        codes = self.index.codes(vector)
+        duplicate = self._nearest(vector, codes)
+        if (
+            duplicate is not None
+            and duplicate[1] >= DUPLICATE_SIMILARITY
+            and same_question(self._entries[duplicate[0]].prompt, debate.prompt)
+        ):
+            self._remove(duplicate[0])
+        while len(self._entries) >= self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        slot = self._free.pop()
+        self._vectors[slot] = vector
+        self._codes[slot] = codes
+        self._entries[slot] = debate
+        self.index.add(slot, codes)
+        self.stored += 1
+
+    def record_outcome(self, outcome: str, calls_saved: int = 0) -> None:
+        if outcome == "replay":
+            self.replays += 1
+        elif outcome == "seed":
+            self.seeds += 1
+        else:
+            self.misses += 1
+        self.calls_saved += calls_saved
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.replays + self.seeds + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "vector_bytes": self._vectors.nbytes,
+            "lsh_tables": self.index.tables,
+            "stored": self.stored,
+            "replays": self.replays,
+            "seeds": self.seeds,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "calls_saved": self.calls_saved,
+            "hit_rate": round((self.replays + self.seeds) / lookups, 4) if lookups else 0.0,
+        }
+
+    def _nearest(self, vector: np.ndarray, codes: np.ndarray) -> Optional[Tuple[int, float]]:
+        now = time.time()
+        slots = []
+        for slot in self.index.candidates(codes):
+            if self.ttl_seconds > 0 and now - self._entries[slot].created_at > self.ttl_seconds:
+                self._remove(slot)
+                self.expirations += 1
+            else:
+                slots.append(slot)
+        if not slots or not vector.any():
+            return None
+        similarities = self._vectors[slots] @ vector
+        best = int(np.argmax(similarities))
+        return slots[best], float(similarities[best])
+
+    def _remove(self, slot: int) -> None:
+        self.index.remove(slot, self._codes[slot])
+        del self._entries[slot]
+        self._free.append(slot)
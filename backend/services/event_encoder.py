@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional: the standard library encoder is used instead
+    orjson = None
+
+# Events whose payload depends only on a handful of scalars and repeats every round.
+STATIC_EVENT_TYPES = frozenset({"round_start", "agent_thinking", "moderator_thinking"})
+# json.dumps builds a new encoder whenever options are passed; reuse one instead.
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+
+def dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return _JSON_ENCODER.encode(value).encode("utf-8")
+
+
+class EventEncoder:
+    """Encodes debate events as SSE ``data`` payloads: ``None`` fields are dropped and static events are
+    encoded once and reused."""
+
+    def __init__(self, *, max_static: int = 4096) -> None:
+        self.max_static = max_static
+        self._static: Dict[Tuple[Hashable, ...], bytes] = {}
+        self.static_hits = 0
+
+    def encode(self, event: Dict[str, Any]) -> bytes:
+        key = self._static_key(event)
+        if key is not None:
+            cached = self._static.get(key)
+            if cached is not None:
+                self.static_hits += 1
+                return cached
+        payload = dumps({name: value for name, value in event.items() if value is not None})
+        if key is not None and len(self._static) < self.max_static:
+            self._static[key] = payload
+        return payload
+
+    def frame(self, event_id: int, event: Dict[str, Any]) -> bytes:
+        return b"id: %d\ndata: %s\n\n" % (event_id, self.encode(event))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "orjson" if orjson is not None else "json",
+            "static_entries": len(self._static),
+            "static_hits": self.static_hits,
+        }
+
+    @staticmethod
+    def _static_key(event: Dict[str, Any]) -> Optional[Tuple[Hashable, ...]]:
+        if event.get("event_type") not in STATIC_EVENT_TYPES:
+            return None
+        return tuple(event.items())
+
+
+# Shared so every debate reuses the same static frames.
+ENCODER = EventEncoder()
+
+
+def sse_frame(event_id: int, event: Dict[str, Any]) -> bytes:
+    return ENCODER.frame(event_id, event)
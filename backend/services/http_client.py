@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+import httpx
+from openai import DefaultAsyncHttpxClient
+
+from backend.config import env_bool, env_float, env_int
+
+
+def build_http_client() -> httpx.AsyncClient:
+    """Build the pooled transport shared by all requests of one ``AsyncOpenAI`` client.
+
+    A long keep-alive expiry matters for bursty debate traffic: with httpx's 5s default, connections
+    idle between rounds are closed and every burst pays connection setup again.
+    """
+    max_connections = env_int("LLM_HTTP_MAX_CONNECTIONS", 64)
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=min(max_connections, env_int("LLM_HTTP_MAX_KEEPALIVE", 32)),
+        keepalive_expiry=env_float("LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS", 60.0),
+    )
+    read_timeout = env_float("LLM_READ_TIMEOUT_SECONDS", 60.0)
+    timeout = httpx.Timeout(
+        read_timeout,
+        connect=env_float("LLM_CONNECT_TIMEOUT_SECONDS", 5.0),
+        pool=env_float("LLM_POOL_TIMEOUT_SECONDS", 30.0),
+    )
+    # HTTP/2 multiplexes calls over few connections but needs the optional ``h2`` package
+    # (``pip install 'httpx[http2]'``).
+    return DefaultAsyncHttpxClient(limits=limits, timeout=timeout, http2=env_bool("LLM_HTTP2", False))
+
+
+def pool_stats(client: httpx.AsyncClient) -> Dict[str, Any]:
+    # httpx does not expose pool state publicly, so read the underlying httpcore pool defensively.
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    if pool is None:
+        return {"available": False}
+    connections = list(getattr(pool, "connections", []))
+    requests = list(getattr(pool, "_requests", []))
+    idle = sum(1 for connection in connections if connection.is_idle())
+    max_connections = getattr(pool, "_max_connections", 0)
+    return {
+        "available": True,
+        "max_connections": max_connections,
+        "connections": len(connections),
+        "active": len(connections) - idle,
+        "idle": idle,
+        # Requests waiting for a connection: non-zero means the pool is saturated.
+        "queued": sum(1 for request in requests if request.is_queued()),
+    }
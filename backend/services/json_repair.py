@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import List, Optional, Tuple
+
+_LITERALS = {
+    "true": "true",
+    "false": "false",
+    "null": "null",
+    "True": "true",
+    "False": "false",
+    "None": "null",
+}
+_SCALAR = re.compile(
+    r"(?:-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null|True|False|None)(?=[\s,}\]]|$)"
+)
+_PARTIAL_NUMBER = re.compile(r"-?[0-9.eE+-]*")
+_NEXT_KEY = re.compile(r"[\"'][^\"'\n]{1,64}[\"']\s*:")
+_HEX4 = re.compile(r"[0-9a-fA-F]{4}")
+_VALID_ESCAPES = set('"\\/bfnrtu')
+_CLOSERS = {"obj": "}", "arr": "]"}
+
+
+class JSONRepairError(ValueError):
+    pass
+
+
+class _Frame:
+    __slots__ = ("kind", "expect")
+
+    def __init__(self, kind: str, expect: str) -> None:
+        self.kind = kind
+        # One of: "key", "colon", "value", "comma".
+        self.expect = expect
+
+    def copy(self) -> "_Frame":
+        return _Frame(self.kind, self.expect)
+
+
+def repair_json(raw: str) -> str:
+    """Deterministically repair common LLM JSON defects and return a string ``json.loads`` accepts.
+
+    Handles prose or code-fence wrappers, trailing and missing commas, single-quoted strings,
+    raw control characters and stray quotes inside strings, Python literals, bare keys and words,
+    and output truncated mid-string, mid-key or mid-container. Raises ``JSONRepairError`` when no
+    object can be recovered.
+    """
+    start = raw.find("{")
+    if start == -1:
+        raise JSONRepairError("No JSON object start found")
+    repaired = _Repairer(raw, start).run()
+    try:
+        json.loads(repaired)
+    except json.JSONDecodeError as exc:
+        raise JSONRepairError(f"Repair produced invalid JSON: {exc}") from exc
+    return repaired
+
+
+class _Repairer:
+    def __init__(self, text: str, start: int) -> None:
+        self.text = text
+        self.pos = start
+        self.out: List[str] = []
+        self.stack: List[_Frame] = []
+        # Last point where the output could be cut and closed cleanly.
+        self.safe: Tuple[int, List[_Frame]] = (0, [])
+
+    def run(self) -> str:
+        text = self.text
+        while self.pos < len(text):
+            ch = text[self.pos]
+            if ch in " \t\r\n":
+                self.pos += 1
+                continue
+            if ch in "{[":
+                self._open("obj" if ch == "{" else "arr")
+            elif ch in "}]":
+                self._close("obj" if ch == "}" else "arr")
+            elif ch == ",":
+                self._comma()
+            elif ch == ":":
+                self._colon()
+            elif ch in "\"'":
+                if not self._string(ch):
+                    return self._finish_truncated()
+            elif ch == "`":
+                self.pos += 1
+                continue
+            else:
+                self._bare()
+
+            if not self.stack:
+                return "".join(self.out)
+        return self._finish_truncated()
+
+    def _top(self) -> Optional[_Frame]:
+        return self.stack[-1] if self.stack else None
+
+    def _mark_safe(self) -> None:
+        self.safe = (len(self.out), [frame.copy() for frame in self.stack])
+
+    def _before_value(self) -> bool:
+        top = self._top()
+        if top is None:
+            return not self.out
+        if top.expect == "comma":
+            # Missing separator between two values or members.
+            self.out.append(",")
+            top.expect = "key" if top.kind == "obj" else "value"
+        if top.kind == "obj" and top.expect == "colon":
+            self.out.append(":")
+            top.expect = "value"
+        return top.expect == "value"
+
+    def _value_done(self) -> None:
+        top = self._top()
+        if top is not None:
+            top.expect = "comma"
+            self._mark_safe()
+
+    def _open(self, kind: str) -> None:
+        self.pos += 1
+        top = self._top()
+        if top is not None and top.kind == "obj" and top.expect in {"key", "comma"}:
+            # A container cannot be a key; skip the stray opener.
+            return
+        self._before_value()
+        self.out.append("{" if kind == "obj" else "[")
+        self.stack.append(_Frame(kind, "key" if kind == "obj" else "value"))
+        self._mark_safe()
+
+    def _close(self, kind: str) -> None:
+        self.pos += 1
+        if not any(frame.kind == kind for frame in self.stack):
+            return
+        while self.stack:
+            frame = self.stack[-1]
+            self._drop_dangling(frame)
+            self.out.append(_CLOSERS[frame.kind])
+            self.stack.pop()
+            if frame.kind == kind:
+                break
+        self._value_done()
+
+    def _drop_dangling(self, frame: _Frame) -> None:
+        if frame.expect == "colon" or (frame.kind == "obj" and frame.expect == "value"):
+            # A key without a value: cut back to before the key.
+            self._rollback_key()
+            return
+        while self.out and self.out[-1] == ",":
+            self.out.pop()
+
+    def _rollback_key(self) -> None:
+        length, stack = self.safe
+        del self.out[length:]
+        self.stack = [frame.copy() for frame in stack]
+
+    def _comma(self) -> None:
+        self.pos += 1
+        top = self._top()
+        if top is not None and top.expect == "comma":
+            self.out.append(",")
+            top.expect = "key" if top.kind == "obj" else "value"
+
+    def _colon(self) -> None:
+        self.pos += 1
+        top = self._top()
+        if top is not None and top.kind == "obj" and top.expect == "colon":
+            self.out.append(":")
+            top.expect = "value"
+
+    def _string(self, quote: str) -> bool:
+        top = self._top()
+        is_key = top is not None and top.kind == "obj" and top.expect in {"key", "comma"}
+        if is_key and top is not None and top.expect == "comma":
+            self.out.append(",")
+            top.expect = "key"
+        elif not is_key:
+            self._before_value()
+
+        text = self.text
+        self.pos += 1
+        chars: List[str] = ['"']
+        while self.pos < len(text):
+            ch = text[self.pos]
+            if ch == "\\":
+                nxt = text[self.pos + 1] if self.pos + 1 < len(text) else ""
+                if nxt == "'":
+                    chars.append("'")
+                elif nxt == "u" and not _HEX4.fullmatch(text[self.pos + 2 : self.pos + 6]):
+                    chars.append("\\\\u")
+                elif nxt in _VALID_ESCAPES:
+                    chars.append("\\" + nxt)
+                elif nxt:
+                    chars.append("\\\\" + nxt)
+                self.pos += 2
+                continue
+            if ch == quote and self._closes_string(is_key):
+                self.pos += 1
+                chars.append('"')
+                self.out.append("".join(chars))
+                if is_key:
+                    top = self._top()
+                    if top is not None:
+                        top.expect = "colon"
+                else:
+                    self._value_done()
+                return True
+            if ch == '"':
+                chars.append('\\"')
+            elif ch == "\n":
+                chars.append("\\n")
+            elif ch == "\r":
+                chars.append("\\r")
+            elif ch == "\t":
+                chars.append("\\t")
+            elif ord(ch) < 0x20:
+                chars.append(f"\\u{ord(ch):04x}")
+            else:
+                chars.append(ch)
+            self.pos += 1
+
+        # Input ended inside the string.
+        if is_key:
+            return False
+        chars.append('"')
+        self.out.append("".join(chars))
+        self._value_done()
+        return False
+
+    def _closes_string(self, is_key: bool) -> bool:
+        # A quote only ends the string when what follows looks like JSON structure;
+        # otherwise it is an unescaped quote inside the text.
+        rest = self.text[self.pos + 1 :].lstrip(" \t\r\n")
+        if not rest:
+            return True
+        if is_key:
+            return rest[0] == ":"
+        if rest[0] in ",}]":
+            return True
+        top = self._top()
+        if top is None or rest[0] not in "\"'":
+            return False
+        # Missing comma: another array item or another "key": member follows.
+        return top.kind == "arr" or _NEXT_KEY.match(rest) is not None
+
+    def _bare(self) -> None:
+        text = self.text
+        top = self._top()
+        is_key = top is not None and top.kind == "obj" and top.expect in {"key", "comma"}
+        if is_key:
+            end = text.find(":", self.pos)
+            if end == -1:
+                # Truncated inside a bare key.
+                self.pos = len(text)
+                return
+            token = text[self.pos : end].strip().strip("'\"")
+            self.pos = end
+            if not token:
+                return
+            if top is not None and top.expect == "comma":
+                self.out.append(",")
+            self.out.append(json.dumps(token))
+            if top is not None:
+                top.expect = "colon"
+            return
+
+        scalar = _SCALAR.match(text, self.pos)
+        if scalar is not None:
+            token = scalar.group(0)
+            end = scalar.end()
+            if end >= len(text):
+                # A number or literal cut off by truncation cannot be trusted.
+                self.pos = end
+                return
+        else:
+            end = self.pos
+            while end < len(text) and text[end] not in ",}]\n":
+                end += 1
+            token = text[self.pos : end].strip()
+            if end >= len(text) and (_PARTIAL_NUMBER.fullmatch(token) or any(lit.startswith(token) for lit in _LITERALS)):
+                self.pos = end
+                return
+        self.pos = end
+        if not token:
+            self.pos += 1
+            return
+        if not self._before_value():
+            return
+        if scalar is not None:
+            self.out.append(_LITERALS.get(token, token))
+        else:
+            self.out.append(json.dumps(token))
+        self._value_done()
+
+    def _finish_truncated(self) -> str:
+        while self.stack:
+            frame = self.stack[-1]
+            self._drop_dangling(frame)
+            if not self.stack:
+                break
+            frame = self.stack.pop()
+            self.out.append(_CLOSERS[frame.kind])
+            top = self._top()
+            if top is not None:
+                top.expect = "comma"
+        return "".join(self.out)
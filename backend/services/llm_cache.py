@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# The SQLite tier is pruned (expired rows, then the oldest beyond its cap) once per this many writes.
+PRUNE_EVERY_WRITES = 256
+
+
+class LLMResponseCache:
+    """Content-addressed completion cache: in-memory LRU with TTL plus an optional SQLite tier.
+
+    The SQLite tier holds at most ``max_disk_entries`` rows and is pruned as it is written; its reads and
+    writes run in worker threads so a slow disk never stalls the event loop.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 512,
+        ttl_seconds: float = 3600.0,
+        path: Optional[str] = None,
+        max_disk_entries: int = 10000,
+    ) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.max_disk_entries = max(1, max_disk_entries)
+        self._entries: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        # One connection shared by the worker threads; sqlite3 connections must not be used concurrently.
+        self._db_lock = threading.Lock()
+        self._writes_since_prune = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.disk_pruned = 0
+
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, created_at REAL NOT NULL, value TEXT NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_created_at ON llm_cache (created_at)")
+            # Rows left behind by earlier runs count against the cap too.
+            self._prune()
+
+    @staticmethod
+    def make_key(
+        *,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[Dict[str, Any]],
+    ) -> str:
+        payload = json.dumps(
+            {
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "response_format": response_format,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            created_at, value = entry
+            if self._expired(created_at, now):
+                del self._entries[key]
+                self.expirations += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return value
+
+        if self._db is not None:
+            row = await asyncio.to_thread(self._read, key)
+            if row is not None:
+                created_at, value = row
+                if self._expired(created_at, now):
+                    await asyncio.to_thread(self._delete, key)
+                    self.expirations += 1
+                else:
+                    self._remember(key, created_at, value)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: str) -> None:
+        created_at = time.time()
+        self._remember(key, created_at, value)
+        if self._db is not None:
+            await asyncio.to_thread(self._write, key, created_at, value)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": True,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "persistent": self._db is not None,
+            "max_disk_entries": self.max_disk_entries if self._db is not None else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "disk_pruned": self.disk_pruned,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _remember(self, key: str, created_at: float, value: str) -> None:
+        self._entries[key] = (created_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    # The methods below block on the disk; they run in worker threads.
+
+    def _read(self, key: str) -> Optional[Tuple[float, str]]:
+        with self._db_lock:
+            return self._db.execute("SELECT created_at, value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+
+    def _delete(self, key: str) -> None:
+        with self._db_lock:
+            self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+
+    def _write(self, key: str, created_at: float, value: str) -> None:
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, created_at, value) VALUES (?, ?, ?)",
+                (key, created_at, value),
+            )
+            self._writes_since_prune += 1
+            if self._writes_since_prune < PRUNE_EVERY_WRITES:
+                return
+        self._prune()
+
+    def _prune(self) -> None:
+        """Delete expired rows, then the oldest rows beyond ``max_disk_entries``."""
+        with self._db_lock:
+            self._writes_since_prune = 0
+            pruned = 0
+            if self.ttl_seconds > 0:
+                pruned += self._db.execute(
+                    "DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+                ).rowcount
+            pruned += self._db.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,),
+            ).rowcount
+            self.disk_pruned += pruned
@@ -1,24 +1,119 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from openai import AsyncOpenAI
+import httpx
+from openai import APIConnectionError, AsyncOpenAI, InternalServerError, RateLimitError
+
+from backend.config import env_bool, env_float, env_int, env_str
+from backend.services.http_client import build_http_client, pool_stats
+from backend.services.llm_cache import LLMResponseCache
+from backend.services.metrics import (
+    LLM_CALL_SECONDS,
+    LLM_CACHED_PROMPT_TOKENS,
+    LLM_CALLS,
+    LLM_COMPLETION_TOKENS,
+    LLM_PROMPT_TOKENS,
+    LLM_COST_USD,
+    LLM_ROUND_PROMPT_TOKENS,
+    LLM_TIER_CALL_SECONDS,
+    LLM_TIER_TOKENS,
+    LLM_TIME_TO_FIRST_TOKEN_SECONDS,
+)
+from backend.services.model_router import ModelRouter, Route
+from backend.services.rate_limiter import LLM_RETRIES, backoff_delay, shared_admission_controller
+from backend.services.tracing import NOOP_SPAN, TRACER
+from backend.services.usage import record_call, record_tokens
 
 
 class LLMService:
     def __init__(self) -> None:
-        self.model = os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
+        # Each call's model comes from its role's tier; OPENAI_MODEL is the standard tier.
+        self.router = ModelRouter.from_env()
+        self.model = self.router.models["standard"]
         self.api_key = os.getenv("OPENAI_API_KEY")
+        # Point at any OpenAI-compatible endpoint, e.g. the local stand-in in benchmarks/mock_openai.py.
+        self.base_url = env_str("OPENAI_BASE_URL")
         self._client: Optional[AsyncOpenAI] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
         if self.api_key:
-            self._client = AsyncOpenAI(api_key=self.api_key)
+            self._http_client = build_http_client()
+            # Retries are handled in _create so they go through the shared admission controller.
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                max_retries=0,
+                http_client=self._http_client,
+            )
+        # Overall budget for one call including queueing and retries; 0 disables it.
+        self.call_deadline = env_float("LLM_CALL_DEADLINE_SECONDS", 180.0)
+
+        # Shared by every LLMService in the process, so concurrent debates draw on one budget.
+        self.admission = shared_admission_controller()
+        self.max_retries = env_int("LLM_MAX_RETRIES", 3)
+        self.backoff_base = env_float("LLM_BACKOFF_BASE_SECONDS", 0.5)
+        self.backoff_max = env_float("LLM_BACKOFF_MAX_SECONDS", 20.0)
+
+        self.cache: Optional[LLMResponseCache] = None
+        if env_bool("LLM_CACHE_ENABLED", True):
+            self.cache = LLMResponseCache(
+                max_entries=env_int("LLM_CACHE_MAX_ENTRIES", 512),
+                ttl_seconds=env_float("LLM_CACHE_TTL_SECONDS", 3600.0),
+                path=env_str("LLM_CACHE_PATH"),
+                max_disk_entries=env_int("LLM_CACHE_MAX_DISK_ENTRIES", 10000),
+            )
+        # Calls sampled hotter than this (agents run at 0.6) are never cached, so repeated debates
+        # sample fresh turns; the moderator, repair and regenerate calls stay cacheable.
+        self.cache_max_temperature = env_float("LLM_CACHE_MAX_TEMPERATURE", 0.3)
+        # Provider-side prompt caching per role: [prompt tokens, of which served from the cache].
+        self.prompt_cache_tokens: Dict[str, List[int]] = {}
 
     @property
     def enabled(self) -> bool:
         return self._client is not None
 
+    def pool_stats(self) -> Dict[str, Any]:
+        if self._http_client is None:
+            return {"available": False}
+        return pool_stats(self._http_client)
+
+    async def warm_up(self, connections: int) -> int:
+        """Open up to ``connections`` pooled connections ahead of traffic; returns how many succeeded."""
+        if self._client is None or connections <= 0:
+            return 0
+        # Concurrent requests cannot share an HTTP/1.1 connection, so each one opens its own.
+        requests = asyncio.gather(
+            *(self._client.models.list() for _ in range(connections)), return_exceptions=True
+        )
+        try:
+            results = await asyncio.wait_for(requests, timeout=env_float("LLM_WARMUP_TIMEOUT_SECONDS", 10.0))
+        except asyncio.TimeoutError:
+            return 0
+        return sum(1 for result in results if not isinstance(result, BaseException))
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        if self.cache is None:
+            return {"enabled": False}
+        return {**self.cache.stats(), "max_temperature": self.cache_max_temperature}
+
+    def prompt_cache_stats(self) -> Dict[str, Any]:
+        return {
+            role: {
+                "prompt_tokens": prompt,
+                "cached_tokens": cached,
+                "hit_rate": round(cached / prompt, 4) if prompt else 0.0,
+            }
+            for role, (prompt, cached) in sorted(self.prompt_cache_tokens.items())
+        }
+
     async def complete(
         self,
         messages: List[Dict[str, str]],
@@ -26,30 +121,265 @@ class LLMService:
         temperature: float = 0.5,
         max_tokens: int = 900,
         response_format: Optional[Dict[str, Any]] = None,
+        cache: bool = True,
+        role: str = "default",
+        round_number: Optional[int] = None,
+        escalated: bool = False,
     ) -> str:
+        route = self.router.route(role, round_number, escalated=escalated)
+        with TRACER.span(
+            "llm", role=role, round_number=round_number, tier=route.tier, model=route.model, escalated=escalated
+        ) as span:
+            key = self._cache_key(route.model, messages, temperature, max_tokens, response_format) if cache else None
+            if key is not None:
+                cached = await self.cache.get(key)
+                if cached is not None:
+                    span.set("cache", "hit")
+                    self._count_call(role, "cache_hit")
+                    return cached
+
+            started = time.perf_counter()
+            try:
+                if not self._client:
+                    content = self._fallback(messages)
+                else:
+                    params = self._build_params(route.model, messages, temperature, max_tokens, response_format)
+                    response = await self._create(params, max_tokens, role)
+                    self.admission.release()
+                    content = response.choices[0].message.content or ""
+                    self._record_usage(role, response.usage, round_number, route, span)
+            except asyncio.CancelledError:
+                # The debate was cancelled or ran out of budget; the request is dropped mid-flight.
+                self._count_call(role, "cancelled")
+                raise
+            except Exception:
+                self._count_call(role, "error")
+                raise
+            self._observe_latency(role, route, time.perf_counter() - started)
+            self._count_call(role, "ok")
+
+            if key is not None and content:
+                await self.cache.set(key, content)
+            return content
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        temperature: float = 0.5,
+        max_tokens: int = 900,
+        response_format: Optional[Dict[str, Any]] = None,
+        cache: bool = True,
+        role: str = "default",
+        round_number: Optional[int] = None,
+        escalated: bool = False,
+    ) -> AsyncIterator[str]:
+        """Yield completion text deltas as the provider produces them."""
+        route = self.router.route(role, round_number, escalated=escalated)
+        # Not made current: this generator's context belongs to the caller between deltas.
+        span = TRACER.start_span(
+            "llm", role=role, round_number=round_number, tier=route.tier, model=route.model, escalated=escalated
+        )
+        key = self._cache_key(route.model, messages, temperature, max_tokens, response_format) if cache else None
+        if key is not None:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                span.set("cache", "hit")
+                span.end()
+                self._count_call(role, "cache_hit")
+                yield cached
+                return
+
         if not self._client:
-            return self._fallback(messages)
+            content = self._fallback(messages)
+            if key is not None:
+                await self.cache.set(key, content)
+            span.end()
+            self._count_call(role, "ok")
+            yield content
+            return
+
+        started = time.perf_counter()
+        params = self._build_params(route.model, messages, temperature, max_tokens, response_format)
+        params["stream"] = True
+        params["stream_options"] = {"include_usage": True}
+        chunks: List[str] = []
+        outcome = "error"
+        admitted = False
+        try:
+            with TRACER.activate(span):
+                response = await self._create(params, max_tokens, role)
+            admitted = True
+            async for chunk in response:
+                if chunk.usage is not None:
+                    self._record_usage(role, chunk.usage, round_number, route, span)
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    if not chunks:
+                        first_token = time.perf_counter() - started
+                        LLM_TIME_TO_FIRST_TOKEN_SECONDS.observe(first_token, role=role)
+                        span.set("ttft_ms", round(first_token * 1000, 1))
+                    chunks.append(delta)
+                    yield delta
+            outcome = "ok"
+        except (GeneratorExit, asyncio.CancelledError):
+            outcome = "cancelled"
+            raise
+        finally:
+            if admitted:
+                self.admission.release()
+            span.end(outcome)
+            self._count_call(role, outcome)
+            if outcome == "ok":
+                self._observe_latency(role, route, time.perf_counter() - started)
+
+        # Only completed streams are cached; an abandoned iterator never reaches this point.
+        if key is not None and chunks:
+            await self.cache.set(key, "".join(chunks))
+
+    @staticmethod
+    def _count_call(role: str, outcome: str) -> None:
+        LLM_CALLS.inc(role=role, outcome=outcome)
+        record_call(cache_hit=outcome == "cache_hit")
+
+    @staticmethod
+    def _observe_latency(role: str, route: Route, seconds: float) -> None:
+        LLM_CALL_SECONDS.observe(seconds, role=role)
+        LLM_TIER_CALL_SECONDS.observe(seconds, tier=route.tier)
+
+    def _record_usage(
+        self, role: str, usage: Any, round_number: Optional[int], route: Route, span: Any = NOOP_SPAN
+    ) -> None:
+        if usage is None:
+            return
+        prompt_tokens = usage.prompt_tokens or 0
+        completion_tokens = usage.completion_tokens or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = (getattr(details, "cached_tokens", None) or 0) if details is not None else 0
+        span.set("prompt_tokens", prompt_tokens)
+        span.set("cached_tokens", cached_tokens)
+        span.set("completion_tokens", completion_tokens)
+        LLM_PROMPT_TOKENS.inc(prompt_tokens, role=role)
+        LLM_CACHED_PROMPT_TOKENS.inc(cached_tokens, role=role)
+        LLM_COMPLETION_TOKENS.inc(completion_tokens, role=role)
+        LLM_TIER_TOKENS.inc(prompt_tokens, tier=route.tier, kind="prompt")
+        LLM_TIER_TOKENS.inc(cached_tokens, tier=route.tier, kind="cached")
+        LLM_TIER_TOKENS.inc(completion_tokens, tier=route.tier, kind="completion")
+        LLM_COST_USD.inc(self.router.cost(route.tier, prompt_tokens, cached_tokens, completion_tokens), tier=route.tier)
+        if round_number is not None:
+            LLM_ROUND_PROMPT_TOKENS.inc(cached_tokens, role=role, round=str(round_number), cache="hit")
+            LLM_ROUND_PROMPT_TOKENS.inc(prompt_tokens - cached_tokens, role=role, round=str(round_number), cache="miss")
+        totals = self.prompt_cache_tokens.setdefault(role, [0, 0])
+        totals[0] += prompt_tokens
+        totals[1] += cached_tokens
+        record_tokens(prompt_tokens, completion_tokens, cached_tokens)
+
+    def _cache_key(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[Dict[str, Any]],
+    ) -> Optional[str]:
+        if self.cache is None or temperature > self.cache_max_temperature:
+            return None
+        return LLMResponseCache.make_key(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=response_format,
+        )
 
+    def _build_params(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
         params: Dict[str, Any] = {
-            "model": self.model,
+            "model": model,
             "messages": messages,
             "temperature": temperature,
             "max_completion_tokens": max_tokens,
         }
         if response_format is not None:
             params["response_format"] = response_format
+        return params
 
-        try:
-            response = await self._client.chat.completions.create(**params)
-            return response.choices[0].message.content or ""
-        except Exception as exc:
-            # Compatibility fallback for models/endpoints that still expect max_tokens.
-            if "max_completion_tokens" in str(exc):
-                params.pop("max_completion_tokens", None)
-                params["max_tokens"] = max_tokens
-                response = await self._client.chat.completions.create(**params)
-                return response.choices[0].message.content or ""
-            raise
+    async def _create(self, params: Dict[str, Any], max_tokens: int, role: str) -> Any:
+        """Admit and send one request, retrying 429s and transient failures.
+
+        Returns with an admission slot held; the caller releases it once the response (or stream)
+        has been consumed.
+        """
+        assert self._client is not None
+        estimated_tokens = sum(len(m.get("content", "")) for m in params["messages"]) // 4 + max_tokens
+        deadline = time.monotonic() + self.call_deadline if self.call_deadline > 0 else None
+        span = TRACER.current()
+        attempt = 0
+        while True:
+            options: Dict[str, Any] = {}
+            waited = time.perf_counter()
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"LLM call exceeded its {self.call_deadline:g}s deadline")
+                await asyncio.wait_for(self.admission.acquire(estimated_tokens, role=role), remaining)
+                options["timeout"] = self._attempt_timeout(deadline - time.monotonic())
+            else:
+                await self.admission.acquire(estimated_tokens, role=role)
+            span.add("queue_ms", round((time.perf_counter() - waited) * 1000, 2))
+            try:
+                raw = await self._client.chat.completions.with_raw_response.create(**params, **options)
+                self.admission.on_success(raw.headers)
+                return raw.parse()
+            except RateLimitError as exc:
+                self.admission.release()
+                cooldown = self.admission.on_rate_limited(exc.response.headers)
+                delay = max(cooldown, backoff_delay(attempt, base=self.backoff_base, cap=self.backoff_max))
+                if attempt >= self.max_retries or self._past_deadline(deadline, delay):
+                    raise
+                LLM_RETRIES.inc(reason="rate_limited")
+            except (APIConnectionError, InternalServerError):
+                self.admission.release()
+                delay = backoff_delay(attempt, base=self.backoff_base, cap=self.backoff_max)
+                if attempt >= self.max_retries or self._past_deadline(deadline, delay):
+                    raise
+                LLM_RETRIES.inc(reason="transient")
+            except BaseException as exc:
+                self.admission.release()
+                # Compatibility fallback for models/endpoints that still expect max_tokens.
+                if "max_completion_tokens" in params and "max_completion_tokens" in str(exc):
+                    params.pop("max_completion_tokens", None)
+                    params["max_tokens"] = max_tokens
+                    continue
+                raise
+            attempt += 1
+            span.set("retries", attempt)
+            await asyncio.sleep(delay)
+
+    def _attempt_timeout(self, remaining: float) -> httpx.Timeout:
+        # Shrink the transport timeouts so a single attempt cannot outlive the call deadline.
+        assert self._http_client is not None
+        base = self._http_client.timeout
+        remaining = max(0.001, remaining)
+
+        def cap(value: Optional[float]) -> float:
+            return remaining if value is None else min(value, remaining)
+
+        return httpx.Timeout(
+            cap(base.read), connect=cap(base.connect), write=cap(base.write), pool=cap(base.pool)
+        )
+
+    @staticmethod
+    def _past_deadline(deadline: Optional[float], delay: float) -> bool:
+        return deadline is not None and time.monotonic() + delay >= deadline
 
     def _fallback(self, messages: List[Dict[str, str]]) -> str:
         prompt = ""
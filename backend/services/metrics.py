@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple, TypeVar, cast
+
+# Metric updates happen on the event loop thread and only touch dicts and lists, so they need
+# no locks; rendering walks a snapshot of the same structures.
+
+LabelValues = Tuple[str, ...]
+CollectorSample = Tuple[str, str, str, float]
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in list(self._values.items())
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (last slot is +Inf), sum, count.
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = ([0] * (len(self.buckets) + 1), [0.0, 0.0])
+            self._series[key] = series
+        counts, totals = series
+        counts[bisect_left(self.buckets, value)] += 1
+        totals[0] += value
+        totals[1] += 1
+
+    def _samples(self) -> List[str]:
+        lines: List[str] = []
+        for key, (counts, totals) in list(self._series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(totals[0])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {_format_value(totals[1])}")
+        return lines
+
+
+M = TypeVar("M", bound=_Metric)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[CollectorSample]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[CollectorSample]]) -> None:
+        """Add a callback yielding ``(name, type, help, value)`` samples computed at scrape time."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, kind, documentation, value in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: M) -> M:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return cast(M, existing)
+        self._metrics[metric.name] = metric
+        return metric
+
+
+REGISTRY = MetricsRegistry()
+
+LLM_CALL_SECONDS = REGISTRY.histogram(
+    "llm_call_duration_seconds", "Latency of LLM calls by debate role.", ["role"]
+)
+LLM_TIME_TO_FIRST_TOKEN_SECONDS = REGISTRY.histogram(
+    "llm_time_to_first_token_seconds", "Time until the first streamed delta by debate role.", ["role"]
+)
+LLM_CALLS = REGISTRY.counter("llm_calls_total", "LLM calls by role and outcome.", ["role", "outcome"])
+LLM_PROMPT_TOKENS = REGISTRY.counter("llm_prompt_tokens_total", "Prompt tokens reported by the provider.", ["role"])
+LLM_CACHED_PROMPT_TOKENS = REGISTRY.counter(
+    "llm_cached_prompt_tokens_total", "Prompt tokens the provider served from its prompt cache.", ["role"]
+)
+LLM_ROUND_PROMPT_TOKENS = REGISTRY.counter(
+    "llm_round_prompt_tokens_total",
+    "Prompt tokens by role and debate round, split by whether the provider's prompt cache served them.",
+    ["role", "round", "cache"],
+)
+LLM_COMPLETION_TOKENS = REGISTRY.counter(
+    "llm_completion_tokens_total", "Completion tokens reported by the provider.", ["role"]
+)
+LLM_TIER_CALL_SECONDS = REGISTRY.histogram(
+    "llm_tier_call_duration_seconds", "Latency of completed LLM calls by model tier.", ["tier"]
+)
+LLM_TIER_TOKENS = REGISTRY.counter(
+    "llm_tier_tokens_total",
+    "Provider-reported tokens by model tier and kind (prompt, cached or completion).",
+    ["tier", "kind"],
+)
+LLM_COST_USD = REGISTRY.counter(
+    "llm_cost_usd_total", "Estimated LLM spend in USD by model tier, from LLM_TIER_PRICES.", ["tier"]
+)
+MODERATOR_STAGES = REGISTRY.counter(
+    "moderator_stage_total", "Moderator outputs by the stage that produced them.", ["stage"]
+)
+DEBATES_IN_FLIGHT = REGISTRY.gauge("debates_in_flight", "Debates currently running.")
+DEBATE_ROUNDS = REGISTRY.histogram(
+    "debate_rounds_to_convergence",
+    "Rounds completed per debate, labelled by how it ended (converged, stopped_early or max_rounds).",
+    ["outcome"],
+    buckets=(1, 2, 3, 4, 5, 6, 8, 10, 12, 15, 20),
+)
+DEBATE_EARLY_STOPS = REGISTRY.counter(
+    "debate_early_stops_total", "Debates ended before max_rounds by a stopping policy.", ["reason"]
+)
+DEBATE_CALLS_SAVED = REGISTRY.counter(
+    "debate_calls_saved_total", "Estimated LLM calls avoided by stopping debates early."
+)
+DEBATE_TOKENS_SAVED = REGISTRY.counter(
+    "debate_tokens_saved_total",
+    "Estimated LLM tokens not spent because a debate ended before max_rounds, by stop reason.",
+    ["reason"],
+)
+DEBATE_DISCARDED_TOKENS = REGISTRY.counter(
+    "debate_discarded_tokens_total",
+    "LLM tokens spent on rounds cut short by a budget or cancellation and thrown away, by stop reason.",
+    ["reason"],
+)
+SEMANTIC_CACHE_LOOKUPS = REGISTRY.counter(
+    "semantic_cache_lookups_total",
+    "Debates that looked up the semantic debate cache, by outcome (replay, seed or miss).",
+    ["outcome"],
+)
+MEMORY_PROMPT_TOKENS = REGISTRY.histogram(
+    "debate_memory_prompt_tokens",
+    "Tokens of debate memory placed in each prompt, by audience (agent or moderator).",
+    ["audience"],
+    buckets=(50, 100, 200, 400, 600, 800, 1000, 1500, 2000, 4000),
+)
+MEMORY_TOKENS_SAVED = REGISTRY.counter(
+    "debate_memory_tokens_saved_total",
+    "Prompt tokens saved by condensing older rounds instead of resending full history.",
+    ["audience"],
+)
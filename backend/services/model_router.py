@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from backend.agents.registry import AGENT_REGISTRY
+from backend.config import env_str
+
+TIERS = ("fast", "standard", "strong")
+# Cheap syntax fixes and opening statements go to the fast tier; a failed moderator parse escalates.
+# Tiers without their own model fall back to OPENAI_MODEL, so by default every route uses one model.
+DEFAULT_ROUTES = (
+    "default=standard,repair=fast,agent@first=fast,agent=standard,"
+    "moderator=standard,moderator@escalated=strong,regenerate=strong"
+)
+
+
+@dataclass(frozen=True)
+class Route:
+    tier: str
+    model: str
+
+
+@dataclass(frozen=True)
+class TierPrice:
+    """USD per million tokens."""
+
+    input: float
+    output: float
+    cached_input: float
+
+
+def parse_routes(spec: str) -> Dict[str, str]:
+    """Parse ``key=tier`` pairs; a key is a role (or ``agent``) with optional ``@first``, ``@later`` or ``@escalated``."""
+    routes: Dict[str, str] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        key, _, tier = item.partition("=")
+        tier = tier.strip()
+        if tier not in TIERS:
+            raise ValueError(f"LLM route {item!r} must map to one of {', '.join(TIERS)}")
+        routes[key.strip()] = tier
+    return routes
+
+
+def parse_prices(spec: str) -> Dict[str, TierPrice]:
+    """Parse ``tier=input/output[/cached_input]`` USD per million tokens."""
+    prices: Dict[str, TierPrice] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        tier, _, values = item.partition("=")
+        parts = [float(value) for value in values.split("/")]
+        if tier.strip() not in TIERS or len(parts) not in (2, 3):
+            raise ValueError(f"LLM tier price {item!r} must look like 'fast=0.10/0.40[/0.025]'")
+        cached_input = parts[2] if len(parts) == 3 else parts[0]
+        prices[tier.strip()] = TierPrice(input=parts[0], output=parts[1], cached_input=cached_input)
+    return prices
+
+
+class ModelRouter:
+    """Picks the model tier for a call from its role, debate round and whether it is an escalation."""
+
+    def __init__(
+        self, *, models: Dict[str, str], routes: Dict[str, str], prices: Optional[Dict[str, TierPrice]] = None
+    ) -> None:
+        self.models = models
+        self.routes = routes
+        self.prices = prices or {}
+
+    @classmethod
+    def from_env(cls) -> "ModelRouter":
+        default = os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
+        models = {
+            "fast": env_str("OPENAI_MODEL_FAST") or default,
+            "standard": default,
+            "strong": env_str("OPENAI_MODEL_STRONG") or default,
+        }
+        routes = {**parse_routes(DEFAULT_ROUTES), **parse_routes(env_str("LLM_ROUTES", "") or "")}
+        return cls(models=models, routes=routes, prices=parse_prices(env_str("LLM_TIER_PRICES", "") or ""))
+
+    def route(self, role: str, round_number: Optional[int] = None, *, escalated: bool = False) -> Route:
+        # Most specific key wins: the role before its group, escalation before round phase before neither.
+        phase = None if round_number is None else ("first" if round_number <= 1 else "later")
+        names = [role, "agent"] if role in AGENT_REGISTRY.personas else [role]
+        keys: List[str] = []
+        for name in names:
+            if escalated:
+                keys.append(f"{name}@escalated")
+            if phase is not None:
+                keys.append(f"{name}@{phase}")
+            keys.append(name)
+        keys.append("default")
+        tier = next((self.routes[key] for key in keys if key in self.routes), "standard")
+        return Route(tier=tier, model=self.models[tier])
+
+    def can_escalate(self, role: str, round_number: Optional[int] = None) -> bool:
+        """Whether an escalated call would use a different model than the normal one."""
+        return self.route(role, round_number, escalated=True).model != self.route(role, round_number).model
+
+    def cost(self, tier: str, prompt_tokens: int, cached_tokens: int, completion_tokens: int) -> float:
+        price = self.prices.get(tier)
+        if price is None:
+            return 0.0
+        uncached = max(0, prompt_tokens - cached_tokens)
+        return (
+            uncached * price.input + cached_tokens * price.cached_input + completion_tokens * price.output
+        ) / 1_000_000
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "models": dict(self.models),
+            "routes": dict(sorted(self.routes.items())),
+            "prices": {tier: asdict(price) for tier, price in self.prices.items()},
+        }
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import re
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Mapping, Optional
+
+from backend.config import env_int
+from backend.services.metrics import REGISTRY
+
+LLM_QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "llm_queue_wait_seconds",
+    "Time LLM calls waited for admission (concurrency, rate budget or 429 cooldown).",
+    ["role"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0),
+)
+LLM_RETRIES = REGISTRY.counter("llm_retries_total", "LLM call retries by reason.", ["reason"])
+LLM_CONCURRENCY_LIMIT = REGISTRY.gauge("llm_concurrency_limit", "Current adaptive LLM concurrency limit.")
+LLM_IN_FLIGHT = REGISTRY.gauge("llm_in_flight", "LLM calls currently holding an admission slot.")
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Parse rate-limit reset headers such as ``"1s"``, ``"250ms"`` or ``"6m0s"`` into seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    total = 0.0
+    matched = False
+    for amount, unit in _DURATION_PART.findall(value):
+        matched = True
+        total += float(amount) * {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}[unit]
+    return total if matched else None
+
+
+class _TokenBucket:
+    def __init__(self, per_minute: int) -> None:
+        self.enabled = per_minute > 0
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def delay(self, amount: float, now: float) -> float:
+        if not self.enabled:
+            return 0.0
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def consume(self, amount: float, now: float) -> None:
+        if self.enabled:
+            self._refill(now)
+            self.level -= min(amount, self.capacity)
+
+    def limit_to(self, remaining: float, now: float) -> None:
+        if self.enabled:
+            self._refill(now)
+            self.level = min(self.level, remaining)
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class AdmissionController:
+    """Process-wide gate for LLM calls: adaptive (AIMD) concurrency plus request and token budgets.
+
+    Successful calls grow the concurrency limit additively; 429 responses halve it and pause all
+    admissions until the provider's retry-after has elapsed.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self._requests = _TokenBucket(requests_per_minute)
+        self._tokens = _TokenBucket(tokens_per_minute)
+        self._cooldown_until = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        self.admitted = 0
+        self.rate_limited = 0
+        self.total_wait_seconds = 0.0
+        LLM_CONCURRENCY_LIMIT.set(self.limit)
+
+    async def acquire(self, estimated_tokens: int, *, role: str = "default") -> float:
+        started = time.monotonic()
+        while True:
+            now = time.monotonic()
+            delay: Optional[float]
+            if now < self._cooldown_until:
+                delay = self._cooldown_until - now
+            elif self.in_flight >= int(self.limit):
+                delay = None
+            else:
+                delay = max(self._requests.delay(1, now), self._tokens.delay(estimated_tokens, now))
+                if delay <= 0:
+                    self._requests.consume(1, now)
+                    self._tokens.consume(estimated_tokens, now)
+                    self.in_flight += 1
+                    break
+            await self._wait(delay)
+
+        waited = time.monotonic() - started
+        self.admitted += 1
+        self.total_wait_seconds += waited
+        LLM_IN_FLIGHT.set(self.in_flight)
+        LLM_QUEUE_WAIT_SECONDS.observe(waited, role=role)
+        return waited
+
+    def release(self) -> None:
+        self.in_flight = max(0, self.in_flight - 1)
+        LLM_IN_FLIGHT.set(self.in_flight)
+        self._wake()
+
+    def on_success(self, headers: Optional[Mapping[str, str]] = None) -> None:
+        self.limit = min(float(self.max_concurrency), self.limit + 1.0 / max(self.limit, 1.0))
+        LLM_CONCURRENCY_LIMIT.set(self.limit)
+        if headers:
+            self._apply_headers(headers)
+        self._wake()
+
+    def on_rate_limited(self, headers: Optional[Mapping[str, str]] = None) -> float:
+        """Halve the concurrency limit and pause admissions; returns the cooldown in seconds."""
+        self.rate_limited += 1
+        self.limit = max(float(self.min_concurrency), self.limit / 2.0)
+        LLM_CONCURRENCY_LIMIT.set(self.limit)
+        cooldown = 1.0
+        if headers:
+            retry_after = parse_reset_duration(headers.get("retry-after-ms"))
+            if retry_after is not None:
+                retry_after /= 1000.0
+            else:
+                retry_after = parse_reset_duration(headers.get("retry-after"))
+            if retry_after is not None:
+                cooldown = retry_after
+            self._apply_headers(headers)
+        self._cooldown_until = max(self._cooldown_until, time.monotonic() + cooldown)
+        return cooldown
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency_limit": round(self.limit, 2),
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "rate_limited": self.rate_limited,
+            "mean_wait_seconds": round(self.total_wait_seconds / self.admitted, 4) if self.admitted else 0.0,
+        }
+
+    def _apply_headers(self, headers: Mapping[str, str]) -> None:
+        now = time.monotonic()
+        remaining_requests = headers.get("x-ratelimit-remaining-requests")
+        remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+        try:
+            if remaining_requests is not None:
+                self._requests.limit_to(float(remaining_requests), now)
+                if float(remaining_requests) <= 0:
+                    reset = parse_reset_duration(headers.get("x-ratelimit-reset-requests"))
+                    if reset:
+                        self._cooldown_until = max(self._cooldown_until, now + reset)
+            if remaining_tokens is not None:
+                self._tokens.limit_to(float(remaining_tokens), now)
+        except ValueError:
+            pass
+
+    async def _wait(self, delay: Optional[float]) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            if delay is None:
+                await waiter
+            else:
+                await asyncio.wait_for(waiter, timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            # Hand a wake-up we may have consumed to the next waiter.
+            if waiter.done() and not waiter.cancelled():
+                self._wake()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def _wake(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+
+def backoff_delay(attempt: int, *, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff."""
+    return random.uniform(0.0, min(cap, base * (2**attempt)))
+
+
+_shared: Optional[AdmissionController] = None
+
+
+def shared_admission_controller() -> AdmissionController:
+    global _shared
+    if _shared is None:
+        _shared = AdmissionController(
+            max_concurrency=env_int("LLM_MAX_CONCURRENCY", 16),
+            min_concurrency=env_int("LLM_MIN_CONCURRENCY", 1),
+            requests_per_minute=env_int("LLM_REQUESTS_PER_MINUTE", 0),
+            tokens_per_minute=env_int("LLM_TOKENS_PER_MINUTE", 0),
+        )
+    return _shared
+
@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Protocol, Sequence, Set
+
+import httpx
+
+from backend.config import env_float, env_int, env_str
+from backend.services.metrics import REGISTRY
+
+TRACE_SPANS_EXPORTED = REGISTRY.counter(
+    "trace_spans_exported_total", "Finished spans handed to the trace exporter.", ["exporter"]
+)
+TRACE_EXPORT_FAILURES = REGISTRY.counter(
+    "trace_export_failures_total", "Traces the exporter dropped or failed to deliver.", ["exporter"]
+)
+
+# Span attributes summed over the LLM calls under a timeline entry.
+_USAGE_KEYS = ("prompt_tokens", "completion_tokens", "queue_ms", "retries")
+
+
+class Span:
+    """One timed operation; attributes are plain key/values set while it runs."""
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "start_ns", "end_ns", "attributes", "status")
+
+    recording = True
+
+    def __init__(
+        self,
+        trace: "Trace",
+        name: str,
+        parent_id: Optional[str],
+        attributes: Dict[str, Any],
+        start_ns: Optional[int] = None,
+    ) -> None:
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = start_ns if start_ns is not None else time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.status = "ok"
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add(self, key: str, amount: float) -> None:
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def end(self, status: Optional[str] = None) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if status is not None:
+            self.status = status
+        self.trace.finish(self)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start_ns / 1e9,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stands in for every span of an unsampled trace, so untraced debates only pay a context lookup."""
+
+    recording = False
+    status = "ok"
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def add(self, key: str, amount: float) -> None:
+        pass
+
+    def end(self, status: Optional[str] = None) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Exporter(Protocol):
+    name: str
+
+    def export(self, spans: List[Span]) -> None: ...
+
+    async def aclose(self) -> None: ...
+
+
+class Trace:
+    """Spans of one debate, held until the root span ends and then exported together."""
+
+    def __init__(self, exporter: Optional[Exporter]) -> None:
+        self.trace_id = os.urandom(16).hex()
+        self.exporter = exporter
+        self.spans: List[Span] = []
+
+    def finish(self, span: Span) -> None:
+        self.spans.append(span)
+        if span.parent_id is None and self.exporter is not None:
+            self.exporter.export(self.spans)
+            TRACE_SPANS_EXPORTED.inc(len(self.spans), exporter=self.exporter.name)
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("trace_span", default=None)
+
+
+class Tracer:
+    def __init__(self, exporter: Optional[Exporter] = None, *, sample_rate: float = 1.0) -> None:
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        kind = (env_str("TRACING_EXPORTER", "none") or "none").lower()
+        exporter: Optional[Exporter] = None
+        if kind == "jsonl":
+            exporter = JsonlExporter(env_str("TRACING_JSONL_PATH", "traces.jsonl") or "traces.jsonl")
+        elif kind == "otlp":
+            exporter = OtlpExporter(
+                env_str("TRACING_OTLP_ENDPOINT", "http://localhost:4318/v1/traces") or "",
+                service_name=env_str("TRACING_SERVICE_NAME", "debate-backend") or "debate-backend",
+                max_pending=env_int("TRACING_OTLP_MAX_PENDING", 64),
+            )
+        elif kind != "none":
+            raise ValueError(f"TRACING_EXPORTER must be none, jsonl or otlp, not {kind!r}")
+        return cls(exporter, sample_rate=min(1.0, max(0.0, env_float("TRACING_SAMPLE_RATE", 1.0))))
+
+    def start_trace(
+        self, name: str, *, record: bool = False, start_ns: Optional[int] = None, **attributes: Any
+    ) -> Any:
+        """Root span of a new trace; ``record`` keeps the spans of an unexported trace, e.g. for a timeline."""
+        export = self.exporter is not None and (self.sample_rate >= 1.0 or random.random() < self.sample_rate)
+        if not (export or record):
+            return NOOP_SPAN
+        return Span(Trace(self.exporter if export else None), name, None, attributes, start_ns)
+
+    def start_span(self, name: str, *, parent: Any = None, start_ns: Optional[int] = None, **attributes: Any) -> Any:
+        """Child of ``parent`` (default: the current span); call ``end`` on it when done."""
+        parent = parent if parent is not None else _current.get()
+        if parent is None or not parent.recording:
+            return NOOP_SPAN
+        return Span(parent.trace, name, parent.span_id, attributes, start_ns)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Any]:
+        """Child of the current span that is current itself for the block, and tasks started in it."""
+        span = self.start_span(name, **attributes)
+        if not span.recording:
+            yield span
+            return
+        with self.activate(span):
+            try:
+                yield span
+            except asyncio.CancelledError:
+                span.end("cancelled")
+                raise
+            except BaseException as exc:
+                span.set("error", str(exc)[:200])
+                span.end("error")
+                raise
+            finally:
+                span.end()
+
+    @contextmanager
+    def activate(self, span: Any) -> Iterator[None]:
+        """Make ``span`` the parent of spans started in the block without ending it afterwards."""
+        if not span.recording:
+            yield
+            return
+        token = _current.set(span)
+        try:
+            yield
+        finally:
+            _current.reset(token)
+
+    @staticmethod
+    def current() -> Any:
+        return _current.get() or NOOP_SPAN
+
+    async def aclose(self) -> None:
+        if self.exporter is not None:
+            await self.exporter.aclose()
+
+
+def timeline(root: Span, names: Sequence[str], *, expand: Sequence[str] = ()) -> List[Dict[str, Any]]:
+    """Compact, start-ordered view of ``root``'s finished spans named in ``names``.
+
+    Each entry carries the token, queueing and retry totals of the ``llm`` spans below it; the LLM calls
+    under spans named in ``expand`` are also listed one by one.
+    """
+    children: Dict[Optional[str], List[Span]] = {}
+    for span in root.trace.spans:
+        children.setdefault(span.parent_id, []).append(span)
+
+    def usage(span: Span) -> Dict[str, float]:
+        totals = {key: span.attributes.get(key, 0) for key in _USAGE_KEYS} if span.name == "llm" else {}
+        for child in children.get(span.span_id, ()):
+            for key, value in usage(child).items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    entries: List[Dict[str, Any]] = []
+    stack = [root]
+    while stack:
+        parent = stack.pop()
+        for span in children.get(parent.span_id, ()):
+            stack.append(span)
+            listed = span.name in names or (span.name == "llm" and parent.name in expand)
+            if not listed:
+                continue
+            totals = usage(span)
+            entries.append(
+                {
+                    **{key: value for key, value in span.attributes.items() if key not in _USAGE_KEYS},
+                    "span": span.name,
+                    "start_ms": round((span.start_ns - root.start_ns) / 1e6, 1),
+                    "duration_ms": round(span.duration_ms, 1),
+                    "status": span.status,
+                    "tokens": int(totals.get("prompt_tokens", 0) + totals.get("completion_tokens", 0)) or None,
+                    "queue_ms": round(totals["queue_ms"], 1) if totals.get("queue_ms") else None,
+                    "retries": int(totals.get("retries", 0)) or None,
+                }
+            )
+    entries.sort(key=lambda entry: entry["start_ms"])
+    return entries
+
+
+class JsonlExporter:
+    """Appends one JSON line per span to a local file from a background thread, off the event loop."""
+
+    name = "jsonl"
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._queue: "queue.SimpleQueue[Optional[List[Dict[str, Any]]]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+
+    def export(self, spans: List[Span]) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._write, name="trace-jsonl", daemon=True)
+            self._thread.start()
+        self._queue.put([span.to_dict() for span in spans])
+
+    async def aclose(self) -> None:
+        if self._thread is not None:
+            self._queue.put(None)
+            await asyncio.to_thread(self._thread.join)
+            self._thread = None
+
+    def _write(self) -> None:
+        with open(self.path, "a", encoding="utf-8") as handle:
+            while True:
+                batch = self._queue.get()
+                if batch is None:
+                    return
+                try:
+                    handle.write("".join(json.dumps(span, default=str) + "\n" for span in batch))
+                    handle.flush()
+                except (OSError, TypeError, ValueError):
+                    TRACE_EXPORT_FAILURES.inc(exporter=self.name)
+
+
+class OtlpExporter:
+    """Posts each finished trace to an OTLP/HTTP collector using the JSON encoding; no OpenTelemetry SDK needed."""
+
+    name = "otlp"
+
+    def __init__(self, endpoint: str, *, service_name: str, max_pending: int = 64) -> None:
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.max_pending = max(1, max_pending)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._pending: Set[asyncio.Task] = set()
+
+    def export(self, spans: List[Span]) -> None:
+        # A slow or missing collector costs dropped traces, never debate latency or unbounded memory.
+        if len(self._pending) >= self.max_pending:
+            TRACE_EXPORT_FAILURES.inc(exporter=self.name)
+            return
+        task = asyncio.get_running_loop().create_task(self._post(self._payload(spans)))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def aclose(self) -> None:
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _post(self, payload: Dict[str, Any]) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=httpx.Timeout(5.0))
+        try:
+            response = await self._client.post(self.endpoint, json=payload)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            TRACE_EXPORT_FAILURES.inc(exporter=self.name)
+
+    def _payload(self, spans: List[Span]) -> Dict[str, Any]:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                    "scopeSpans": [{"scope": {"name": "backend"}, "spans": [_otlp_span(span) for span in spans]}],
+                }
+            ]
+        }
+
+
+def _otlp_span(span: Span) -> Dict[str, Any]:
+    encoded: Dict[str, Any] = {
+        "traceId": span.trace.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        # SPAN_KIND_INTERNAL
+        "kind": 1,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns or span.start_ns),
+        "attributes": [_otlp_attribute(key, value) for key, value in span.attributes.items() if value is not None],
+        # STATUS_CODE_OK / STATUS_CODE_ERROR; a cancellation is not an error.
+        "status": {"code": 2, "message": span.attributes.get("error", "")} if span.status == "error" else {"code": 1},
+    }
+    if span.parent_id is not None:
+        encoded["parentSpanId"] = span.parent_id
+    return encoded
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        encoded: Dict[str, Any] = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+TRACER = Tracer.from_env()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, Tuple
+
+
+@dataclass
+class UsageTotals:
+    calls: int = 0
+    cache_hits: int = 0
+    prompt_tokens: int = 0
+    cached_prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# Tasks copy the context when they are created, so agent tasks spawned inside a debate still
+# report into that debate's totals. Innermost last.
+_current: ContextVar[Tuple[UsageTotals, ...]] = ContextVar("llm_usage", default=())
+
+
+@contextmanager
+def track_usage() -> Iterator[UsageTotals]:
+    """Attribute LLM calls made inside the block (and tasks it starts) to one ``UsageTotals``.
+
+    Blocks nest: a call also counts towards every enclosing block, e.g. a batch item and its debate.
+    """
+    totals = UsageTotals()
+    token = _current.set(_current.get() + (totals,))
+    try:
+        yield totals
+    finally:
+        _current.reset(token)
+
+
+def record_call(*, cache_hit: bool = False) -> None:
+    for totals in _current.get():
+        totals.calls += 1
+        totals.cache_hits += int(cache_hit)
+
+
+def record_tokens(prompt_tokens: int, completion_tokens: int, cached_prompt_tokens: int = 0) -> None:
+    for totals in _current.get():
+        totals.prompt_tokens += prompt_tokens
+        totals.cached_prompt_tokens += cached_prompt_tokens
+        totals.completion_tokens += completion_tokens
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from backend.config import env_float
+from backend.memory.memory_view import AGENT_SUMMARY_CLIP, clip
+from backend.models.schemas import RoundRecord
+
+# Reason for speculative turns dropped because the committed memory read too differently.
+DIVERGENCE = "divergence"
+
+
+class SpeculationPolicy:
+    """Decides whether next-round agent turns started against provisional memory can be kept."""
+
+    def __init__(self, *, min_similarity: Optional[float] = None) -> None:
+        self.min_similarity = (
+            min_similarity if min_similarity is not None else env_float("SPECULATION_MIN_SIMILARITY", 0.7)
+        )
+        self.started = 0
+        self.committed = 0
+        # divergence, or the stop reason of the debate that ended with speculative turns in flight.
+        self.discarded: Counter[str] = Counter()
+        self.wasted_agent_calls = 0
+
+    def should_commit(self, provisional: RoundRecord, committed: RoundRecord) -> bool:
+        """Whether turns started against ``provisional`` can stand for ones started against ``committed``.
+
+        Both records carry the same agent responses and the earlier rounds are the same either way, so only
+        the moderator's part differs: its summary and consensus statement, as clipped in agent memory.
+        """
+        return self.similarity(self.synthesis_text(provisional), self.synthesis_text(committed)) >= self.min_similarity
+
+    @staticmethod
+    def synthesis_text(record: RoundRecord) -> str:
+        return (
+            f"{clip(record.moderator_summary, limit=AGENT_SUMMARY_CLIP)}\n"
+            f"{clip(record.consensus_statement, limit=AGENT_SUMMARY_CLIP)}"
+        )
+
+    def record_commit(self) -> None:
+        self.committed += 1
+
+    def record_discard(self, reason: str, agent_calls: int) -> None:
+        self.discarded[reason] += 1
+        self.wasted_agent_calls += agent_calls
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "min_similarity": self.min_similarity,
+            "started": self.started,
+            "committed": self.committed,
+            "discarded": sum(self.discarded.values()),
+            "discarded_by_reason": dict(self.discarded),
+            "wasted_agent_calls": self.wasted_agent_calls,
+            "commit_rate": round(self.committed / self.started, 4) if self.started else 0.0,
+        }
+
+    @staticmethod
+    def similarity(a: str, b: str) -> float:
+        # Weighted Jaccard over word counts: 1.0 when the agents saw exactly the synthesis they
+        # would have seen without speculation.
+        if a == b:
+            return 1.0
+        left = Counter(re.findall(r"\w+", a.lower()))
+        right = Counter(re.findall(r"\w+", b.lower()))
+        union = sum((left | right).values())
+        if not union:
+            return 1.0
+        return sum((left & right).values()) / union
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Protocol, Sequence
+
+import numpy as np
+
+from backend.models.schemas import ConvergenceStats, DebateStartRequest, StoppingConfig
+
+TARGET_REACHED = "target_reached"
+MAX_ROUNDS = "max_rounds"
+
+
+@dataclass(frozen=True)
+class DebateProgress:
+    """What a stopping policy can see after a round's moderator output."""
+
+    round_number: int
+    max_rounds: int
+    target: float
+    confidences: Sequence[float]
+    convergence: Sequence[ConvergenceStats]
+
+    @property
+    def remaining_rounds(self) -> int:
+        return self.max_rounds - self.round_number
+
+
+@dataclass(frozen=True)
+class StopDecision:
+    reason: str
+    message: str
+
+
+class StoppingPolicy(Protocol):
+    name: str
+
+    def check(self, progress: DebateProgress) -> Optional[StopDecision]: ...
+
+
+class PlateauPolicy:
+    """Stop when confidence has stayed within ``tolerance`` points for ``window`` rounds below the target."""
+
+    name = "plateau"
+
+    def __init__(self, *, window: int, tolerance: float) -> None:
+        self.window = window
+        self.tolerance = tolerance
+
+    def check(self, progress: DebateProgress) -> Optional[StopDecision]:
+        recent = progress.confidences[-self.window :]
+        if len(recent) < self.window:
+            return None
+        spread = max(recent) - min(recent)
+        if spread > self.tolerance:
+            return None
+        return StopDecision(
+            self.name,
+            f"Confidence plateaued at {recent[-1]:.1f} (moved {spread:.1f} points over {self.window} rounds).",
+        )
+
+
+class ProjectionPolicy:
+    """Stop when the confidence slope over ``window`` rounds cannot reach the target in the rounds left."""
+
+    name = "projection"
+
+    def __init__(self, *, window: int) -> None:
+        self.window = window
+
+    def check(self, progress: DebateProgress) -> Optional[StopDecision]:
+        recent = progress.confidences[-self.window :]
+        if len(recent) < self.window or progress.remaining_rounds <= 0:
+            return None
+        slope = float(np.polyfit(np.arange(len(recent)), np.asarray(recent, dtype=float), 1)[0])
+        gap = progress.target - recent[-1]
+        projected = math.ceil(gap / slope) if slope > 0 else math.inf
+        if projected <= progress.remaining_rounds:
+            return None
+        estimate = "never" if math.isinf(projected) else f"in ~{projected} rounds"
+        return StopDecision(
+            self.name,
+            f"At {slope:+.1f} points per round the target would be reached {estimate}; "
+            f"{progress.remaining_rounds} rounds remain.",
+        )
+
+
+class StagnationPolicy:
+    """Stop when the agents' responses have stopped moving towards each other for ``window`` rounds."""
+
+    name = "stagnation"
+
+    def __init__(self, *, window: int, tolerance: float) -> None:
+        self.window = window
+        self.tolerance = tolerance
+
+    def check(self, progress: DebateProgress) -> Optional[StopDecision]:
+        recent = [stats.agreement for stats in progress.convergence[-self.window :]]
+        if len(recent) < self.window:
+            return None
+        spread = max(recent) - min(recent)
+        if spread > self.tolerance:
+            return None
+        return StopDecision(
+            self.name,
+            f"Agent agreement stagnated at {recent[-1]:.2f} (moved {spread:.3f} over {self.window} rounds).",
+        )
+
+
+# Name -> factory; register custom policies here to make them selectable by name.
+POLICY_FACTORIES: Dict[str, Callable[[StoppingConfig], StoppingPolicy]] = {
+    "plateau": lambda config: PlateauPolicy(window=config.window, tolerance=config.plateau_tolerance),
+    "projection": lambda config: ProjectionPolicy(window=config.window),
+    "stagnation": lambda config: StagnationPolicy(window=config.window, tolerance=config.stagnation_tolerance),
+}
+
+
+class StoppingController:
+    """Tracks a debate's trajectory and decides after each round whether to run another one."""
+
+    def __init__(self, request: DebateStartRequest, policies: Optional[List[StoppingPolicy]] = None) -> None:
+        self.request = request
+        self.policies = (
+            policies
+            if policies is not None
+            else [POLICY_FACTORIES[name](request.stopping) for name in request.stopping.policies]
+        )
+        self.confidences: List[float] = []
+
+    def after_round(
+        self, round_number: int, confidence: float, convergence: Sequence[ConvergenceStats]
+    ) -> Optional[StopDecision]:
+        self.confidences.append(confidence)
+        if confidence >= self.request.confidence_target:
+            return StopDecision(TARGET_REACHED, "Confidence target reached.")
+        if round_number >= self.request.max_rounds:
+            return None
+        progress = DebateProgress(
+            round_number=round_number,
+            max_rounds=self.request.max_rounds,
+            target=self.request.confidence_target,
+            confidences=self.confidences,
+            convergence=convergence,
+        )
+        for policy in self.policies:
+            decision = policy.check(progress)
+            if decision is not None:
+                return decision
+        return None
@@ -0,0 +1,57 @@
+"""Replay the malformed moderator output corpus through the local JSON repair path.
+
+Reports, per failure class, how many outputs ``ModeratorAgent`` recovers without the remote
+repair call::
+
+    python -m benchmarks.json_repair_corpus
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict
+
+from backend.agents.moderator import ModeratorAgent
+from backend.services.llm_service import LLMService
+
+CORPUS = Path(__file__).resolve().parent / "fixtures" / "malformed_moderator_outputs.jsonl"
+
+
+def main() -> Dict[str, Any]:
+    moderator = ModeratorAgent(LLMService())
+    by_class: Dict[str, Dict[str, int]] = defaultdict(lambda: {"total": 0, "strict_ok": 0, "local_ok": 0})
+    elapsed = 0.0
+
+    with CORPUS.open() as handle:
+        for line in handle:
+            case = json.loads(line)
+            counts = by_class[case["class"]]
+            counts["total"] += 1
+            if not moderator._is_parse_failure(moderator._safe_parse(case["raw"])):
+                counts["strict_ok"] += 1
+                continue
+            started = time.perf_counter()
+            parsed = moderator._local_repair(case["raw"])
+            elapsed += time.perf_counter() - started
+            if not moderator._is_parse_failure(parsed):
+                counts["local_ok"] += 1
+
+    total = sum(c["total"] for c in by_class.values())
+    recovered = sum(c["strict_ok"] + c["local_ok"] for c in by_class.values())
+    report = {
+        "cases": total,
+        "recovered_without_remote_call": recovered,
+        "remote_calls_needed": total - recovered,
+        "local_repair_ms_total": round(elapsed * 1000, 3),
+        "by_class": dict(by_class),
+        "repair_stats": moderator.repair_stats,
+    }
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""Drive concurrent SSE debates against ``backend.main:app`` and report throughput and latency.
+
+By default this starts the local mock OpenAI server and a backend instance wired to it, runs the
+load, and writes a JSON report under ``benchmarks/results/`` so runs can be compared across commits::
+
+    python -m benchmarks.load_test --debates 40 --concurrency 10 --latency-mean-ms 500
+
+Use ``--target`` to benchmark an already running backend instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+PROMPTS = [
+    "Should governments subsidize AI compute infrastructure?",
+    "Should cities replace parking minimums with congestion pricing?",
+    "Should central banks issue retail digital currencies?",
+    "Should countries adopt a four-day work week in the public sector?",
+]
+
+
+@dataclass
+class DebateResult:
+    ok: bool
+    duration_s: float
+    time_to_first_event_s: Optional[float] = None
+    time_to_first_token_s: Optional[float] = None
+    rounds: int = 0
+    round_durations_s: List[float] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+async def run_one(client: httpx.AsyncClient, target: str, payload: Dict[str, Any]) -> DebateResult:
+    started = time.perf_counter()
+    first_event: Optional[float] = None
+    first_token: Optional[float] = None
+    round_started: Dict[int, float] = {}
+    round_durations: List[float] = []
+    rounds = 0
+    try:
+        async with client.stream("POST", f"{target}/start-debate", json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                now = time.perf_counter()
+                event = json.loads(line[6:])
+                if first_event is None:
+                    first_event = now - started
+                event_type = event.get("event_type")
+                if event_type in {"agent_token", "agent_response"} and first_token is None:
+                    first_token = now - started
+                elif event_type == "round_start":
+                    round_started[event["round_number"]] = now
+                elif event_type == "round":
+                    number = event["round_number"]
+                    if number in round_started:
+                        round_durations.append(now - round_started[number])
+                    rounds = number
+                elif event_type == "error":
+                    return DebateResult(
+                        ok=False,
+                        duration_s=time.perf_counter() - started,
+                        time_to_first_event_s=first_event,
+                        rounds=rounds,
+                        round_durations_s=round_durations,
+                        error=event.get("message"),
+                    )
+    except Exception as exc:
+        return DebateResult(ok=False, duration_s=time.perf_counter() - started, error=str(exc))
+
+    return DebateResult(
+        ok=True,
+        duration_s=time.perf_counter() - started,
+        time_to_first_event_s=first_event,
+        time_to_first_token_s=first_token,
+        rounds=rounds,
+        round_durations_s=round_durations,
+    )
+
+
+async def run_load(args: argparse.Namespace, target: str) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency + 4, max_keepalive_connections=args.concurrency + 4)
+
+    async with httpx.AsyncClient(timeout=httpx.Timeout(args.timeout), limits=limits) as client:
+
+        async def bounded(index: int) -> DebateResult:
+            if args.distinct_prompts > 0:
+                # Identical requests, so a backend with DEBATE_SINGLE_FLIGHT=1 can share debates.
+                prompt = PROMPTS[index % args.distinct_prompts % len(PROMPTS)]
+            else:
+                prompt = f"{PROMPTS[index % len(PROMPTS)]} (run {index})"
+            payload = {
+                "prompt": prompt,
+                "confidence_target": args.confidence_target,
+                "max_rounds": args.max_rounds,
+                "use_cache": args.distinct_prompts > 0,
+                "pipeline_rounds": args.pipeline_rounds,
+                "panel": args.panel,
+                "budget": {"seconds": args.time_budget, "tokens": args.token_budget},
+            }
+            async with semaphore:
+                return await run_one(client, target, payload)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(bounded(i) for i in range(args.debates)))
+        wall = time.perf_counter() - started
+
+    return {"wall_s": wall, "results": [asdict(r) for r in results]}
+
+
+def summarize(load: Dict[str, Any], mock_counters: Dict[str, int]) -> Dict[str, Any]:
+    results = load["results"]
+    ok = [r for r in results if r["ok"]]
+    rounds = [d for r in ok for d in r["round_durations_s"]]
+    moderator_calls = mock_counters.get("requests_moderator", 0)
+    return {
+        "debates": len(results),
+        "succeeded": len(ok),
+        "failed": len(results) - len(ok),
+        "wall_s": round(load["wall_s"], 3),
+        "debates_per_s": round(len(ok) / load["wall_s"], 3) if load["wall_s"] else 0.0,
+        "time_to_first_event_s": percentiles([r["time_to_first_event_s"] for r in ok if r["time_to_first_event_s"]]),
+        "time_to_first_token_s": percentiles([r["time_to_first_token_s"] for r in ok if r["time_to_first_token_s"]]),
+        "debate_duration_s": percentiles([r["duration_s"] for r in ok]),
+        "round_duration_s": percentiles(rounds),
+        "mean_rounds": round(sum(r["rounds"] for r in ok) / len(ok), 2) if ok else 0.0,
+        "llm_requests": mock_counters.get("requests", 0),
+        "moderator_repair_rate": ratio(mock_counters.get("requests_repair", 0), moderator_calls),
+        "moderator_regeneration_rate": ratio(mock_counters.get("requests_regenerate", 0), moderator_calls),
+        "prompt_cache_hit_rate": ratio(mock_counters.get("cached_prompt_tokens", 0), mock_counters.get("prompt_tokens", 0)),
+        "errors": sorted({r["error"] for r in results if r["error"]})[:10],
+    }
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 4)
+
+    return {"count": len(ordered), "p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": round(ordered[-1], 4)}
+
+
+def ratio(numerator: int, denominator: int) -> float:
+    return round(numerator / denominator, 4) if denominator else 0.0
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def wait_ready(url: str, timeout: float = 20.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Service at {url} did not become ready")
+
+
+def start_stack(args: argparse.Namespace) -> List[subprocess.Popen]:
+    mock_cmd = [
+        sys.executable,
+        "-m",
+        "benchmarks.mock_openai",
+        "--port",
+        str(args.mock_port),
+        "--latency-dist",
+        args.latency_dist,
+        "--latency-mean-ms",
+        str(args.latency_mean_ms),
+        "--token-delay-ms",
+        str(args.token_delay_ms),
+        "--error-rate",
+        str(args.error_rate),
+        "--rate-limit-rate",
+        str(args.rate_limit_rate),
+        "--malformed-json-rate",
+        str(args.malformed_json_rate),
+        "--low-information-rate",
+        str(args.low_information_rate),
+    ]
+    if args.seed is not None:
+        mock_cmd += ["--seed", str(args.seed)]
+    mock = subprocess.Popen(mock_cmd, cwd=ROOT)
+
+    env = dict(os.environ)
+    env.update(
+        {
+            "OPENAI_API_KEY": "mock",
+            "OPENAI_BASE_URL": f"http://127.0.0.1:{args.mock_port}/v1",
+            "LLM_CACHE_ENABLED": "0",
+        }
+    )
+    backend = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "backend.main:app",
+            "--port",
+            str(args.backend_port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=ROOT,
+        env=env,
+    )
+    processes = [mock, backend]
+    try:
+        wait_ready(f"http://127.0.0.1:{args.mock_port}/v1/models")
+        wait_ready(f"http://127.0.0.1:{args.backend_port}/health")
+    except Exception:
+        stop_stack(processes)
+        raise
+    return processes
+
+
+def stop_stack(processes: List[subprocess.Popen]) -> None:
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default=None, help="Benchmark a running backend instead of starting one.")
+    parser.add_argument("--debates", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--max-rounds", type=int, default=3)
+    parser.add_argument("--confidence-target", type=float, default=80.0)
+    parser.add_argument("--pipeline-rounds", action="store_true", help="Enable speculative round pipelining.")
+    parser.add_argument("--panel", default=None, help="Agent panel to debate with (e.g. three, five, seven).")
+    parser.add_argument(
+        "--distinct-prompts",
+        type=int,
+        default=0,
+        help="Cycle through this many identical requests (cache allowed) instead of unique ones; 0 = all unique.",
+    )
+    parser.add_argument("--time-budget", type=float, default=None, help="Wall-clock budget per debate in seconds.")
+    parser.add_argument("--token-budget", type=int, default=None, help="LLM token budget per debate.")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--mock-port", type=int, default=9100)
+    parser.add_argument("--backend-port", type=int, default=9200)
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--latency-mean-ms", type=float, default=600.0)
+    parser.add_argument("--token-delay-ms", type=float, default=8.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-json-rate", type=float, default=0.1)
+    parser.add_argument("--low-information-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--label", default="", help="Free-form label stored with the results.")
+    parser.add_argument("--output", default=None, help="Path of the JSON report.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    args = parse_args(argv)
+    processes: List[subprocess.Popen] = []
+    target = args.target
+    if target is None:
+        processes = start_stack(args)
+        target = f"http://127.0.0.1:{args.backend_port}"
+
+    try:
+        mock_url = f"http://127.0.0.1:{args.mock_port}/_mock"
+        if args.target is None:
+            httpx.post(f"{mock_url}/reset")
+        load = asyncio.run(run_load(args, target))
+        speculation = httpx.get(f"{target}/speculation").json()
+        mock_counters: Dict[str, int] = {}
+        if args.target is None:
+            mock_counters = httpx.get(f"{mock_url}/stats").json()["counters"]
+    finally:
+        stop_stack(processes)
+
+    report = {
+        "label": args.label,
+        "git_revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {k: v for k, v in vars(args).items() if k not in {"output", "label"}},
+        "summary": summarize(load, mock_counters),
+        "mock_counters": mock_counters,
+        "speculation": speculation,
+        "debates": load["results"],
+    }
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"load-{report['git_revision']}-{int(time.time())}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(json.dumps(report["summary"], indent=2))
+    print(f"Report written to {output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Show how many memory tokens each prompt carries as a debate grows, with and without compaction.
+
+Feeds synthetic rounds into a ``MemoryView`` (no server or provider needed) and prints, per round, the
+tokens in the agent and moderator memory next to what resending every round in full would cost::
+
+    python -m benchmarks.memory_budget --rounds 20 --response-chars 1200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from typing import Any, Dict, List
+
+from backend.memory.memory_view import MemoryView
+from backend.models.schemas import RoundRecord
+
+FILLER = (
+    "The panel weighs costs against benefits, cites precedent from comparable jurisdictions and "
+    "proposes phased implementation with review points. "
+)
+
+
+def synthetic_round(round_number: int, response_chars: int) -> RoundRecord:
+    def text(label: str) -> str:
+        body = f"{label} position in round {round_number}. " + FILLER * (response_chars // len(FILLER) + 1)
+        return body[:response_chars]
+
+    return RoundRecord(
+        round_number=round_number,
+        responses={"centre_left": text("Centre-left"), "centre": text("Centre"), "centre_right": text("Centre-right")},
+        moderator_summary=text("Moderator"),
+        consensus_statement=f"Round {round_number} consensus: adopt a phased rollout with review. " + FILLER,
+        confidence=min(95.0, 40.0 + 3.0 * round_number),
+    )
+
+
+def run(rounds: int, response_chars: int) -> List[Dict[str, Any]]:
+    view = MemoryView()
+    rows: List[Dict[str, Any]] = []
+    for round_number in range(1, rounds + 1):
+        view.append(synthetic_round(round_number, response_chars))
+        rows.append({"round": round_number, **view.token_usage()})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--response-chars", type=int, default=1200)
+    parser.add_argument("--json", action="store_true", help="Print rows as JSON instead of a table.")
+    args = parser.parse_args()
+
+    rows = run(args.rounds, args.response_chars)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"{'round':>5} {'agent':>7} {'agent full':>11} {'moderator':>10} {'moderator full':>15}")
+    for row in rows:
+        print(
+            f"{row['round']:>5} {row['agent_tokens']:>7} {row['agent_tokens_unbounded']:>11} "
+            f"{row['moderator_tokens']:>10} {row['moderator_tokens_unbounded']:>15}"
+        )
+
+
+if __name__ == "__main__":
+    main()
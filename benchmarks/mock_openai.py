@@ -0,0 +1,320 @@
+"""Local OpenAI-compatible stand-in for load testing the debate backend.
+
+Run standalone with ``python -m benchmarks.mock_openai --port 9100`` and point the backend at it with
+``OPENAI_BASE_URL=http://127.0.0.1:9100/v1 OPENAI_API_KEY=mock``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncGenerator, Dict, List, Optional, Set, Tuple
+from uuid import uuid4
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass
+class MockConfig:
+    latency_dist: str = "lognormal"
+    latency_mean_ms: float = 600.0
+    latency_sigma: float = 0.35
+    token_delay_ms: float = 8.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    malformed_json_rate: float = 0.0
+    low_information_rate: float = 0.0
+    connect_delay_ms: float = 0.0
+    prompt_cache_min_tokens: int = 1024
+    seed: Optional[int] = None
+
+
+config = MockConfig()
+stats: Counter = Counter()
+_connections: Set[Tuple[str, int]] = set()
+_prompt_prefixes: Set[str] = set()
+_rng = random.Random()
+
+app = FastAPI(title="Mock OpenAI API")
+
+_AGENT_SENTENCES = [
+    "Targeted public investment can correct underprovision where private returns lag social returns.",
+    "Subsidies without sunset clauses tend to entrench incumbents and distort capital allocation.",
+    "Evidence from semiconductor policy suggests conditional support outperforms open-ended grants.",
+    "Counterpoint: the previous argument underestimates fiscal opportunity costs and crowding out.",
+    "Measured milestones and independent evaluation keep the policy accountable to outcomes.",
+    "Historical industrial policy shows both coordination gains and capture risks.",
+    "Market signals remain the best guide for allocating scarce compute capacity.",
+    "Equity concerns require that access is not limited to the largest incumbents.",
+]
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request) -> Any:
+    body = await request.json()
+    messages: List[Dict[str, str]] = body.get("messages", [])
+    kind = _classify(messages)
+    await _on_connection(request)
+    stats["requests"] += 1
+    stats[f"requests_{kind}"] += 1
+
+    await asyncio.sleep(_sample_latency() / 1000.0)
+
+    roll = _rng.random()
+    if roll < config.rate_limit_rate:
+        stats["injected_429"] += 1
+        return JSONResponse(
+            status_code=429,
+            headers={"retry-after": "1", "x-ratelimit-remaining-requests": "0"},
+            content={"error": {"message": "Rate limit reached", "type": "rate_limit_error", "code": "rate_limit_exceeded"}},
+        )
+    if roll < config.rate_limit_rate + config.error_rate:
+        stats["injected_500"] += 1
+        return JSONResponse(
+            status_code=500,
+            content={"error": {"message": "Injected server error", "type": "server_error", "code": None}},
+        )
+
+    content = _content_for(kind, messages)
+    prompt_tokens = sum(_count_tokens(m.get("content", "")) for m in messages)
+    completion_tokens = _count_tokens(content)
+    cached_tokens = _cached_prefix_tokens(messages)
+    stats["prompt_tokens"] += prompt_tokens
+    stats["cached_prompt_tokens"] += cached_tokens
+    usage = {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "prompt_tokens_details": {"cached_tokens": cached_tokens},
+    }
+    model = body.get("model", "mock-model")
+    stats[f"model_{model}"] += 1
+
+    if body.get("stream"):
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+        return StreamingResponse(
+            _stream_chunks(model, content, usage if include_usage else None),
+            media_type="text/event-stream",
+        )
+
+    return {
+        "id": f"chatcmpl-{uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+        ],
+        "usage": usage,
+    }
+
+
+@app.get("/v1/models")
+async def list_models(request: Request) -> Dict[str, Any]:
+    await _on_connection(request)
+    return {"object": "list", "data": [{"id": "mock-model", "object": "model", "created": 0, "owned_by": "mock"}]}
+
+
+@app.get("/_mock/stats")
+async def get_stats() -> Dict[str, Any]:
+    return {"config": asdict(config), "counters": dict(stats)}
+
+
+@app.post("/_mock/reset")
+async def reset_stats() -> Dict[str, str]:
+    stats.clear()
+    _connections.clear()
+    _prompt_prefixes.clear()
+    return {"status": "ok"}
+
+
+async def _stream_chunks(model: str, content: str, usage: Optional[Dict[str, int]]) -> AsyncGenerator[str, None]:
+    chunk_id = f"chatcmpl-{uuid4().hex}"
+    created = int(time.time())
+
+    def frame(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+        payload = {
+            "id": chunk_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    yield frame({"role": "assistant", "content": ""})
+    for piece in re.findall(r"\S+\s*", content):
+        if config.token_delay_ms > 0:
+            await asyncio.sleep(config.token_delay_ms / 1000.0)
+        yield frame({"content": piece})
+    yield frame({}, "stop")
+    if usage is not None:
+        payload = {
+            "id": chunk_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [],
+            "usage": usage,
+        }
+        yield f"data: {json.dumps(payload)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+async def _on_connection(request: Request) -> None:
+    # The first request on a new connection pays a simulated handshake (TCP + TLS round trips).
+    if request.client is None:
+        return
+    peer = (request.client.host, request.client.port)
+    if peer in _connections:
+        stats["reused_connection_requests"] += 1
+        return
+    _connections.add(peer)
+    stats["connections"] += 1
+    if config.connect_delay_ms > 0:
+        await asyncio.sleep(config.connect_delay_ms / 1000.0)
+
+
+def _cached_prefix_tokens(messages: List[Dict[str, str]]) -> int:
+    """Mimic provider prompt caching: the longest previously seen message prefix of at least
+    ``prompt_cache_min_tokens`` is served from cache, rounded down to 128-token blocks."""
+    if len(_prompt_prefixes) > 100_000:
+        _prompt_prefixes.clear()
+    digest = hashlib.sha256()
+    total = 0
+    cached = 0
+    for message in messages:
+        digest.update(json.dumps(message, sort_keys=True).encode("utf-8"))
+        total += _count_tokens(message.get("content", ""))
+        key = digest.hexdigest()
+        if key in _prompt_prefixes and total >= config.prompt_cache_min_tokens:
+            cached = total
+        _prompt_prefixes.add(key)
+    return cached - cached % 128
+
+
+def _classify(messages: List[Dict[str, str]]) -> str:
+    system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+    if "JSON repair assistant" in system:
+        return "repair"
+    if messages and messages[-1].get("content", "").startswith("Your previous answer was incomplete"):
+        return "regenerate"
+    if "Moderator Agent" in system:
+        return "moderator"
+    return "agent"
+
+
+def _content_for(kind: str, messages: List[Dict[str, str]]) -> str:
+    if kind == "agent":
+        sentences = _rng.sample(_AGENT_SENTENCES, k=6)
+        paragraphs = [" ".join(sentences[i : i + 2]) for i in range(0, 6, 2)]
+        return "\n\n".join(paragraphs) + "\n\nCitations: OECD industrial policy review; Rodrik (2004); CHIPS Act evaluation"
+
+    round_number = _round_number(messages)
+    payload = {
+        "agreements": ["Policy should be evidence-led.", "Guardrails and sunset clauses are needed."],
+        "disagreements": ["Scale of public funding.", "Role of the state versus markets."],
+        "strongest_arguments": [
+            "Centre-Left: access and equity matter.",
+            "Centre: conditional support with evaluation.",
+            "Centre-Right: avoid capture and crowding out.",
+        ],
+        "consensus_statement": "A phased, conditional programme with independent evaluation is preferred.",
+        "confidence": round(min(95.0, 48.0 + 9.0 * round_number + _rng.uniform(-4.0, 4.0)), 1),
+        "summary": "Agents converge on conditional support while disagreeing on scale.",
+    }
+
+    if kind == "moderator" and _rng.random() < config.low_information_rate:
+        stats["injected_low_information"] += 1
+        payload["agreements"] = []
+        payload["strongest_arguments"] = []
+    text = json.dumps(payload)
+    if kind == "moderator" and _rng.random() < config.malformed_json_rate:
+        stats["injected_malformed_json"] += 1
+        return _malform(text)
+    return text
+
+
+def _malform(text: str) -> str:
+    variant = _rng.randrange(5)
+    if variant == 0:
+        return text[:-1] + ",}"
+    if variant == 1:
+        return text.replace('"', "'")
+    if variant == 2:
+        return "Here is the moderator analysis you requested:\n" + text.replace(", \"", ",\n\"") + "\nHope this helps."
+    if variant == 3:
+        return text[: max(1, int(len(text) * 0.7))]
+    return "agreements: none; confidence unclear"
+
+
+def _round_number(messages: List[Dict[str, str]]) -> int:
+    for message in messages:
+        match = re.search(r"Round: (\d+)", message.get("content", ""))
+        if match:
+            return int(match.group(1))
+    return 1
+
+
+def _sample_latency() -> float:
+    mean = max(0.0, config.latency_mean_ms)
+    if config.latency_dist == "fixed" or mean == 0:
+        return mean
+    if config.latency_dist == "uniform":
+        return _rng.uniform(0.5 * mean, 1.5 * mean)
+    # Lognormal with the configured arithmetic mean gives the long tail real providers show.
+    sigma = config.latency_sigma
+    mu = math.log(mean) - sigma * sigma / 2.0
+    return _rng.lognormvariate(mu, sigma)
+
+
+def _count_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "lognormal"], default=config.latency_dist)
+    parser.add_argument("--latency-mean-ms", type=float, default=config.latency_mean_ms)
+    parser.add_argument("--latency-sigma", type=float, default=config.latency_sigma)
+    parser.add_argument("--token-delay-ms", type=float, default=config.token_delay_ms)
+    parser.add_argument("--error-rate", type=float, default=config.error_rate)
+    parser.add_argument("--rate-limit-rate", type=float, default=config.rate_limit_rate)
+    parser.add_argument("--malformed-json-rate", type=float, default=config.malformed_json_rate)
+    parser.add_argument("--low-information-rate", type=float, default=config.low_information_rate)
+    parser.add_argument(
+        "--connect-delay-ms", type=float, default=config.connect_delay_ms, help="Extra delay for a new connection."
+    )
+    parser.add_argument(
+        "--prompt-cache-min-tokens",
+        type=int,
+        default=config.prompt_cache_min_tokens,
+        help="Shortest repeated prefix reported as cached_tokens.",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    for field in asdict(config):
+        setattr(config, field, getattr(args, field))
+    if config.seed is not None:
+        _rng.seed(config.seed)
+
+    # Hosted APIs keep idle connections open far longer than uvicorn's 5s default.
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", timeout_keep_alive=120)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Compare first-request latency for cold and warmed ``LLMService`` connection pools.
+
+Starts the local mock OpenAI server with a simulated per-connection handshake cost, then sends bursts
+of concurrent completions separated by idle gaps::
+
+    python -m benchmarks.pool_warmup --burst-size 12 --bursts 3 --idle-s 6 --connect-delay-ms 120
+
+* ``cold``: no warm-up and httpx's default 5s keep-alive expiry, so connections idle between bursts
+  are closed and every burst reconnects.
+* ``warm``: ``LLMService.warm_up`` at start and a keep-alive expiry longer than the idle gap.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.load_test import RESULTS_DIR, ROOT, git_revision, percentiles, stop_stack, wait_ready
+
+SCENARIOS = {
+    "cold": {"warm_up": False, "keepalive_expiry_s": 5.0},
+    "warm": {"warm_up": True, "keepalive_expiry_s": 120.0},
+}
+
+
+async def run_scenario(args: argparse.Namespace, name: str) -> Dict[str, Any]:
+    scenario = SCENARIOS[name]
+    os.environ["LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS"] = str(scenario["keepalive_expiry_s"])
+    # Imported late so the service reads the environment configured above.
+    from backend.services.llm_service import LLMService
+
+    llm = LLMService()
+    mock_url = f"http://127.0.0.1:{args.mock_port}/_mock"
+    httpx.post(f"{mock_url}/reset")
+
+    warmed = 0
+    if scenario["warm_up"]:
+        warmed = await llm.warm_up(args.burst_size)
+
+    async def timed_call(index: int) -> float:
+        started = time.perf_counter()
+        await llm.complete(
+            [{"role": "user", "content": f"Pool benchmark call {index}."}],
+            max_tokens=64,
+            cache=False,
+            role="benchmark",
+        )
+        return time.perf_counter() - started
+
+    bursts: List[Dict[str, Any]] = []
+    all_latencies: List[float] = []
+    for burst in range(args.bursts):
+        if burst:
+            await asyncio.sleep(args.idle_s)
+        latencies = await asyncio.gather(*(timed_call(i) for i in range(args.burst_size)))
+        all_latencies.extend(latencies)
+        bursts.append({"burst": burst, "latency_s": percentiles(list(latencies))})
+
+    counters = httpx.get(f"{mock_url}/stats").json()["counters"]
+    await llm.aclose()
+    return {
+        "scenario": name,
+        **scenario,
+        "warmed_connections": warmed,
+        "connections_opened": counters.get("connections", 0),
+        "bursts": bursts,
+        "latency_s": percentiles(all_latencies),
+    }
+
+
+def start_mock(args: argparse.Namespace) -> subprocess.Popen:
+    mock = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.mock_openai",
+            "--port",
+            str(args.mock_port),
+            "--latency-dist",
+            "fixed",
+            "--latency-mean-ms",
+            str(args.latency_mean_ms),
+            "--token-delay-ms",
+            "0",
+            "--connect-delay-ms",
+            str(args.connect_delay_ms),
+        ],
+        cwd=ROOT,
+    )
+    try:
+        wait_ready(f"http://127.0.0.1:{args.mock_port}/v1/models")
+    except Exception:
+        stop_stack([mock])
+        raise
+    return mock
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--burst-size", type=int, default=12)
+    parser.add_argument("--bursts", type=int, default=3)
+    parser.add_argument("--idle-s", type=float, default=6.0, help="Gap between bursts.")
+    parser.add_argument("--latency-mean-ms", type=float, default=100.0)
+    parser.add_argument("--connect-delay-ms", type=float, default=120.0)
+    parser.add_argument("--mock-port", type=int, default=9101)
+    parser.add_argument("--output", default=None, help="Path of the JSON report.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    args = parse_args(argv)
+    os.environ.update(
+        {
+            "OPENAI_API_KEY": "mock",
+            "OPENAI_BASE_URL": f"http://127.0.0.1:{args.mock_port}/v1",
+            "LLM_CACHE_ENABLED": "0",
+        }
+    )
+    mock = start_mock(args)
+    try:
+        scenarios = [asyncio.run(run_scenario(args, name)) for name in SCENARIOS]
+    finally:
+        stop_stack([mock])
+
+    report = {
+        "git_revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "scenarios": scenarios,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"pool-{report['git_revision']}-{int(time.time())}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    for scenario in scenarios:
+        per_burst = ", ".join(
+            f"burst {b['burst']}: p50={b['latency_s']['p50']}s max={b['latency_s']['max']}s" for b in scenario["bursts"]
+        )
+        print(f"{scenario['scenario']:>5}: connections={scenario['connections_opened']} {per_burst}")
+    print(f"Report written to {output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
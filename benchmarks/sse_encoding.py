@@ -0,0 +1,123 @@
+"""Compare per-event CPU cost of the SSE encoding paths for a realistic debate event mix.
+
+* ``baseline``: ``json.dumps`` of the full event dict into an f-string frame, encoded to bytes by the
+  response, as every subscriber did before events were pre-encoded.
+* ``encoder``: ``EventEncoder.frame``, which drops ``None`` fields, reuses static frames and uses orjson
+  when installed.
+
+    python -m benchmarks.sse_encoding --rounds 5 --tokens-per-response 120 --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+from backend.models.schemas import DebateEvent, ModeratorOutput, RoundRecord
+from backend.services.event_encoder import EventEncoder
+
+AGENTS = [("centre_left", "Centre-Left"), ("centre", "Centre"), ("centre_right", "Centre-Right")]
+RESPONSE = (
+    "Targeted public investment can correct underprovision where private returns lag social returns. "
+    "Subsidies without sunset clauses tend to entrench incumbents and distort capital allocation. "
+) * 4
+
+
+def debate_events(rounds: int, tokens_per_response: int) -> List[Dict[str, Any]]:
+    events = [DebateEvent(event_type="started", debate_id="d" * 32, target_confidence=80.0).model_dump()]
+    words = RESPONSE.split(" ")
+    for number in range(1, rounds + 1):
+        message = f"Debate Round {number} started"
+        events.append(DebateEvent(event_type="round_start", round_number=number, message=message).model_dump())
+        for name, label in AGENTS:
+            message = f"{label} agent is thinking..."
+            events.append(
+                DebateEvent(event_type="agent_thinking", round_number=number, agent=name, message=message).model_dump()
+            )
+        for i in range(tokens_per_response * len(AGENTS)):
+            name = AGENTS[i % len(AGENTS)][0]
+            delta = words[i % len(words)] + " "
+            events.append(
+                DebateEvent(event_type="agent_token", round_number=number, agent=name, content=delta).model_dump()
+            )
+        for name, _ in AGENTS:
+            events.append(
+                DebateEvent(event_type="agent_response", round_number=number, agent=name, content=RESPONSE).model_dump()
+            )
+        events.append(
+            DebateEvent(
+                event_type="moderator_thinking",
+                round_number=number,
+                agent="moderator",
+                message="Moderator is synthesizing the round...",
+            ).model_dump()
+        )
+        moderator = ModeratorOutput(
+            agreements=["Policy should be evidence-led.", "Guardrails are needed."],
+            disagreements=["Scale of public funding.", "Role of the state."],
+            strongest_arguments=["Equity matters.", "Evaluate outcomes.", "Avoid capture."],
+            consensus_statement="A phased, conditional programme with independent evaluation is preferred.",
+            confidence=60.0 + number,
+            summary="Agents converge on conditional support while disagreeing on scale.",
+        )
+        events.append(
+            DebateEvent(
+                event_type="moderator_response", round_number=number, agent="moderator", moderator=moderator
+            ).model_dump()
+        )
+        record = RoundRecord(
+            round_number=number,
+            responses={name: RESPONSE for name, _ in AGENTS},
+            moderator_summary=moderator.summary,
+            consensus_statement=moderator.consensus_statement,
+            confidence=moderator.confidence,
+        )
+        events.append(DebateEvent(event_type="round", round_number=number, round_data=record).model_dump())
+    events.append(
+        DebateEvent(
+            event_type="final", final_consensus="Consensus.", final_confidence=80.0, rounds_completed=rounds
+        ).model_dump()
+    )
+    return events
+
+
+def baseline_frame(event_id: int, event: Dict[str, Any]) -> bytes:
+    return f"id: {event_id}\ndata: {json.dumps(event)}\n\n".encode("utf-8")
+
+
+def measure(
+    frame: Callable[[int, Dict[str, Any]], bytes], events: List[Dict[str, Any]], repeat: int
+) -> Dict[str, float]:
+    total_bytes = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for event_id, event in enumerate(events, start=1):
+            total_bytes += len(frame(event_id, event))
+    elapsed = time.perf_counter() - started
+    count = len(events) * repeat
+    return {"us_per_event": round(elapsed / count * 1e6, 3), "bytes_per_event": round(total_bytes / count, 1)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--tokens-per-response", type=int, default=120)
+    parser.add_argument("--repeat", type=int, default=20, help="Debates encoded per path.")
+    args = parser.parse_args()
+
+    events = debate_events(args.rounds, args.tokens_per_response)
+    encoder = EventEncoder()
+    results = {
+        "events_per_debate": len(events),
+        "baseline": measure(baseline_frame, events, args.repeat),
+        "encoder": measure(encoder.frame, events, args.repeat),
+        "encoder_stats": encoder.stats(),
+    }
+    results["speedup"] = round(results["baseline"]["us_per_event"] / results["encoder"]["us_per_event"], 2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
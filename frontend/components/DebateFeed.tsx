@@ -9,7 +9,8 @@ export type FeedEvent = {
     | "moderator_thinking"
     | "moderator_response";
   round_number?: number;
-  agent?: "centre_left" | "centre" | "centre_right" | "moderator";
+  // An agent name from the debate's panel, or "moderator".
+  agent?: string;
   message?: string;
   content?: string;
   moderator?: {
@@ -27,19 +28,37 @@ type DebateFeedProps = {
 };
 
 const agentTitle: Record<string, string> = {
+  left: "Left Agent",
   centre_left: "Centre-Left Agent",
   centre: "Centre Agent",
   centre_right: "Centre-Right Agent",
+  right: "Right Agent",
+  libertarian: "Libertarian Agent",
+  green: "Green Agent",
   moderator: "Moderator",
 };
 
 const toneStyles: Record<string, string> = {
+  left: "border-rose-300 bg-rose-50",
   centre_left: "border-emerald-300 bg-emerald-50",
   centre: "border-sky-300 bg-sky-50",
   centre_right: "border-amber-300 bg-amber-50",
+  right: "border-orange-300 bg-orange-50",
+  libertarian: "border-violet-300 bg-violet-50",
+  green: "border-lime-300 bg-lime-50",
   moderator: "border-slate-300 bg-slate-50",
 };
 
+// Panels are configured on the backend, so unknown agents get a title from their name.
+function titleFor(agent: string): string {
+  if (agentTitle[agent]) return agentTitle[agent];
+  const label = agent
+    .split("_")
+    .map((part) => part.charAt(0).toUpperCase() + part.slice(1))
+    .join("-");
+  return `${label} Agent`;
+}
+
 export default function DebateFeed({ events }: DebateFeedProps) {
   return (
     <section className="space-y-4">
@@ -68,11 +87,14 @@ export default function DebateFeed({ events }: DebateFeedProps) {
               transition={{ duration: 0.2, delay: Math.min(index * 0.02, 0.25) }}
               className="rounded-xl border border-slate-200 bg-white px-4 py-3"
             >
-              <p className="text-xs font-semibold uppercase tracking-wide text-slate-600">{agentTitle[agent]}</p>
+              <p className="text-xs font-semibold uppercase tracking-wide text-slate-600">{titleFor(agent)}</p>
               <p className="mt-1 inline-flex items-center gap-2 text-sm text-slate-700">
                 <span className="h-2 w-2 animate-pulse rounded-full bg-slate-500" />
                 {event.message || "Thinking..."}
               </p>
+              {event.content && (
+                <p className="mt-2 whitespace-pre-wrap text-sm leading-6 text-slate-800">{event.content}</p>
+              )}
             </motion.div>
           );
         }
@@ -85,10 +107,10 @@ export default function DebateFeed({ events }: DebateFeedProps) {
               initial={{ opacity: 0, y: 8 }}
               animate={{ opacity: 1, y: 0 }}
               transition={{ duration: 0.25, delay: Math.min(index * 0.02, 0.25) }}
-              className={`rounded-2xl border p-4 shadow-card ${toneStyles[agent]}`}
+              className={`rounded-2xl border p-4 shadow-card ${toneStyles[agent] || "border-slate-300 bg-slate-50"}`}
             >
               <div className="mb-2 flex items-center justify-between gap-3">
-                <h3 className="text-sm font-semibold uppercase tracking-wide text-slate-700">{agentTitle[agent]}</h3>
+                <h3 className="text-sm font-semibold uppercase tracking-wide text-slate-700">{titleFor(agent)}</h3>
                 <span className="rounded-full bg-white/80 px-2.5 py-1 text-[11px] font-semibold uppercase tracking-wide text-slate-600">
                   Round {event.round_number}
                 </span>
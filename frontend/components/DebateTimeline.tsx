@@ -3,9 +3,8 @@ import ModeratorPanel from "./ModeratorPanel";
 
 export type RoundView = {
   round_number: number;
-  centre_left_response: string;
-  centre_response: string;
-  centre_right_response: string;
+  // Agent name -> response, in the panel's seating order.
+  responses: Record<string, string>;
   moderator_summary: string;
   consensus_statement: string;
   confidence: number;
@@ -14,6 +13,20 @@ export type RoundView = {
   strongest_arguments: string[];
 };
 
+function agentTitle(agent: string): string {
+  const label = agent
+    .split("_")
+    .map((part) => part.charAt(0).toUpperCase() + part.slice(1))
+    .join("-");
+  return `${label} Agent`;
+}
+
+function toneFor(agent: string): "left" | "center" | "right" {
+  if (agent.endsWith("left")) return "left";
+  if (agent.endsWith("right")) return "right";
+  return "center";
+}
+
 type DebateTimelineProps = {
   rounds: RoundView[];
 };
@@ -25,19 +38,15 @@ export default function DebateTimeline({ rounds }: DebateTimelineProps) {
         <article key={round.round_number} className="rounded-3xl border border-slate-200 bg-white/90 p-6 shadow-card">
           <h2 className="mb-4 text-lg font-semibold text-slate-900">Round {round.round_number}</h2>
           <div className="mb-4 space-y-3">
-            <AgentCard
-              title="Centre-Left Agent"
-              response={round.centre_left_response}
-              tone="left"
-              stepLabel="Message 1"
-            />
-            <AgentCard title="Centre Agent" response={round.centre_response} tone="center" stepLabel="Message 2" />
-            <AgentCard
-              title="Centre-Right Agent"
-              response={round.centre_right_response}
-              tone="right"
-              stepLabel="Message 3"
-            />
+            {Object.entries(round.responses).map(([agent, response], index) => (
+              <AgentCard
+                key={agent}
+                title={agentTitle(agent)}
+                response={response}
+                tone={toneFor(agent)}
+                stepLabel={`Message ${index + 1}`}
+              />
+            ))}
           </div>
 
           <ModeratorPanel
@@ -9,6 +9,7 @@ type BackendEvent = {
     | "started"
     | "round_start"
     | "agent_thinking"
+    | "agent_token"
     | "agent_response"
     | "moderator_thinking"
     | "moderator_response"
@@ -16,13 +17,11 @@ type BackendEvent = {
     | "final"
     | "error";
   round_number?: number;
-  agent?: "centre_left" | "centre" | "centre_right" | "moderator";
+  agent?: string;
   content?: string;
   round_data?: {
     round_number: number;
-    centre_left_response: string;
-    centre_response: string;
-    centre_right_response: string;
+    responses: Record<string, string>;
     moderator_summary: string;
     consensus_statement: string;
     confidence: number;
@@ -41,6 +40,7 @@ type BackendEvent = {
 };
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL || "http://localhost:8000";
+const MAX_RESUME_ATTEMPTS = 5;
 
 export default function HomePage() {
   const [loading, setLoading] = useState(false);
@@ -58,13 +58,76 @@ export default function HomePage() {
     setFinalConsensus("");
     setFinalConfidence(null);
 
-    try {
-      const response = await fetch(`${API_BASE_URL}/start-debate`, {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ prompt, confidence_target: confidenceTarget }),
-      });
+    let debateId: string | null = null;
+    let lastEventId: string | null = null;
+    let finished = false;
+
+    const handleEvent = (parsed: BackendEvent) => {
+      if (parsed.event_type === "agent_token") {
+        setFeedEvents((prev) =>
+          prev.map((item) =>
+            item.event_type === "agent_thinking" &&
+            item.round_number === parsed.round_number &&
+            item.agent === parsed.agent
+              ? { ...item, content: (item.content || "") + (parsed.content || "") }
+              : item
+          )
+        );
+        return;
+      }
 
+      if (
+        parsed.event_type === "round_start" ||
+        parsed.event_type === "agent_thinking" ||
+        parsed.event_type === "agent_response" ||
+        parsed.event_type === "moderator_thinking" ||
+        parsed.event_type === "moderator_response"
+      ) {
+        const feedType = parsed.event_type as FeedEvent["event_type"];
+        setFeedEvents((prev) => [
+          ...prev.filter((item) => {
+            if (
+              feedType === "agent_response" &&
+              item.event_type === "agent_thinking" &&
+              item.round_number === parsed.round_number &&
+              item.agent === parsed.agent
+            ) {
+              return false;
+            }
+            if (
+              feedType === "moderator_response" &&
+              item.event_type === "moderator_thinking" &&
+              item.round_number === parsed.round_number
+            ) {
+              return false;
+            }
+            return true;
+          }),
+          {
+            id: `${Date.now()}-${prev.length}-${parsed.event_type}`,
+            event_type: feedType,
+            round_number: parsed.round_number,
+            agent: parsed.agent,
+            message: parsed.message,
+            content: parsed.content,
+            moderator: parsed.moderator,
+          },
+        ]);
+      }
+
+      if (parsed.event_type === "final") {
+        finished = true;
+        setFinalConsensus(parsed.final_consensus || "");
+        setFinalConfidence(parsed.final_confidence ?? null);
+      }
+
+      if (parsed.event_type === "error") {
+        finished = true;
+        setError(parsed.message || "Unknown streaming error");
+      }
+    };
+
+    const consume = async (response: Response) => {
       if (!response.ok || !response.body) {
         throw new Error(`Request failed (${response.status})`);
       }
@@ -82,63 +145,45 @@ export default function HomePage() {
         buffer = chunks.pop() || "";
 
         for (const chunk of chunks) {
-          const line = chunk
-            .split("\n")
-            .find((entry) => entry.startsWith("data: "))
-            ?.replace("data: ", "");
+          let line: string | undefined;
+          for (const entry of chunk.split("\n")) {
+            if (entry.startsWith("id: ")) lastEventId = entry.replace("id: ", "");
+            if (entry.startsWith("data: ")) line = entry.replace("data: ", "");
+          }
 
           if (!line) continue;
 
-          const parsed: BackendEvent = JSON.parse(line);
-
-          if (
-            parsed.event_type === "round_start" ||
-            parsed.event_type === "agent_thinking" ||
-            parsed.event_type === "agent_response" ||
-            parsed.event_type === "moderator_thinking" ||
-            parsed.event_type === "moderator_response"
-          ) {
-            const feedType = parsed.event_type as FeedEvent["event_type"];
-            setFeedEvents((prev) => [
-              ...prev.filter((item) => {
-                if (
-                  feedType === "agent_response" &&
-                  item.event_type === "agent_thinking" &&
-                  item.round_number === parsed.round_number &&
-                  item.agent === parsed.agent
-                ) {
-                  return false;
-                }
-                if (
-                  feedType === "moderator_response" &&
-                  item.event_type === "moderator_thinking" &&
-                  item.round_number === parsed.round_number
-                ) {
-                  return false;
-                }
-                return true;
-              }),
-              {
-                id: `${Date.now()}-${prev.length}-${parsed.event_type}`,
-                event_type: feedType,
-                round_number: parsed.round_number,
-                agent: parsed.agent,
-                message: parsed.message,
-                content: parsed.content,
-                moderator: parsed.moderator,
-              },
-            ]);
-          }
-
-          if (parsed.event_type === "final") {
-            setFinalConsensus(parsed.final_consensus || "");
-            setFinalConfidence(parsed.final_confidence ?? null);
-          }
+          handleEvent(JSON.parse(line));
+        }
+      }
+    };
 
-          if (parsed.event_type === "error") {
-            setError(parsed.message || "Unknown streaming error");
-          }
+    try {
+      const response = await fetch(`${API_BASE_URL}/start-debate`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ prompt, confidence_target: confidenceTarget }),
+      });
+      debateId = response.headers.get("X-Debate-Id");
+
+      // The debate keeps running server-side if the connection drops; resume from the last event seen.
+      for (let attempt = 0; ; attempt++) {
+        try {
+          await consume(
+            attempt === 0
+              ? response
+              : await fetch(`${API_BASE_URL}/debates/${debateId}/events`, {
+                  headers: lastEventId ? { "Last-Event-ID": lastEventId } : {},
+                })
+          );
+        } catch (err) {
+          if (!debateId || attempt >= MAX_RESUME_ATTEMPTS) throw err;
+        }
+        if (finished) break;
+        if (!debateId || attempt >= MAX_RESUME_ATTEMPTS) {
+          throw new Error("Stream ended before the debate finished");
         }
+        await new Promise((resolve) => setTimeout(resolve, 1000 * (attempt + 1)));
       }
     } catch (err) {
       const message = err instanceof Error ? err.message : "Failed to start debate";
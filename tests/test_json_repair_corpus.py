@@ -0,0 +1,124 @@
+"""The malformed moderator output corpus, replayed through ModeratorAgent's parse and repair path."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from backend.agents.moderator import ModeratorAgent
+from backend.models.schemas import ModeratorOutput
+from backend.services.json_repair import repair_json
+from backend.services.llm_service import LLMService
+
+CORPUS = Path(__file__).resolve().parents[1] / "benchmarks" / "fixtures" / "malformed_moderator_outputs.jsonl"
+CASES: List[Dict] = [json.loads(line) for line in CORPUS.read_text().splitlines() if line.strip()]
+VALID = json.dumps(
+    {
+        "agreements": ["Evidence first.", "Guardrails."],
+        "disagreements": ["Scale.", "Timing."],
+        "strongest_arguments": ["a", "b", "c"],
+        "consensus_statement": "Repaired remotely.",
+        "confidence": 50,
+        "summary": "Remote repair output.",
+    }
+)
+
+
+def _case_id(case: Dict) -> str:
+    return f"{case['class']}-{CASES.index(case)}"
+
+
+@pytest.fixture
+def moderator(monkeypatch: pytest.MonkeyPatch) -> ModeratorAgent:
+    agent = ModeratorAgent(LLMService())
+    # Keep the fall-through deterministic: straight to the remote repair call, whatever the model tiers.
+    monkeypatch.setattr(agent.llm.router, "can_escalate", lambda *args, **kwargs: False)
+    return agent
+
+
+def _recover(moderator: ModeratorAgent, raw: str) -> Dict:
+    parsed = moderator._safe_parse(raw)
+    if moderator._is_parse_failure(parsed):
+        parsed = moderator._local_repair(raw)
+    return parsed
+
+
+def test_corpus_covers_every_malformation_class() -> None:
+    classes = {case["class"] for case in CASES}
+    assert classes >= {
+        "trailing_comma",
+        "single_quotes",
+        "python_literals",
+        "unescaped_newlines",
+        "unescaped_quotes",
+        "prose_preamble",
+        "code_fence",
+        "truncated",
+        "missing_commas",
+        "bare_keys",
+        "mixed",
+        "no_json",
+    }
+
+
+@pytest.mark.parametrize("case", CASES, ids=_case_id)
+def test_local_recovery(moderator: ModeratorAgent, case: Dict) -> None:
+    parsed = _recover(moderator, case["raw"])
+    if not case.get("recoverable", True):
+        assert moderator._is_parse_failure(parsed)
+        return
+    assert not moderator._is_parse_failure(parsed)
+    output = ModeratorOutput(**parsed)
+    assert output.consensus_statement not in {"", "No consensus available."}
+    assert 0 < output.confidence <= 100
+
+
+def test_truncated_number_is_not_a_local_success(moderator: ModeratorAgent) -> None:
+    # The partial number is dropped rather than guessed, which leaves nothing of the synthesis.
+    assert repair_json('{"confidence": 6') == "{}"
+    assert moderator._is_parse_failure(moderator._local_repair('{"confidence": 6'))
+    assert moderator.repair_stats["local_repair_attempts"] == 1
+    assert moderator.repair_stats["local_repair_successes"] == 0
+
+
+def _moderate(moderator: ModeratorAgent, monkeypatch: pytest.MonkeyPatch, raw: str) -> ModeratorOutput:
+    async def complete(messages, *, role: str = "agent", **kwargs) -> str:
+        return VALID if role == "repair" else raw
+
+    monkeypatch.setattr(moderator.llm, "complete", complete)
+    return asyncio.run(
+        moderator.moderate(
+            prompt="Should governments subsidize AI compute?",
+            round_number=1,
+            responses={"centre_left": "Yes.", "centre": "Conditionally.", "centre_right": "No."},
+            memory=[],
+            memory_text="",
+        )
+    )
+
+
+@pytest.mark.parametrize("case", [case for case in CASES if case.get("recoverable", True)], ids=_case_id)
+def test_local_repair_avoids_the_remote_call(
+    moderator: ModeratorAgent, monkeypatch: pytest.MonkeyPatch, case: Dict
+) -> None:
+    output = _moderate(moderator, monkeypatch, case["raw"])
+    stats = moderator.repair_stats
+    assert stats["remote_repair_calls"] == 0
+    assert output.consensus_statement != "Repaired remotely."
+    strict = not moderator._is_parse_failure(moderator._safe_parse(case["raw"]))
+    assert stats["remote_repairs_avoided"] == (0 if strict else 1)
+
+
+@pytest.mark.parametrize("case", [case for case in CASES if not case.get("recoverable", True)], ids=_case_id)
+def test_unrecoverable_output_falls_through_to_remote_repair(
+    moderator: ModeratorAgent, monkeypatch: pytest.MonkeyPatch, case: Dict
+) -> None:
+    output = _moderate(moderator, monkeypatch, case["raw"])
+    stats = moderator.repair_stats
+    assert stats["remote_repairs_avoided"] == 0
+    assert stats["remote_repair_calls"] == 1
+    assert output.consensus_statement == "Repaired remotely."